@@ -0,0 +1,65 @@
+"""AutoLearner feature, training and scoring benchmarks"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import TRAIN_CAP
+from src.auto_learner import AutoLearner
+from src.model_cache import ModelCache
+
+CHUNK_ROWS = 50_000
+
+
+@pytest.fixture(scope='module')
+def learner(tmp_path_factory):
+    return AutoLearner(models_dir=str(tmp_path_factory.mktemp('models')), cache=ModelCache())
+
+
+@pytest.fixture(scope='module')
+def training_set(learner, bars):
+    # Minute bars rarely move 1% in 5 bars; a lower threshold keeps both classes present
+    labeled = learner.generate_labels(learner.prepare_features(bars.iloc[:TRAIN_CAP + 100]), threshold=0.002)
+    X = labeled[AutoLearner.FEATURE_COLUMNS].iloc[:TRAIN_CAP]
+    y = labeled['Label'].iloc[:TRAIN_CAP]
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def scoring_set(learner, bars):
+    return learner.prepare_features(bars)[AutoLearner.FEATURE_COLUMNS]
+
+
+def bench_prepare_features(measure, learner, bars):
+    measure(learner.prepare_features, bars, rows=len(bars))
+
+
+def bench_iter_features(measure, learner, bars):
+    # Peak memory should track CHUNK_ROWS, not len(bars)
+    def consume():
+        chunks = (bars.iloc[i:i + CHUNK_ROWS] for i in range(0, len(bars), CHUNK_ROWS))
+        return sum(len(block) for block in learner.iter_features(chunks))
+    measure(consume, rows=len(bars))
+
+
+def bench_train_model(measure, learner, training_set):
+    X, y = training_set
+    measure(learner.train_model, X, y, 'bench', rows=len(X), rounds=1)
+
+
+def bench_train_model_compact(measure, learner, training_set, tmp_path):
+    X, y = training_set
+    compact = AutoLearner(models_dir=str(tmp_path), cache=ModelCache(), compact=True)
+    measure(compact.train_model, X, y, 'bench', rows=len(X), rounds=1)
+    if 'bench' not in learner.models:
+        learner.train_model(X, y, 'bench')
+    # float32 features must not change what the model predicts
+    agreement = np.mean(compact.predict(X, 'bench') == learner.predict(X, 'bench'))
+    assert agreement >= 0.99, f"Compact model agrees on only {agreement:.1%} of predictions"
+
+
+def bench_get_confidence_scores(measure, learner, training_set, scoring_set):
+    if 'bench' not in learner.models:
+        learner.train_model(*training_set, 'bench')
+    measure(learner.get_confidence_scores, scoring_set, 'bench', rows=len(scoring_set))
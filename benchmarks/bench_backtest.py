@@ -0,0 +1,37 @@
+"""Backtester and metrics benchmarks"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import PER_ROW_CAP
+from src.backtester import EventDrivenBacktester
+from src.backtesting_metrics import BacktestingMetrics
+from src.broker import PaperBroker
+from src.utils import load_config
+from src.models import TradeScorer
+from src.rules import SMARulesEngine
+
+
+CONFIG = load_config(Path(__file__).parent.parent / 'config' / 'config.yaml')
+
+
+def bench_event_driven_backtester(measure, bars):
+    data = bars.iloc[:PER_ROW_CAP]
+
+    def fresh_backtester():
+        return (EventDrivenBacktester(data, PaperBroker.from_config(CONFIG, 10000.0), SMARulesEngine(20, 50), TradeScorer()),)
+
+    measure(lambda backtester: backtester.run(), rows=len(data), setup=fresh_backtester, rounds=1)
+
+
+def bench_calculate_all_metrics(measure, bars):
+    close = bars['close'].to_numpy()
+    equity = 10000.0 * close / close[0]
+    rng = np.random.default_rng(11)
+    trades = [{'pnl': pnl} for pnl in rng.normal(5, 50, len(bars) // 10).tolist()]
+    metrics = BacktestingMetrics(initial_capital=10000.0)
+    measure(metrics.calculate_all_metrics, trades, equity, rows=len(bars))
@@ -0,0 +1,12 @@
+"""SMA rules engine benchmarks"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.rules import SMARulesEngine
+
+
+def bench_compute_signals(measure, bars):
+    engine = SMARulesEngine(20, 50)
+    measure(engine.compute_signals, bars['close'], rows=len(bars))
@@ -0,0 +1,47 @@
+"""Cold-start import benchmarks for the live-trading core"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# What a live process needs: rules, a compiled scorer, a broker, the journal and the agent
+LIVE_CORE = ('src.agent', 'src.rules', 'src.models', 'src.broker_integration', 'src.journal', 'src.market_data')
+# Must stay out of the live core; they load on first use
+HEAVY = ('sklearn', 'scipy', 'joblib', 'requests', 'plotly', 'streamlit')
+STARTUP_BUDGET = 1.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _cold_import(modules=LIVE_CORE):
+    code = _PROBE.format(modules=tuple(modules), heavy=HEAVY)
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def bench_live_core_import(benchmark):
+    result = benchmark.pedantic(_cold_import, rounds=5, iterations=1)
+    benchmark.extra_info.update(import_seconds=result['seconds'])
+    assert not result['heavy'], f"Live core imported heavy modules: {result['heavy']}"
+    # With --benchmark-disable there are no stats; fall back to the single probe's own timing
+    seconds = benchmark.stats.stats.mean if benchmark.stats else result['seconds']
+    assert seconds < STARTUP_BUDGET, f"Live core cold start {seconds:.2f}s exceeds {STARTUP_BUDGET}s"
+
+
+def bench_package_import(benchmark):
+    result = benchmark.pedantic(_cold_import, args=(('src',),), rounds=5, iterations=1)
+    assert not result['heavy']
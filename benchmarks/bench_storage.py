@@ -0,0 +1,47 @@
+"""Trade journal and prediction log benchmarks"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import PER_ROW_CAP
+from src.journal import TradeJournal
+from src.prediction_logger import PredictionLogger
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / 'journal.db'))
+    yield journal
+    journal.conn.close()
+
+
+def bench_journal_log_trade(benchmark, journal):
+    benchmark(journal.log_trade, 'BUY', 1.0, 47500.0)
+
+
+def _predictions(n):
+    rng = np.random.default_rng(3)
+    prediction = rng.integers(0, 2, n).tolist()
+    actual = rng.integers(0, 2, n).tolist()
+    confidence = rng.random(n).tolist()
+    return [{'prediction': p, 'actual': a, 'confidence': c} for p, a, c in zip(prediction, actual, confidence)]
+
+
+def bench_prediction_logger_write(measure, tmp_path, n_bars):
+    n = min(n_bars, PER_ROW_CAP)
+    predictions = _predictions(n)
+    rounds = iter(range(1000))
+
+    def fresh_logger():
+        return PredictionLogger(log_dir=str(tmp_path / f'write_{next(rounds)}'), model_name='bench'), predictions
+
+    measure(lambda logger, batch: logger.log_batch_predictions(batch), rows=n, setup=fresh_logger)
+
+
+def bench_prediction_logger_read(measure, tmp_path, n_bars):
+    n = min(n_bars, PER_ROW_CAP)
+    logger = PredictionLogger(log_dir=str(tmp_path / 'read'), model_name='bench')
+    logger.log_batch_predictions(_predictions(n))
+    measure(logger.read_predictions, rows=n)
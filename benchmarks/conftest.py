@@ -0,0 +1,142 @@
+"""
+Benchmark Suite Fixtures
+Fixed-size synthetic datasets, throughput timing and peak-memory baselines for the hot paths
+
+Dataset size comes from BENCH_SIZE: 10k (default), 1m or 50m bars.
+
+    pytest benchmarks/ --benchmark-autosave               # record a throughput baseline
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=mean:10%
+    pytest benchmarks/ --memory-save                      # record a peak-memory baseline
+    BENCH_SIZE=1m pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Peak memory is measured with tracemalloc on one extra call; once a baseline
+exists for a benchmark and size, the test fails when the peak grows past
+``--memory-tolerance`` (default 25%).
+
+Both throughput runs and the memory baseline are stored under
+``benchmarks/baselines/``, which is tracked so baselines can be committed
+and compared on other machines.
+"""
+
+import json
+import os
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '50m': 50_000_000}
+SIZE_LABEL = os.environ.get('BENCH_SIZE', '10k').lower()
+N_BARS = SIZES.get(SIZE_LABEL) or int(SIZE_LABEL)
+
+# Paths that loop in Python per row or fit models are benchmarked on at most this many rows
+PER_ROW_CAP = 100_000
+TRAIN_CAP = 50_000
+
+ROUNDS = 5 if N_BARS <= 10_000 else 3
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+MEMORY_BASELINE = BASELINE_DIR / 'memory.json'
+# pytest-benchmark's own default, relative to wherever pytest was started
+DEFAULT_STORAGE = 'file://./.benchmarks'
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Runs before pytest-benchmark opens its storage; an explicit --benchmark-storage still wins
+    if config.getoption('benchmark_storage', None) == DEFAULT_STORAGE:
+        config.option.benchmark_storage = f"file://{BASELINE_DIR}"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('memory', 'peak memory baselines')
+    group.addoption('--memory-save', action='store_true', help="store peak memory as the new baseline")
+    group.addoption('--memory-tolerance', type=float, default=0.25,
+                    help="allowed fractional peak-memory growth over the baseline")
+
+
+def make_bars(n: int, seed: int = 7) -> pd.DataFrame:
+    """Seeded OHLCV random walk on a 1-minute index"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = np.abs(rng.normal(0, 0.003, n))
+    open_ = close * (1 + rng.normal(0, 0.001, n))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + spread),
+        'low': np.minimum(open_, close) * (1 - spread),
+        'close': close,
+        'volume': rng.lognormal(10, 1, n)
+    }, index=pd.date_range('2020-01-01', periods=n, freq='min'))
+
+
+@pytest.fixture(scope='session')
+def bars() -> pd.DataFrame:
+    return make_bars(N_BARS)
+
+
+@pytest.fixture(scope='session')
+def n_bars() -> int:
+    return N_BARS
+
+
+class MemoryBaseline:
+    """Peak tracemalloc memory per benchmark, compared against a stored baseline"""
+
+    def __init__(self, save: bool, tolerance: float):
+        self.save = save
+        self.tolerance = tolerance
+        self.baseline = json.loads(MEMORY_BASELINE.read_text()) if MEMORY_BASELINE.exists() else {}
+        self.measured = {}
+
+    def check(self, key: str, peak: int):
+        self.measured[key] = peak
+        reference = self.baseline.get(key)
+        if not self.save and reference and peak > reference * (1 + self.tolerance):
+            pytest.fail(f"Peak memory regressed: {peak / 1e6:.1f} MB vs baseline "
+                        f"{reference / 1e6:.1f} MB (+{self.tolerance:.0%} allowed)")
+
+    def write(self):
+        MEMORY_BASELINE.parent.mkdir(exist_ok=True)
+        MEMORY_BASELINE.write_text(json.dumps({**self.baseline, **self.measured}, indent=2, sort_keys=True))
+
+
+@pytest.fixture(scope='session')
+def memory_baseline(request):
+    baseline = MemoryBaseline(request.config.getoption('--memory-save'),
+                              request.config.getoption('--memory-tolerance'))
+    yield baseline
+    if baseline.save:
+        baseline.write()
+
+
+@pytest.fixture
+def measure(request, benchmark, memory_baseline):
+    """Time ``fn(*args)`` over fixed rounds and check its peak memory
+
+    ``rows`` is recorded so reports can show rows/sec; ``setup`` (if
+    given) rebuilds fresh arguments before every round and is not timed.
+    """
+    key = f"{request.node.name}[{SIZE_LABEL}]"
+
+    def run(fn, *args, rows: int, setup=None, rounds: int = ROUNDS):
+        call_args = setup() if setup else args
+        tracemalloc.start()
+        try:
+            fn(*call_args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info.update(rows=rows, peak_memory_mb=round(peak / 1e6, 2))
+        if setup:
+            result = benchmark.pedantic(fn, setup=lambda: (setup(), {}), rounds=rounds, iterations=1)
+        else:
+            result = benchmark.pedantic(fn, args=args, rounds=rounds, iterations=1)
+        if benchmark.stats:
+            benchmark.extra_info['rows_per_sec'] = rows / benchmark.stats.stats.mean
+        memory_baseline.check(key, peak)
+        return result
+
+    return run
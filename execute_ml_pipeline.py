@@ -4,6 +4,7 @@ Complete ML Data Collection & Auto-Learning Pipeline Execution
 Demonstrates end-to-end workflow from data collection to model training
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import logging
@@ -12,24 +13,28 @@ from datetime import datetime
 # Import our custom modules
 from src.data_collector import DataCollector
 from src.auto_learner import AutoLearner
+from src.profiler import SamplingProfiler
+from src.logging_setup import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
-def execute_pipeline():
+def execute_pipeline(profiler=None, compact=False):
     """
     Execute the complete ML pipeline: Data -> Features -> Training -> Prediction
+    
+    With a SamplingProfiler, each phase slower than its threshold is written
+    out as a flame graph plus a top-N hot-function summary.
     """
+    profiler = profiler or SamplingProfiler(enabled=False)
     
     print("\n" + "="*80)
     print("AUTOMATED TRADING AGENT: ML DATA COLLECTION & AUTO-LEARNING PIPELINE")
     print("="*80 + "\n")
     
     # ========== PHASE 1: DATA COLLECTION ==========
+    profiler.mark('phase1_data_collection')
     print("\n[PHASE 1] DATA COLLECTION")
     print("-" * 80)
     
@@ -43,6 +48,7 @@ def execute_pipeline():
     print(f"  • Avg volume: {df['volume'].mean():,.0f}")
     
     # ========== PHASE 2: DATA VALIDATION ==========
+    profiler.mark('phase2_data_validation')
     print("\n[PHASE 2] DATA VALIDATION")
     print("-" * 80)
     
@@ -62,10 +68,11 @@ def execute_pipeline():
     logger.info("✓ Data saved with versioning")
     
     # ========== PHASE 3: FEATURE ENGINEERING ==========
+    profiler.mark('phase3_feature_engineering')
     print("\n[PHASE 3] FEATURE ENGINEERING")
     print("-" * 80)
     
-    learner = AutoLearner(models_dir="models")
+    learner = AutoLearner(models_dir="models", compact=compact)
     logger.info("Generating technical indicators...")
     
     df_features = learner.prepare_features(df)
@@ -77,6 +84,7 @@ def execute_pipeline():
     print(f"  • Total features: {len(df_features.columns)}")
     
     # ========== PHASE 4: LABEL GENERATION ==========
+    profiler.mark('phase4_label_generation')
     print("\n[PHASE 4] LABEL GENERATION")
     print("-" * 80)
     
@@ -91,16 +99,21 @@ def execute_pipeline():
     print(f"  • Total labeled samples: {len(df_labeled)}")
     
     # ========== PHASE 5: MODEL TRAINING ==========
+    profiler.mark('phase5_model_training')
     print("\n[PHASE 5] MODEL TRAINING")
     print("-" * 80)
     
     # Prepare training data
-    feature_cols = ['SMA_10', 'SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal', 
-                    'Volatility', 'ATR', 'Volume_Ratio', 'Returns', 'High_Low', 'Close_Position']
+    feature_cols = AutoLearner.FEATURE_COLUMNS
     
     X = df_labeled[feature_cols].dropna()
     y = df_labeled.loc[X.index, 'Label']
     
+    if compact:
+        report = learner.memory_report(df_labeled)
+        print(f"  • Compact float32 features: {report['matrix_mb']:.2f} MB "
+              f"vs {report['frame_mb']:.2f} MB frame ({report['saved_pct']:.0f}% saved)")
+    
     logger.info(f"Training ensemble model with {len(X)} samples...")
     learner.train_model(X, y, model_name='trading_ensemble')
     logger.info("✓ Model training completed")
@@ -112,6 +125,7 @@ def execute_pipeline():
     print(f"  • Estimators: 200 total (RF: 150, GB: 50)")
     
     # ========== PHASE 6: FEATURE IMPORTANCE ==========
+    profiler.mark('phase6_feature_importance')
     print("\n[PHASE 6] FEATURE IMPORTANCE ANALYSIS")
     print("-" * 80)
     
@@ -126,6 +140,7 @@ def execute_pipeline():
             print(f"    {idx}. {feature_name}: {score:.4f}")
     
     # ========== PHASE 7: PREDICTION DEMO ==========
+    profiler.mark('phase7_prediction')
     print("\n[PHASE 7] PREDICTION DEMONSTRATION")
     print("-" * 80)
     
@@ -141,6 +156,7 @@ def execute_pipeline():
         print(f"    Day {i}: {signal:4s} (confidence: {conf:.2%})")
     
     # ========== FINAL SUMMARY ==========
+    profiler.mark(None)
     print("\n" + "="*80)
     print("PIPELINE EXECUTION SUMMARY")
     print("="*80)
@@ -167,8 +183,17 @@ def execute_pipeline():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ML data collection and training pipeline")
+    parser.add_argument('--profile', action='store_true', help="sample phases slower than the threshold")
+    parser.add_argument('--profile-threshold-ms', type=float, default=250.0)
+    parser.add_argument('--profile-dir', default='logs/profiles')
+    parser.add_argument('--compact', action='store_true', help="train and score on a float32 feature matrix")
+    args = parser.parse_args()
+    profiler = SamplingProfiler(threshold=args.profile_threshold_ms / 1000.0,
+                                output_dir=args.profile_dir,
+                                enabled=args.profile)
     try:
-        learner, df, X, y = execute_pipeline()
+        learner, df, X, y = execute_pipeline(profiler, compact=args.compact)
         print("✓ ML Pipeline executed successfully!")
         print("\nNext steps:")
         print("  1. Integrate predictions into backtester")
@@ -177,3 +202,7 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Pipeline execution failed: {e}", exc_info=True)
         print(f"\n✗ Error: {e}")
+    finally:
+        profiler.stop()
+        if profiler.slow_sections:
+            print(f"Profiles and hot-function summary written to {args.profile_dir}")
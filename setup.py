@@ -7,6 +7,6 @@ setup(
     author='Trading Systems',
     url='https://github.com/AE707/trading-agent',
     packages=find_packages(),
-    install_requires=['pandas','numpy','scikit-learn','SQLAlchemy','psycopg2-binary','PyYAML','xgboost','requests'],
+    install_requires=['pandas','numpy','scikit-learn','scipy','SQLAlchemy','psycopg2-binary','PyYAML','xgboost','requests'],
     python_requires='>=3.8',
 )
@@ -0,0 +1,42 @@
+"""
+Trading Agent Package
+Public classes are resolved lazily (PEP 562), so ``import src`` loads nothing heavy
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+_LAZY = {
+    'TradingAgent': 'src.agent',
+    'SMARulesEngine': 'src.rules',
+    'TradeScorer': 'src.models',
+    'CompiledScorer': 'src.models',
+    'PaperBroker': 'src.broker',
+    'TradeJournal': 'src.journal',
+    'TradeLedger': 'src.ledger',
+    'BinanceIntegration': 'src.broker_integration',
+    'PaperTraderBroker': 'src.broker_integration',
+    'TickerCache': 'src.market_data',
+    'OrderTracker': 'src.order_tracker',
+    'EventDrivenBacktester': 'src.backtester',
+    'BacktestingMetrics': 'src.backtesting_metrics',
+    'AutoLearner': 'src.auto_learner',
+    'DataCollector': 'src.data_collector',
+    'WalkForwardEngine': 'src.walk_forward',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'src' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,27 +1,117 @@
+import queue
+
+from src.instrumentation import configure, metrics
+from src.profiler import SamplingProfiler
+
+
 class TradingAgent:
     """Main orchestrator for three-stage trading pipeline."""
     
-    def __init__(self, config, rules_engine, model, broker, journal):
+    # Scorer inputs, taken from the rules engine output
+    FEATURE_COLUMNS = ['sma_short', 'sma_long']
+    
+    def __init__(self, config, rules_engine, model, broker, journal, model_watcher=None, ticker_cache=None,
+                 order_tracker=None, profiler=None):
         self.config = config
         self.rules_engine = rules_engine
         self.model = model
         self.broker = broker
         self.journal = journal
+        self.model_watcher = model_watcher
+        if model_watcher is not None and model_watcher.n_features is None:
+            # New versions must accept the features this agent scores
+            model_watcher.n_features = len(self.FEATURE_COLUMNS)
+        self.model_version = None
+        # Shared streaming quotes; execution prices come from here while fresh
+        self.ticker_cache = ticker_cache
+        self.symbol = config.get('trading', {}).get('symbol', 'BTCUSDT')
+        self.max_quote_age = config.get('market_data', {}).get('max_quote_age', 5.0)
+        # With a tracker, orders go out asynchronously and the cycle never waits for acks;
+        # they are journaled once final, from the tracker's updates
+        self.order_tracker = order_tracker
+        self._finished_orders = queue.SimpleQueue()
+        if order_tracker is not None:
+            order_tracker.add_listener(self._on_order_update)
+        # Metrics stay disabled (no-op) unless config['instrumentation']['enabled'] is set
+        self.metrics_exporters = configure(config)
+        # Cycles slower than the threshold leave a flame graph under config['profiling']['output_dir']
+        self.profiler = profiler or SamplingProfiler.from_config(config)
+    
+    def apply_model_update(self):
+        """Swap in a model the watcher has already loaded and warmed up."""
+        if self.model_watcher is None:
+            return False
+        update = self.model_watcher.take_pending()
+        if update is None:
+            return False
+        self.model_version, self.model = update
+        return True
+    
+    def _on_order_update(self, order):
+        """Tracker callback (tracker threads): queue orders that finished with fills."""
+        from src.order_tracker import FINAL_STATES
+        if order['status'] in FINAL_STATES and order['executed'] > 0:
+            self._finished_orders.put(order)
+    
+    def journal_finished_orders(self):
+        """Journal tracked orders at their executed quantity and average fill price.
+        
+        Runs on the agent's thread, which owns the journal connection.
+        """
+        journaled = 0
+        while True:
+            try:
+                order = self._finished_orders.get_nowait()
+            except queue.Empty:
+                return journaled
+            self.journal.log_trade(order['side'], order['executed'], order['quote'] / order['executed'])
+            metrics.inc('agent_trades_total', side=order['side'])
+            journaled += 1
+    
+    def market_price(self, market_data):
+        """Latest streamed price if fresh, else the last bar close."""
+        if self.ticker_cache is not None:
+            price = self.ticker_cache.price(self.symbol, self.max_quote_age)
+            if price:
+                return price
+        return market_data['close'].iloc[-1]
     
     def run_cycle(self, market_data):
         """Execute single trading cycle."""
+        with self.profiler.section('cycle'):
+            return self._run_cycle(market_data)
+    
+    def _run_cycle(self, market_data):
+        # Model upgrades only take effect between cycles
+        self.apply_model_update()
+        if self.order_tracker is not None:
+            with metrics.timer('agent_stage_seconds', stage='journal'):
+                self.journal_finished_orders()
+        
         # Stage 1: Generate rules-based signal
-        signal_df = self.rules_engine.compute_signals(market_data['close'])
-        latest_signal = signal_df['signal'].iloc[-1]
+        with metrics.timer('agent_stage_seconds', stage='rules'):
+            signal_df = self.rules_engine.compute_signals(market_data['close'])
+            latest_signal = signal_df['signal'].iloc[-1]
         
         # Stage 2: Score signal with ML model
-        features = signal_df[['sma_short', 'sma_long']].iloc[-1:]
-        score = self.model.score(features)
+        with metrics.timer('agent_stage_seconds', stage='scorer'):
+            features = signal_df[self.FEATURE_COLUMNS].iloc[-1:]
+            score = self.model.score(features)
+        if self.model_watcher is not None:
+            self.model_watcher.observe_features(features)
         
         # Stage 3: Execute trade if confidence is high
+        metrics.inc('agent_cycles_total')
         if score[0] > 0.7 and latest_signal == 1:
-            price = market_data['close'].iloc[-1]
-            self.broker.place_order(quantity=1, price=price)
-            self.journal.log_trade('BUY', 1, price)
+            if self.order_tracker is not None:
+                with metrics.timer('agent_stage_seconds', stage='broker'):
+                    self.order_tracker.submit([{'symbol': self.symbol, 'quantity': 1, 'side': 'BUY'}])
+            else:
+                with metrics.timer('agent_stage_seconds', stage='broker'):
+                    price = self.market_price(market_data)
+                    self.broker.place_order(quantity=1, price=price)
+                with metrics.timer('agent_stage_seconds', stage='journal'):
+                    self.journal.log_trade('BUY', 1, price)
+                metrics.inc('agent_trades_total', side='BUY')
         
         return {'signal': latest_signal, 'score': score[0]}
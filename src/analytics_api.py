@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Analytics API Module
+Read-only asyncio HTTP service over the trade journal, prediction log, metrics and ticker cache
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.instrumentation import MetricsRegistry, metrics
+from src.market_data import TickerCache
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {'1m': 60, '5m': 300, '1h': 3600, '1d': 86400}
+MAX_PAGE_SIZE = 1000
+GZIP_MIN_BYTES = 1024
+# Cached response bodies; cursor URLs are unbounded, so least recently used entries are evicted
+CACHE_SIZE = 256
+SSE_HEARTBEAT = 15.0
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class Rollups:
+    """Equity and PnL OHLC buckets at several resolutions, folded in one trade at a time
+
+    Each bucket holds open/high/low/close equity plus realized PnL, trade
+    count and notional for its interval, so any resolution is served
+    without touching raw trades.
+    """
+
+    def __init__(self, initial_equity: float = 0.0, resolutions: Dict[str, int] = RESOLUTIONS):
+        self.initial_equity = initial_equity
+        self.equity = initial_equity
+        self.trades = 0
+        self.resolutions = dict(resolutions)
+        self.buckets: Dict[str, Dict[int, Dict]] = {name: {} for name in self.resolutions}
+
+    def add(self, ts: float, pnl: float, notional: float) -> Dict[str, Dict]:
+        """Fold one trade in; returns the bucket it touched at each resolution"""
+        before = self.equity
+        self.equity += pnl
+        self.trades += 1
+        touched = {}
+        for name, seconds in self.resolutions.items():
+            start = int(ts // seconds * seconds)
+            bucket = self.buckets[name].get(start)
+            if bucket is None:
+                bucket = self.buckets[name][start] = {
+                    't': start, 'open': before, 'high': before, 'low': before, 'close': before,
+                    'pnl': 0.0, 'trades': 0, 'notional': 0.0
+                }
+            bucket['high'] = max(bucket['high'], self.equity)
+            bucket['low'] = min(bucket['low'], self.equity)
+            bucket['close'] = self.equity
+            bucket['pnl'] += pnl
+            bucket['trades'] += 1
+            bucket['notional'] += notional
+            touched[name] = bucket
+        return touched
+
+    def series(self, resolution: str, since: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        buckets = self.buckets[resolution]
+        starts = sorted(buckets)
+        if since is not None:
+            starts = [t for t in starts if t >= since]
+        if limit:
+            starts = starts[-limit:]
+        return [buckets[t] for t in starts]
+
+
+class AnalyticsAPI:
+    """Serves dashboard data from pre-aggregates, with ETag/gzip caching and server-sent events
+
+    A refresh task tails the journal (by trade id) and the prediction log
+    (by file offset) every ``refresh_interval`` seconds and folds new rows
+    into ``Rollups`` and running prediction counters. Responses are cached
+    per URL until that data changes; clients presenting the current ETag
+    get 304. ``/api/stream`` pushes trade, equity-bucket and ticker deltas
+    as they arrive, so the dashboard never re-fetches full datasets.
+
+    Endpoints: ``/api/trades`` (``page``/``page_size``, newest first, or
+    ``after`` cursor), ``/api/equity`` (``resolution``, ``since``,
+    ``limit``), ``/api/predictions`` (``page``/``page_size``),
+    ``/api/metrics``, ``/api/ticker``, ``/api/stream``, ``/health``.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 predictions_path: Optional[str] = None,
+                 ticker_cache: Optional[TickerCache] = None,
+                 registry: MetricsRegistry = metrics,
+                 initial_equity: float = 0.0,
+                 refresh_interval: float = 1.0,
+                 host: str = "127.0.0.1",
+                 port: int = 8000):
+        self.db_path = db_path
+        self.predictions_path = predictions_path
+        self.ticker_cache = ticker_cache
+        self.registry = registry
+        self.refresh_interval = refresh_interval
+        self.host = host
+        self.port = port
+        self.rollups = Rollups(initial_equity)
+        self.version = 0
+        self.last_trade_id = 0
+        self.predictions: List[Dict] = []
+        self.prediction_stats = {'total': 0, 'verified': 0, 'correct': 0, 'confidence_sum': 0.0}
+        self._predictions_offset = 0
+        self._ticker_sent: Dict[str, float] = {}
+        self._cache: "OrderedDict[str, Tuple[int, bytes, str]]" = OrderedDict()
+        self._subscribers: set = set()
+        self._clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._db_conn: Optional[sqlite3.Connection] = None
+        # SQLite and log reads stay on one worker thread so they never block the event loop
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics-io")
+        self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ---------- data access ----------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._db_conn is None:
+            self._db_conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return self._db_conn
+
+    def _fetch_trades_after(self, after_id: int, limit: int) -> List[Tuple]:
+        return self._db().execute(
+            "SELECT id, timestamp, action, quantity, price, pnl FROM trades WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        ).fetchall()
+
+    def _fetch_trades_page(self, offset: int, limit: int) -> List[Tuple]:
+        return self._db().execute(
+            "SELECT id, timestamp, action, quantity, price, pnl FROM trades ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+
+    async def _query(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, fn, *args)
+
+    @staticmethod
+    def _trade_dict(row: Tuple) -> Dict:
+        trade_id, timestamp, action, quantity, price, pnl = row
+        return {'id': trade_id, 'timestamp': timestamp, 'action': action,
+                'quantity': quantity, 'price': price, 'pnl': pnl}
+
+    # ---------- refresh ----------
+
+    async def refresh(self) -> List[Tuple[str, Dict]]:
+        """Fold new journal rows, predictions and quotes in; returns the events to push"""
+        events = []
+        changed = False
+        try:
+            while True:
+                rows = await self._query(self._fetch_trades_after, self.last_trade_id, 5000)
+                if not rows:
+                    break
+                touched = {}
+                for row in rows:
+                    trade = self._trade_dict(row)
+                    self.last_trade_id = trade['id']
+                    try:
+                        ts = datetime.fromisoformat(trade['timestamp']).timestamp()
+                        notional = trade['quantity'] * trade['price']
+                    except (TypeError, ValueError):
+                        logger.warning("Skipping malformed journal trade %s", trade['id'])
+                        continue
+                    pnl = trade['pnl'] or 0.0
+                    for name, bucket in self.rollups.add(ts, pnl, notional).items():
+                        touched[(name, bucket['t'])] = (name, bucket)
+                    events.append(('trade', trade))
+                events.extend(('equity', {'resolution': name, **bucket}) for name, bucket in touched.values())
+                changed = True
+                if len(rows) < 5000:
+                    break
+        except sqlite3.Error as e:
+            logger.error("✗ Journal refresh failed: %s", e)
+
+        if await self._refresh_predictions():
+            changed = True
+        if changed:
+            self.version += 1
+            # Every cached body predates the new data
+            self._cache.clear()
+        events.extend(self._ticker_events())
+        return events
+
+    def _read_predictions(self, offset: int) -> Tuple[int, bytes]:
+        """(file size, bytes past offset) of the prediction log; runs on the I/O worker"""
+        if not self.predictions_path or not os.path.exists(self.predictions_path):
+            return offset, b""
+        size = os.path.getsize(self.predictions_path)
+        if size <= offset:
+            return size, b""
+        with open(self.predictions_path, 'rb') as f:
+            f.seek(offset)
+            return size, f.read()
+
+    async def _refresh_predictions(self) -> bool:
+        """Tail new lines of the prediction log from the last offset"""
+        size, chunk = await self._query(self._read_predictions, self._predictions_offset)
+        if size < self._predictions_offset:
+            # Log was rotated or truncated; start over
+            self.predictions.clear()
+            self.prediction_stats = {'total': 0, 'verified': 0, 'correct': 0, 'confidence_sum': 0.0}
+            self._predictions_offset = 0
+            size, chunk = await self._query(self._read_predictions, 0)
+        complete = chunk.rfind(b"\n") + 1
+        if not complete:
+            return False
+        start = self._predictions_offset
+        self._predictions_offset += complete
+        stats = self.prediction_stats
+        for line in chunk[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                logger.warning("Skipping malformed prediction record after byte %d of %s", start, self.predictions_path)
+                continue
+            self.predictions.append(record)
+            stats['total'] += 1
+            stats['confidence_sum'] += record.get('confidence') or 0.0
+            if record.get('actual') is not None:
+                stats['verified'] += 1
+                stats['correct'] += record.get('correct') is True
+        return True
+
+    def _ticker_events(self) -> List[Tuple[str, Dict]]:
+        if self.ticker_cache is None:
+            return []
+        events = []
+        for symbol, quote in self.ticker_cache.snapshot().items():
+            if quote.received > self._ticker_sent.get(symbol, 0.0):
+                self._ticker_sent[symbol] = quote.received
+                events.append(('ticker', self._quote_dict(quote)))
+        return events
+
+    @staticmethod
+    def _quote_dict(quote) -> Dict:
+        return {'symbol': quote.symbol, 'last': quote.last, 'bid': quote.bid, 'ask': quote.ask,
+                'mid': quote.mid, 'exchange_time': quote.exchange_time, 'received': quote.received}
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                for event in await self.refresh():
+                    self._broadcast(*event)
+            except Exception:
+                # One bad poll must not stop every later one
+                logger.exception("✗ Analytics refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+
+    # ---------- routes ----------
+
+    async def route(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict, bool]:
+        """(status, payload, cacheable) for one GET"""
+        if path == '/health':
+            return 200, {'status': 'ok', 'version': self.version, 'trades': self.rollups.trades}, False
+        if path == '/api/trades':
+            return 200, await self._trades(params), True
+        if path == '/api/equity':
+            resolution = params.get('resolution', '1h')
+            if resolution not in self.rollups.resolutions:
+                return 400, {'error': f"resolution must be one of {sorted(self.rollups.resolutions)}"}, False
+            since = float(params['since']) if 'since' in params else None
+            limit = int(params['limit']) if 'limit' in params else None
+            return 200, {
+                'resolution': resolution,
+                'initial_equity': self.rollups.initial_equity,
+                'equity': self.rollups.equity,
+                'buckets': self.rollups.series(resolution, since, limit)
+            }, True
+        if path == '/api/predictions':
+            return 200, self._predictions_page(params), True
+        if path == '/api/metrics':
+            return 200, {'metrics': self.registry.snapshot(), 'equity': self.rollups.equity,
+                         'trades': self.rollups.trades}, False
+        if path == '/api/ticker':
+            quotes = self.ticker_cache.snapshot() if self.ticker_cache is not None else {}
+            return 200, {'quotes': [self._quote_dict(q) for q in quotes.values()]}, False
+        return 404, {'error': 'not found'}, False
+
+    def _page_params(self, params: Dict[str, str]) -> Tuple[int, int]:
+        page = max(1, int(params.get('page', 1)))
+        page_size = min(MAX_PAGE_SIZE, max(1, int(params.get('page_size', 100))))
+        return page, page_size
+
+    async def _trades(self, params: Dict[str, str]) -> Dict:
+        page, page_size = self._page_params(params)
+        total = self.rollups.trades
+        if 'after' in params:
+            rows = await self._query(self._fetch_trades_after, int(params['after']), page_size)
+            trades = [self._trade_dict(r) for r in rows]
+            return {'trades': trades, 'total': total,
+                    'next_after': trades[-1]['id'] if len(trades) == page_size else None}
+        rows = await self._query(self._fetch_trades_page, (page - 1) * page_size, page_size)
+        return {'trades': [self._trade_dict(r) for r in rows], 'total': total, 'page': page,
+                'pages': max(1, -(-total // page_size))}
+
+    def _predictions_page(self, params: Dict[str, str]) -> Dict:
+        page, page_size = self._page_params(params)
+        stats = self.prediction_stats
+        total = stats['total']
+        end = total - (page - 1) * page_size
+        return {
+            'predictions': self.predictions[max(0, end - page_size):max(0, end)][::-1],
+            'total': total,
+            'page': page,
+            'pages': max(1, -(-total // page_size)),
+            'summary': {
+                'verified': stats['verified'],
+                'correct': stats['correct'],
+                'accuracy': stats['correct'] / stats['verified'] * 100 if stats['verified'] else 0.0,
+                'avg_confidence': stats['confidence_sum'] / total if total else 0.0
+            }
+        }
+
+    # ---------- HTTP ----------
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode('latin-1').rstrip("\r\n").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                url = urlsplit(target)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+                if method != "GET":
+                    await self._respond(writer, 405, {'error': 'read-only API'}, headers)
+                elif url.path == '/api/stream':
+                    await self._stream(writer)
+                    break
+                else:
+                    await self._get(writer, url.path, target, params, headers)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            self._clients.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _get(self, writer, path: str, target: str, params: Dict[str, str], headers: Dict[str, str]):
+        cached = self._cache.get(target)
+        if cached is not None and cached[0] == self.version:
+            self._cache.move_to_end(target)
+            _, body, etag = cached
+            await self._send(writer, 200, body, etag, headers)
+            return
+        # Captured before awaiting so a refresh mid-query cannot label old data with the new version
+        version = self.version
+        try:
+            status, payload, cacheable = await self.route(path, params)
+        except (ValueError, KeyError) as e:
+            status, payload, cacheable = 400, {'error': str(e)}, False
+        except Exception as e:
+            logger.error("✗ Analytics request %s failed: %s", target, e)
+            status, payload, cacheable = 500, {'error': 'internal error'}, False
+        body = json.dumps(payload, default=str).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if cacheable and status == 200 and version == self.version:
+            self._cache[target] = (version, body, etag)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        await self._send(writer, status, body, etag, headers)
+
+    async def _respond(self, writer, status: int, payload: Dict, headers: Dict[str, str]):
+        await self._send(writer, status, json.dumps(payload).encode(), None, headers)
+
+    async def _send(self, writer, status: int, body: bytes, etag: Optional[str], headers: Dict[str, str]):
+        response_headers = {
+            'Content-Type': 'application/json',
+            'Cache-Control': 'no-cache',
+            'Access-Control-Allow-Origin': '*',
+            'Vary': 'Accept-Encoding'
+        }
+        if etag is not None:
+            response_headers['ETag'] = etag
+            if status == 200 and headers.get('if-none-match') == etag:
+                status, body = 304, b""
+        if body and len(body) >= GZIP_MIN_BYTES and 'gzip' in headers.get('accept-encoding', ''):
+            body = gzip.compress(body, compresslevel=5)
+            response_headers['Content-Encoding'] = 'gzip'
+        response_headers['Content-Length'] = str(len(body))
+        head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in response_headers.items()) + "\r\n"
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        """Server-sent events: current equity first, then deltas as they are folded in"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\nretry: 3000\n\n")
+        writer.write(self._event('snapshot', {'equity': self.rollups.equity, 'trades': self.rollups.trades,
+                                              'last_trade_id': self.last_trade_id}))
+        await writer.drain()
+        queue = asyncio.Queue(maxsize=1000)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    message = b": keep-alive\n\n"
+                if message is None:
+                    break
+                writer.write(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+
+    @staticmethod
+    def _event(name: str, data: Dict) -> bytes:
+        return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+    def _broadcast(self, name: str, data: Dict):
+        if not self._subscribers:
+            return
+        message = self._event(name, data)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow client: drop it; EventSource reconnects and resyncs from the snapshot
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    # ---------- lifecycle ----------
+
+    async def serve(self):
+        """Run the server and refresh task until cancelled"""
+        await self.refresh()
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        refresher = asyncio.create_task(self._refresh_loop())
+        self._ready.set()
+        logger.info("✓ Analytics API on %s", self.url)
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            refresher.cancel()
+            await self._close_clients()
+
+    async def _close_clients(self):
+        """End SSE streams and idle keep-alive connections so their handlers return"""
+        for queue in list(self._subscribers):
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        for writer in list(self._clients.values()):
+            writer.close()
+        if self._clients:
+            await asyncio.gather(*self._clients, return_exceptions=True)
+
+    def start(self) -> "AnalyticsAPI":
+        self._thread = threading.Thread(target=self._run, name="analytics-api", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._main_task.cancel)
+        if self._thread is not None:
+            self._thread.join()
+        if self._db_conn is not None:
+            self._io_executor.submit(self._db_conn.close).result()
+            self._db_conn = None
+        self._io_executor.shutdown()
+
+    def __enter__(self) -> "AnalyticsAPI":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._main_task = self._loop.create_task(self.serve())
+        try:
+            self._loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve journal, prediction and metrics analytics for the dashboard")
+    parser.add_argument('--db', default='trades.db', help="TradeJournal SQLite file")
+    parser.add_argument('--predictions', help="PredictionLogger .jsonl file")
+    parser.add_argument('--initial-equity', type=float, default=0.0)
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="interface to bind; the API has no authentication, so expose it deliberately")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--refresh', type=float, default=1.0, help="seconds between journal polls")
+    args = parser.parse_args()
+
+    from src.logging_setup import setup_logging
+    setup_logging(logging.INFO)
+    api = AnalyticsAPI(args.db, args.predictions, initial_equity=args.initial_equity,
+                       refresh_interval=args.refresh, host=args.host, port=args.port)
+    try:
+        asyncio.run(api.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,113 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.model_selection import TimeSeriesSplit
 from datetime import datetime
-import joblib
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+
+from src.instrumentation import timed
+from src.model_cache import ModelCache, get_model_cache
+from src.model_persistence import ModelPersistence
 
 logger = logging.getLogger(__name__)
 
+
+class _EWMState:
+    """Running numerator and weight of pandas' adjusted ``ewm(span=...).mean()``, carried across blocks"""
+    
+    def __init__(self, span: int):
+        self.beta = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.weight = 0.0
+    
+    def update(self, x: np.ndarray) -> np.ndarray:
+        if len(x) == 0:
+            return x
+        from scipy.signal import lfilter
+        a = [1.0, -self.beta]
+        num = lfilter([1.0], a, x, zi=[self.beta * self.num])[0]
+        weight = lfilter([1.0], a, np.ones(len(x)), zi=[self.beta * self.weight])[0]
+        self.num, self.weight = num[-1], weight[-1]
+        return num / weight
+
+
 class AutoLearner:
     """Incremental machine learning system for trading signal generation"""
     
-    def __init__(self, models_dir: str = "models"):
+    FEATURE_COLUMNS = ['SMA_10', 'SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal',
+                       'Volatility', 'ATR', 'Volume_Ratio', 'Returns', 'High_Low', 'Close_Position']
+    # Longest rolling window (SMA_50); blocks of a stream are computed with this many prior rows
+    WARMUP_BARS = 50
+    
+    def __init__(self,
+                 models_dir: str = "models",
+                 cache: Optional[ModelCache] = None,
+                 persistence: Optional[ModelPersistence] = None,
+                 compact: bool = False):
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(exist_ok=True)
+        self.cache = cache if cache is not None else get_model_cache()
+        self.persistence = persistence
         self.models = {}
         self.scalers = {}
         self.training_history = []
         self.performance_metrics = {}
+        # Compact mode trains and scores on one float32 matrix of FEATURE_COLUMNS
+        self.compact = compact
+        self.dtype = np.float32 if compact else np.float64
         
     def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate trading features from OHLCV data"""
         df = df.copy()
+        self._add_features(df, *self._calculate_macd(df['close']))
+        return df.dropna()
+    
+    def iter_features(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Yield prepare_features output block by block, for histories larger than RAM
+        
+        ``chunks`` are consecutive OHLCV frames, e.g. ``pd.read_csv(path,
+        chunksize=100_000)``. Each block is computed with the previous
+        ``WARMUP_BARS`` raw rows prepended, which covers every rolling window,
+        while the MACD EWMs carry their state across blocks, so the blocks
+        concatenate to prepare_features on the whole history.
+        """
+        fast, slow, signal = _EWMState(12), _EWMState(26), _EWMState(9)
+        tail = None
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            close = chunk['close'].to_numpy(dtype=np.float64)
+            macd = fast.update(close) - slow.update(close)
+            macd_signal = signal.update(macd)
+            
+            n_tail = 0 if tail is None else len(tail)
+            block = chunk.copy() if tail is None else pd.concat([tail, chunk])
+            tail = block.iloc[-self.WARMUP_BARS:].copy()
+            pad = np.full(n_tail, np.nan)
+            self._add_features(block, np.concatenate([pad, macd]), np.concatenate([pad, macd_signal]))
+            yield block.iloc[n_tail:].dropna()
+    
+    def iter_training_data(self, chunks: Iterable[pd.DataFrame], lookahead=5, threshold=0.01) -> Iterator[pd.DataFrame]:
+        """Yield generate_labels(prepare_features(history)) block by block
         
+        Labels look ``lookahead`` rows ahead, so the last rows of each block
+        are held back (with one row of context) until the next block arrives.
+        """
+        held, context = None, 0
+        for block in self.iter_features(chunks):
+            if held is not None:
+                block = pd.concat([held, block])
+            if len(block) <= context + lookahead:
+                held = block
+                continue
+            labeled = self.generate_labels(block, lookahead, threshold)
+            yield labeled.iloc[context:len(block) - lookahead]
+            held, context = block.iloc[-(lookahead + 1):], 1
+        if held is not None:
+            yield self.generate_labels(held, lookahead, threshold).iloc[context:]
+    
+    def _add_features(self, df: pd.DataFrame, macd, signal):
+        """Add indicator columns to df in place; MACD is passed in so streams can carry its EWM state"""
         # Technical indicators
         df['SMA_10'] = df['close'].rolling(10).mean()
         df['SMA_20'] = df['close'].rolling(20).mean()
@@ -33,7 +115,7 @@ class AutoLearner:
         
         # Momentum indicators
         df['RSI'] = self._calculate_rsi(df['close'], 14)
-        df['MACD'], df['Signal'] = self._calculate_macd(df['close'])
+        df['MACD'], df['Signal'] = macd, signal
         
         # Volatility
         df['Volatility'] = df['close'].pct_change().rolling(20).std()
@@ -47,8 +129,6 @@ class AutoLearner:
         df['Returns'] = df['close'].pct_change()
         df['High_Low'] = (df['high'] - df['low']) / df['close']
         df['Close_Position'] = (df['close'] - df['low']) / (df['high'] - df['low'])
-        
-        return df.dropna()
     
     def _calculate_rsi(self, prices, period=14):
         """Calculate Relative Strength Index"""
@@ -74,6 +154,37 @@ class AutoLearner:
         tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
         return tr.rolling(period).mean()
     
+    def feature_matrix(self, df: pd.DataFrame, order: str = 'C', columns: Optional[List[str]] = None) -> np.ndarray:
+        """Feature columns of df (FEATURE_COLUMNS by default) as one contiguous matrix in the learner's dtype
+        
+        Columns are written straight into a preallocated array, so no
+        intermediate frame or float64 copy is built. Use 'F' order for
+        fitting (tree splitters scan one feature at a time) and 'C' for
+        scoring (each row walks down a tree).
+        """
+        columns = columns or self.FEATURE_COLUMNS
+        out = np.empty((len(df), len(columns)), dtype=self.dtype, order=order)
+        for j, col in enumerate(columns):
+            out[:, j] = df[col].to_numpy()
+        return out
+    
+    def memory_report(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Size of a feature frame against the compact float32 matrix built from it"""
+        frame_bytes = int(df.memory_usage(deep=True).sum())
+        matrix_bytes = len(df) * len(self.FEATURE_COLUMNS) * np.dtype(np.float32).itemsize
+        return {
+            'frame_mb': frame_bytes / 1e6,
+            'matrix_mb': matrix_bytes / 1e6,
+            'saved_mb': (frame_bytes - matrix_bytes) / 1e6,
+            'saved_pct': (1 - matrix_bytes / frame_bytes) * 100 if frame_bytes else 0.0
+        }
+    
+    def _scaled(self, X, scaler) -> np.ndarray:
+        """Scale X for inference, building and scaling the compact matrix in place when enabled"""
+        if self.compact and isinstance(X, pd.DataFrame):
+            return scaler.transform(self.feature_matrix(X, order='C'), copy=False)
+        return scaler.transform(X)
+    
     def generate_labels(self, df: pd.DataFrame, lookahead=5, threshold=0.01) -> pd.DataFrame:
         """Generate training labels (Buy/Sell signals)"""
         df = df.copy()
@@ -81,20 +192,32 @@ class AutoLearner:
         df['Label'] = (future_returns > 1).astype(int)
         return df
     
+    @timed('learner_seconds', op='train')
     def train_model(self, X: pd.DataFrame, y: pd.Series, model_name: str = 'ensemble'):
         """Train ensemble model with cross-validation"""
         logger.info(f"Training {model_name} model with {len(X)} samples")
+        # sklearn is imported on first use so scoring-only processes start fast
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+        from sklearn.model_selection import TimeSeriesSplit
         
-        # Scaler
-        scaler = StandardScaler()
+        # Scaler; the compact matrix is our own copy, so it is scaled in place
+        owned = self.compact and isinstance(X, pd.DataFrame)
+        if owned:
+            X = self.feature_matrix(X, order='F')
+        scaler = StandardScaler(copy=not owned)
         X_scaled = scaler.fit_transform(X)
-        
+        # The stored scaler must not overwrite callers' arrays; _scaled opts in per call
+        scaler.copy = True
+
         # Time series cross-validation
         tscv = TimeSeriesSplit(n_splits=5)
         scores = []
         
         for train_idx, test_idx in tscv.split(X_scaled):
-            X_train, X_test = X_scaled[train_idx], X_scaled[test_idx]
+            # Folds are contiguous ranges, so slice views instead of fancy-index copies
+            X_train = X_scaled[train_idx[0]:train_idx[-1] + 1]
+            X_test = X_scaled[test_idx[0]:test_idx[-1] + 1]
             y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
             
             # Ensemble model
@@ -124,6 +247,7 @@ class AutoLearner:
         self._save_model(model_name)
         logger.info(f"Model {model_name} trained. CV Score: {np.mean(scores):.4f} +/- {np.std(scores):.4f}")
     
+    @timed('learner_seconds', op='predict')
     def predict(self, X: pd.DataFrame, model_name: str = 'ensemble', confidence_threshold: float = 0.5) -> np.ndarray:
         """Generate predictions with confidence scores"""
         if model_name not in self.models:
@@ -133,11 +257,12 @@ class AutoLearner:
         scaler = self.scalers[model_name]
         model = self.models[model_name]
         
-        X_scaled = scaler.transform(X)
+        X_scaled = self._scaled(X, scaler)
         predictions = model.predict_proba(X_scaled)[:, 1]
         
         return (predictions > confidence_threshold).astype(int)
     
+    @timed('learner_seconds', op='confidence')
     def get_confidence_scores(self, X: pd.DataFrame, model_name: str = 'ensemble') -> np.ndarray:
         """Get confidence scores for predictions"""
         if model_name not in self.models:
@@ -145,12 +270,13 @@ class AutoLearner:
         
         scaler = self.scalers[model_name]
         model = self.models[model_name]
-        X_scaled = scaler.transform(X)
+        X_scaled = self._scaled(X, scaler)
         
         return model.predict_proba(X_scaled)[:, 1]
     
     def _save_model(self, model_name: str):
         """Save trained model"""
+        import joblib
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         model_path = self.models_dir / f"{model_name}_{timestamp}.pkl"
         scaler_path = self.models_dir / f"{model_name}_scaler_{timestamp}.pkl"
@@ -158,13 +284,28 @@ class AutoLearner:
         joblib.dump(self.models[model_name], model_path)
         joblib.dump(self.scalers[model_name], scaler_path)
         logger.info(f"Model saved to {model_path}")
+        
+        # Publish to the registry so running agents can hot-reload the new version
+        if self.persistence is not None:
+            self.persistence.save_model(
+                self.models[model_name],
+                model_name,
+                metrics=self.performance_metrics.get(model_name),
+                metadata={"scaler_path": str(scaler_path.resolve()), "source_path": str(model_path.resolve())}
+            )
     
     def load_model(self, model_name: str, model_path: str):
-        """Load pre-trained model"""
-        self.models[model_name] = joblib.load(model_path)
-        scaler_path = model_path.replace('.pkl', '_scaler.pkl')
-        if Path(scaler_path).exists():
-            self.scalers[model_name] = joblib.load(scaler_path)
+        """Load pre-trained model through the shared model cache"""
+        model_path = Path(model_path)
+        # Files are named {model_name}_{timestamp}.pkl, so the timestamp is the version
+        version = model_path.stem[len(model_name) + 1:] if model_path.stem.startswith(f"{model_name}_") else model_path.stem
+        self.models[model_name] = self.cache.get_or_load(model_name, version, str(model_path))
+        
+        for scaler_path in (model_path.with_name(f"{model_name}_scaler_{version}.pkl"),
+                            model_path.with_name(f"{model_path.stem}_scaler.pkl")):
+            if scaler_path.exists():
+                self.scalers[model_name] = self.cache.get_or_load(f"{model_name}_scaler", version, str(scaler_path))
+                break
         logger.info(f"Model {model_name} loaded from {model_path}")
     
     def get_feature_importance(self, model_name: str = 'ensemble') -> Dict[str, float]:
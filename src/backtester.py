@@ -1,33 +1,48 @@
+import numpy as np
 import pandas as pd
 
+from src.ledger import TradeLedger, BUY
+
 class EventDrivenBacktester:
     """Event-driven backtesting engine."""
     
-    def __init__(self, data, broker, rules_engine, model):
+    def __init__(self, data, broker, rules_engine, model, threshold=0.5):
         self.data = data
         self.broker = broker
         self.rules_engine = rules_engine
         self.model = model
-        self.results = []
+        self.threshold = threshold
+        self.results = TradeLedger()
+    
+    def compute_scores(self):
+        """Per-bar signals and model scores; independent of threshold and capital, so cacheable."""
+        signals = self.rules_engine.compute_signals(self.data['close'].to_numpy())
+        features = signals[['sma_short', 'sma_long']]
+        # Bars still inside the SMA warm-up score 0 and never trade
+        valid = features.notna().all(axis=1).to_numpy()
+        scores = np.zeros(len(signals))
+        if valid.any():
+            scores[valid] = self.model.score(features[valid])
+        return signals['signal'].to_numpy(), scores
     
-    def run(self):
-        """Execute backtest on historical data."""
-        for idx, row in self.data.iterrows():
-            # Generate trading signal
-            signal = self.rules_engine.compute_signals([row['close']])
-            
-            # Score the trade
-            if signal is not None:
-                score = self.model.score([signal])
-                
-                if score > 0.5:  # Confidence threshold
-                    self.broker.place_order(1, row['close'])
-                    self.results.append({
-                        'date': row.name,
-                        'action': 'BUY',
-                        'price': row['close']
-                    })
+    def run(self, signals=None, scores=None):
+        """Execute backtest on historical data, reusing precomputed signals and scores if given."""
+        if signals is None or scores is None:
+            signals, scores = self.compute_scores()
+        symbol = getattr(self.broker, 'symbol', '')
+        close = self.data['close'].to_numpy()
+        # Buy on bullish bars the model is confident about
+        for bar in np.flatnonzero((scores > self.threshold) & (signals == 1)):
+            price = float(close[bar])
+            self.broker.place_order(1, price)
+            # Bar position as time; mapped back to the data index in get_results
+            self.results.append(symbol, BUY, 1, price, timestamp=bar)
     
     def get_results(self):
         """Return backtest results."""
-        return pd.DataFrame(self.results)
+        bars = self.results.column('time').astype(int)
+        return pd.DataFrame({
+            'date': self.data.index[bars],
+            'action': np.where(self.results.column('side') == BUY, 'BUY', 'SELL'),
+            'price': self.results.column('price')
+        })
@@ -7,9 +7,13 @@ Calculates Sharpe ratio, Sortino ratio, drawdown, win rate, and other performanc
 import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 from datetime import datetime
 
+from src.metrics_accumulator import MetricsAccumulator
+from src.rolling_metrics import calculate_rolling_metrics
+from src.resampling import bootstrap_returns, shuffle_trades
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,10 +33,10 @@ class BacktestingMetrics:
             if len(excess_returns) == 0 or np.std(excess_returns) == 0:
                 return 0.0
             sharpe = np.sqrt(periods_per_year) * (np.mean(excess_returns) / np.std(excess_returns))
-            logger.info(f"✓ Sharpe Ratio: {sharpe:.2f}")
+            logger.info("✓ Sharpe Ratio: %.2f", sharpe)
             return sharpe
         except Exception as e:
-            logger.error(f"✗ Error calculating Sharpe Ratio: {e}")
+            logger.error("✗ Error calculating Sharpe Ratio: %s", e)
             return 0.0
     
     def calculate_sortino_ratio(self, returns: np.ndarray, periods_per_year: int = 252) -> float:
@@ -44,10 +48,10 @@ class BacktestingMetrics:
             if downside_std == 0:
                 return 0.0
             sortino = np.sqrt(periods_per_year) * (np.mean(excess_returns) / downside_std)
-            logger.info(f"✓ Sortino Ratio: {sortino:.2f}")
+            logger.info("✓ Sortino Ratio: %.2f", sortino)
             return sortino
         except Exception as e:
-            logger.error(f"✗ Error calculating Sortino Ratio: {e}")
+            logger.error("✗ Error calculating Sortino Ratio: %s", e)
             return 0.0
     
     def calculate_max_drawdown(self, equity_curve: np.ndarray) -> Tuple[float, int, int]:
@@ -58,10 +62,10 @@ class BacktestingMetrics:
             max_dd = np.min(drawdown)
             max_dd_idx = np.argmin(drawdown)
             max_dd_percent = abs(max_dd) * 100
-            logger.info(f"✓ Max Drawdown: {max_dd_percent:.2f}%")
+            logger.info("✓ Max Drawdown: %.2f%%", max_dd_percent)
             return max_dd_percent, np.argmax(running_max[:max_dd_idx]), max_dd_idx
         except Exception as e:
-            logger.error(f"✗ Error calculating drawdown: {e}")
+            logger.error("✗ Error calculating drawdown: %s", e)
             return 0.0, 0, 0
     
     def calculate_calmar_ratio(self, returns: np.ndarray, equity_curve: np.ndarray) -> float:
@@ -72,10 +76,10 @@ class BacktestingMetrics:
             if max_dd_percent == 0:
                 return 0.0
             calmar = total_return / (max_dd_percent / 100)
-            logger.info(f"✓ Calmar Ratio: {calmar:.2f}")
+            logger.info("✓ Calmar Ratio: %.2f", calmar)
             return calmar
         except Exception as e:
-            logger.error(f"✗ Error calculating Calmar Ratio: {e}")
+            logger.error("✗ Error calculating Calmar Ratio: %s", e)
             return 0.0
     
     def calculate_win_rate(self, trades: list) -> float:
@@ -85,10 +89,10 @@ class BacktestingMetrics:
                 return 0.0
             wins = sum(1 for t in trades if t['pnl'] > 0)
             win_rate = (wins / len(trades)) * 100
-            logger.info(f"✓ Win Rate: {win_rate:.2f}% ({wins}/{len(trades)})")
+            logger.info("✓ Win Rate: %.2f%% (%s/%s)", win_rate, wins, len(trades))
             return win_rate
         except Exception as e:
-            logger.error(f"✗ Error calculating win rate: {e}")
+            logger.error("✗ Error calculating win rate: %s", e)
             return 0.0
     
     def calculate_profit_factor(self, trades: list) -> float:
@@ -101,10 +105,10 @@ class BacktestingMetrics:
             if gross_loss == 0:
                 return float('inf') if gross_profit > 0 else 0.0
             pf = gross_profit / gross_loss
-            logger.info(f"✓ Profit Factor: {pf:.2f}")
+            logger.info("✓ Profit Factor: %.2f", pf)
             return pf
         except Exception as e:
-            logger.error(f"✗ Error calculating profit factor: {e}")
+            logger.error("✗ Error calculating profit factor: %s", e)
             return 0.0
     
     def calculate_recovery_factor(self, total_return: float, max_drawdown: float) -> float:
@@ -113,44 +117,123 @@ class BacktestingMetrics:
             if max_drawdown == 0:
                 return 0.0
             rf = total_return / max_drawdown
-            logger.info(f"✓ Recovery Factor: {rf:.2f}")
+            logger.info("✓ Recovery Factor: %.2f", rf)
             return rf
         except Exception as e:
-            logger.error(f"✗ Error calculating recovery factor: {e}")
+            logger.error("✗ Error calculating recovery factor: %s", e)
             return 0.0
     
-    def calculate_all_metrics(self, trades: list, equity_curve: list) -> Dict:
-        """Calculate all metrics at once"""
+    def accumulator(self, periods_per_year: int = 252) -> MetricsAccumulator:
+        """Create a streaming accumulator with this instance's settings"""
+        return MetricsAccumulator(self.initial_capital, self.risk_free_rate, periods_per_year)
+    
+    def calculate_streaming_metrics(self,
+                                    equity_chunks: Iterable,
+                                    trade_pnl_chunks: Iterable = ()) -> Dict:
+        """Calculate metrics over chunked equity/PnL sources too large to hold in memory"""
+        try:
+            acc = self.accumulator()
+            for chunk in equity_chunks:
+                acc.update_equity_chunk(chunk)
+            for chunk in trade_pnl_chunks:
+                acc.add_trade_pnls(chunk)
+            return acc.result()
+        except Exception as e:
+            logger.error("✗ Error calculating streaming metrics: %s", e)
+            return {}
+    
+    def calculate_rolling_metrics(self,
+                                  equity_curve: list,
+                                  window: int,
+                                  trades: Optional[list] = None,
+                                  periods_per_year: int = 252,
+                                  index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Rolling Sharpe, Sortino, drawdown and win rate for every bar
+
+        Trades need a 'bar' key (the equity index they closed on) and 'pnl'.
+        """
+        trade_bars = trade_pnls = None
+        if trades:
+            trade_bars = np.fromiter((t['bar'] for t in trades), dtype=np.int64, count=len(trades))
+            trade_pnls = np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades))
+        return calculate_rolling_metrics(
+            equity_curve,
+            window,
+            trade_bars=trade_bars,
+            trade_pnls=trade_pnls,
+            risk_free_rate=self.risk_free_rate,
+            periods_per_year=periods_per_year,
+            index=index
+        )
+    
+    def calculate_confidence_intervals(self,
+                                       equity_curve: list,
+                                       trades: Optional[list] = None,
+                                       n_paths: int = 5000,
+                                       confidence: float = 0.95,
+                                       seed: Optional[int] = None,
+                                       n_jobs: Optional[int] = None) -> Dict:
+        """Bootstrap/Monte Carlo intervals for Sharpe, Sortino, drawdown and trade PnL"""
         try:
-            equity_array = np.array(equity_curve)
+            equity_array = np.asarray(equity_curve, dtype=np.float64)
             returns = np.diff(equity_array) / equity_array[:-1]
-            
-            total_return = (equity_array[-1] - self.initial_capital) / self.initial_capital * 100
-            max_dd, _, _ = self.calculate_max_drawdown(equity_array)
+            result = {
+                'returns': bootstrap_returns(
+                    returns,
+                    n_paths=n_paths,
+                    confidence=confidence,
+                    risk_free_rate=self.risk_free_rate,
+                    seed=seed,
+                    n_jobs=n_jobs
+                )
+            }
+            if trades:
+                pnls = np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades))
+                result['trades'] = shuffle_trades(
+                    pnls,
+                    n_paths=n_paths,
+                    confidence=confidence,
+                    initial_capital=self.initial_capital,
+                    seed=seed,
+                    n_jobs=n_jobs
+                )
+            return result
+        except Exception as e:
+            logger.error("✗ Error calculating confidence intervals: %s", e)
+            return {}
+    
+    def calculate_all_metrics(self, trades: list, equity_curve: list) -> Dict:
+        """Calculate all metrics at once in a single pass"""
+        try:
+            acc = self.accumulator()
+            acc.update_equity_chunk(equity_curve)
+            acc.add_trades(trades)
+            result = acc.result()
             
             metrics = {
-                'total_return': total_return,
-                'sharpe_ratio': self.calculate_sharpe_ratio(returns),
-                'sortino_ratio': self.calculate_sortino_ratio(returns),
-                'max_drawdown': max_dd,
-                'calmar_ratio': self.calculate_calmar_ratio(returns, equity_array),
-                'win_rate': self.calculate_win_rate(trades),
-                'profit_factor': self.calculate_profit_factor(trades),
-                'recovery_factor': self.calculate_recovery_factor(total_return, max_dd),
-                'total_trades': len(trades),
+                'total_return': result['total_return'],
+                'sharpe_ratio': result['sharpe_ratio'],
+                'sortino_ratio': result['sortino_ratio'],
+                'max_drawdown': result['max_drawdown'],
+                'calmar_ratio': result['calmar_ratio'],
+                'win_rate': result['win_rate'],
+                'profit_factor': result['profit_factor'],
+                'recovery_factor': result['recovery_factor'],
+                'total_trades': result['total_trades'],
                 'trades': trades,
-                'final_equity': equity_array[-1]
+                'final_equity': result['final_equity']
             }
             
-            logger.info("\n" + "="*60)
-            logger.info("BACKTEST METRICS SUMMARY")
-            logger.info("="*60)
-            for key, value in metrics.items():
-                if key not in ['trades']:
-                    logger.info(f"  {key}: {value}")
-            logger.info("="*60 + "\n")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\n" + "="*60)
+                logger.info("BACKTEST METRICS SUMMARY")
+                logger.info("="*60)
+                for key, value in metrics.items():
+                    if key not in ['trades']:
+                        logger.info("  %s: %s", key, value)
+                logger.info("="*60 + "\n")
             
             return metrics
         except Exception as e:
-            logger.error(f"✗ Error calculating metrics: {e}")
+            logger.error("✗ Error calculating metrics: %s", e)
             return {}
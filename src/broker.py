@@ -1,35 +1,73 @@
+import numpy as np
+
+from src.fill_simulator import FillSimulator
+from src.ledger import BUY, SELL
+
+
 class PaperBroker:
     """Simulated paper trading broker."""
     
-    def __init__(self, initial_cash=10000.0):
+    def __init__(self, initial_cash=10000.0, slippage=0.0, fee_rate=0.0, fill_simulator=None, symbol='BTCUSDT'):
         self.cash = initial_cash
         self.position = 0.0
-        self.trades = []
+        self.symbol = symbol
+        self.fill_simulator = fill_simulator or FillSimulator(slippage=slippage, fee_rate=fee_rate)
+        self.trades = self.fill_simulator.fills
     
-    def place_order(self, quantity, price):
+    @classmethod
+    def from_config(cls, config, initial_cash=10000.0, **kwargs):
+        """Create broker using the slippage/fee settings from config.yaml."""
+        return cls(
+            initial_cash=initial_cash,
+            fill_simulator=FillSimulator.from_config(config),
+            symbol=config.get('trading', {}).get('symbol', 'BTCUSDT'),
+            **kwargs
+        )
+    
+    def place_order(self, quantity, price, volume=None, timestamp=None):
         """Execute market order."""
-        cost = quantity * price
-        if cost <= self.cash:
+        quantity, fill_price, fee = self.fill_simulator.quote_market_order(BUY, quantity, price, volume)
+        cost = quantity * fill_price + fee
+        if quantity > 0 and cost <= self.cash:
+            self.fill_simulator.record_fill(BUY, quantity, fill_price, fee, self.symbol, timestamp)
             self.cash -= cost
             self.position += quantity
-            self.trades.append({
-                'quantity': quantity,
-                'price': price,
-                'action': 'BUY'
-            })
             return True
         return False
     
-    def close_position(self, price):
+    def close_position(self, price, volume=None, timestamp=None):
         """Close position at given price."""
         if self.position > 0:
-            proceeds = self.position * price
-            self.cash += proceeds
-            self.trades.append({
-                'quantity': self.position,
-                'price': price,
-                'action': 'SELL'
-            })
-            self.position = 0.0
+            quantity, fill_price, fee = self.fill_simulator.fill_market_order(
+                SELL, self.position, price, volume, self.symbol, timestamp
+            )
+            self.cash += quantity * fill_price - fee
+            self.position -= quantity
             return True
         return False
+    
+    def execute_orders(self, bars, bar_index, side, quantity, order_type=None, trigger_price=None):
+        """Fill a batch of orders against OHLCV bars in one vectorized call.
+
+        Cash and position are updated from the aggregate of the fills; orders
+        are not individually checked against available cash.
+        """
+        result = self.fill_simulator.simulate(
+            bar_index,
+            side,
+            quantity,
+            bars['open'].to_numpy(),
+            bars['high'].to_numpy(),
+            bars['low'].to_numpy(),
+            volume=bars['volume'].to_numpy() if 'volume' in bars else None,
+            order_type=order_type,
+            trigger_price=trigger_price,
+            symbol=self.symbol
+        )
+        side = np.asarray(side)
+        filled = result['filled_quantity']
+        done = filled > 0
+        notional = side[done] * filled[done] * result['fill_price'][done]
+        self.cash -= float(notional.sum() + result['fee'].sum())
+        self.position += float((side[done] * filled[done]).sum())
+        return result
@@ -4,15 +4,54 @@ Real-Time Broker Integration Module
 Connects to live trading platforms (Binance, Alpaca) for real-time data and execution
 """
 
-import requests
+import asyncio
 import json
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
-import pandas as pd
+
+from src.instrumentation import metrics, timed
+from src.ledger import TradeLedger, BUY, SELL
+from src.logging_setup import RateLimitedLogger
+from src.market_data import TickerCache
+from src.request_signer import RequestSigner
+from src.rate_limiter import RateLimiter, PRIORITY_ORDER, PRIORITY_ACCOUNT, PRIORITY_MARKET_DATA
 
 logger = logging.getLogger(__name__)
+# Per-order lines; bursts of fills collapse into one line per second with a suppressed count
+trade_logger = RateLimitedLogger(logger, rate=10, period=1.0)
+
+TIME_PATH = "/api/v3/time"
+PRICE_PATH = "/api/v3/ticker/price"
+ACCOUNT_PATH = "/api/v3/account"
+ORDER_PATH = "/api/v3/order"
+OPEN_ORDERS_PATH = "/api/v3/openOrders"
+
+# (connect, read) timeouts in seconds per endpoint; order placement gets the longest read
+ENDPOINT_TIMEOUTS = {
+    TIME_PATH: (3.05, 2.0),
+    PRICE_PATH: (3.05, 2.0),
+    ACCOUNT_PATH: (3.05, 5.0),
+    OPEN_ORDERS_PATH: (3.05, 5.0),
+    ORDER_PATH: (3.05, 10.0)
+}
+DEFAULT_TIMEOUT = (3.05, 10.0)
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Request weight per endpoint when scoped to one symbol, and when not
+ENDPOINT_WEIGHTS = {
+    PRICE_PATH: (2, 4),
+    ACCOUNT_PATH: (20, 20),
+    OPEN_ORDERS_PATH: (6, 80),
+    ORDER_PATH: (1, 1)
+}
+QUERY_ORDER_WEIGHT = 4
+
+# Binance error code for a timestamp outside recvWindow (clock drift)
+TIMESTAMP_OUTSIDE_WINDOW = -1021
 
 
 class BrokerAPI(ABC):
@@ -29,10 +68,32 @@ class BrokerAPI(ABC):
         pass
     
     @abstractmethod
-    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET") -> Dict:
+    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET",
+                    price: Optional[float] = None) -> Dict:
         """Place a market or limit order"""
         pass
     
+    def place_orders(self, orders: List[Dict]) -> List[Future]:
+        """Submit many orders at once; each future resolves to that order's place_order result
+        
+        Orders are dicts of place_order keyword arguments. This default runs
+        them in turn and returns completed futures; brokers with network
+        round trips override it to submit concurrently.
+        """
+        futures = []
+        for order in orders:
+            future = Future()
+            try:
+                future.set_result(self.place_order(**order))
+            except Exception as e:
+                future.set_exception(e)
+            futures.append(future)
+        return futures
+    
+    def get_order(self, symbol: str, order_id: int) -> Dict:
+        """Current exchange-side state of one order ({} when not supported)"""
+        return {}
+    
     @abstractmethod
     def get_open_positions(self) -> List[Dict]:
         """Get all open positions"""
@@ -45,184 +106,401 @@ class BrokerAPI(ABC):
 
 
 class BinanceIntegration(BrokerAPI):
-    """Binance Spot Trading Integration"""
+    """Binance Spot Trading Integration
+
+    Requests go through one ``requests.Session`` whose adapter keeps a
+    bounded pool of keep-alive connections, so repeated calls reuse TCP/TLS
+    connections. Each endpoint has its own (connect, read) timeout. The
+    ``get_market_prices``/``get_open_orders``/``snapshot`` methods fan calls
+    out over a thread pool sized to the connection pool, so N symbols cost
+    about one round trip instead of N; ``arequest`` exposes the same calls
+    to asyncio code.
+    
+    Every request first pays its weight (and, for new orders, an order
+    count) to a ``RateLimiter``; order traffic is served ahead of account
+    and market-data calls when the budget is short.
+    
+    With a ``market_data`` cache (kept current by a ``MarketDataFeed``),
+    price lookups are served from memory while the cached quote is younger
+    than ``max_quote_age`` seconds; REST results refresh the cache.
     
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    Signed calls go through a ``RequestSigner``: the HMAC is keyed once,
+    timestamps follow the server clock (offset synced from /api/v3/time on
+    the first signed call and every ``clock_sync_interval`` seconds after),
+    and the URL-encoded payload is sent byte-for-byte as signed. A request
+    rejected for its timestamp triggers one resync and retry.
+    """
+    
+    def __init__(self,
+                 api_key: str,
+                 api_secret: str,
+                 testnet: bool = True,
+                 base_url: Optional[str] = None,
+                 pool_size: int = 10,
+                 timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 market_data: Optional[TickerCache] = None,
+                 max_quote_age: float = 2.0,
+                 recv_window: Optional[int] = None,
+                 clock_sync_interval: Optional[float] = 300.0,
+                 order_workers: int = 4):
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
-        self.base_url = "https://testnet.binance.vision" if testnet else "https://api.binance.com"
+        self.base_url = base_url or ("https://testnet.binance.vision" if testnet else "https://api.binance.com")
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.market_data = market_data
+        self.max_quote_age = max_quote_age
+        # requests is only needed by live exchange connections, not paper trading
+        import requests
+        from requests.adapters import HTTPAdapter
         self.session = requests.Session()
         self.session.headers.update({"X-MBX-APIKEY": api_key})
+        # pool_block makes callers beyond pool_size wait for a connection instead of opening throwaway ones
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size + order_workers, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="binance")
+        # Orders get their own workers so they never queue behind a market-data fan-out
+        self._order_executor = ThreadPoolExecutor(max_workers=order_workers, thread_name_prefix="binance-orders")
+        self.signer = RequestSigner(
+            api_secret,
+            server_time=lambda: self._request("GET", TIME_PATH)["serverTime"],
+            recv_window=recv_window,
+            sync_interval=clock_sync_interval or 300.0
+        )
+        self.clock_sync_interval = clock_sync_interval
+        self._clock_started = False
+        self._clock_lock = threading.Lock()
+    
+    def __enter__(self) -> "BinanceIntegration":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Release the worker threads, clock sync and pooled connections"""
+        self.signer.stop()
+        self._order_executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
+        self.session.close()
     
     def _get_signature(self, data: str) -> str:
         """Generate HMAC SHA256 signature"""
-        import hmac
-        import hashlib
-        return hmac.new(
-            self.api_secret.encode(),
-            data.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        return self.signer.signature(data)
+    
+    def _ensure_clock_sync(self):
+        """Start server clock tracking before the first signed request"""
+        if self._clock_started or not self.clock_sync_interval:
+            return
+        # Concurrent first callers wait on the lock until the offset is known, not sign with 0
+        with self._clock_lock:
+            if not self._clock_started:
+                self.signer.start()
+                self._clock_started = True
+    
+    def _request(self, method: str, path: str, params: Optional[Dict] = None, signed: bool = False,
+                 resync: bool = True):
+        """Send one request over the pooled session and return the decoded JSON body"""
+        params = dict(params or {})
+        if signed:
+            self._ensure_clock_sync()
+        self.rate_limiter.acquire(*self._request_cost(method, path, params))
+        url = f"{self.base_url}{path}"
+        timeout = self.timeouts.get(path, DEFAULT_TIMEOUT)
+        with metrics.timer('broker_request_seconds', broker='binance', endpoint=path):
+            if not signed:
+                response = self.session.request(method, url, params=params, timeout=timeout)
+            else:
+                # Signed after any rate-limit wait so the timestamp is fresh; the payload is sent verbatim
+                payload = self.signer.sign(params)
+                if method == "POST":
+                    response = self.session.request(method, url, data=payload, headers=FORM_HEADERS, timeout=timeout)
+                else:
+                    response = self.session.request(method, f"{url}?{payload}", timeout=timeout)
+        metrics.inc('broker_requests_total', broker='binance', endpoint=path, status=str(response.status_code))
+        self.rate_limiter.update_from_headers(response.headers)
+        if metrics.enabled:
+            self._publish_headroom()
+        if response.status_code in (418, 429):
+            self.rate_limiter.backoff(float(response.headers.get("Retry-After", 1)))
+        if signed and resync and response.status_code == 400 and _error_code(response) == TIMESTAMP_OUTSIDE_WINDOW:
+            logger.warning("Request timestamp rejected; resyncing server clock")
+            if self.signer.sync():
+                return self._request(method, path, params, signed, resync=False)
+        response.raise_for_status()
+        return response.json()
+    
+    @staticmethod
+    def _request_cost(method: str, path: str, params: Dict) -> Tuple[int, int, int]:
+        """(weight, orders, priority) to charge the rate limiter for one request"""
+        scoped, unscoped = ENDPOINT_WEIGHTS.get(path, (1, 1))
+        weight = scoped if "symbol" in params else unscoped
+        if method in ("POST", "DELETE"):
+            # Only new orders count against the order budget; cancels cost weight alone
+            return weight, int(method == "POST" and path == ORDER_PATH), PRIORITY_ORDER
+        if path == ORDER_PATH:
+            return QUERY_ORDER_WEIGHT, 0, PRIORITY_ACCOUNT
+        if path == PRICE_PATH:
+            return weight, 0, PRIORITY_MARKET_DATA
+        return weight, 0, PRIORITY_ACCOUNT
+    
+    def rate_limit_headroom(self) -> Dict[str, float]:
+        """Remaining request-weight and order budgets, for dashboards and logs"""
+        return self.rate_limiter.headroom()
+    
+    def _publish_headroom(self):
+        """Mirror the rate limiter's budgets into the metrics registry as gauges"""
+        headroom = self.rate_limiter.headroom()
+        for budget in ('weight', 'order'):
+            metrics.set_gauge('broker_rate_limit_headroom', headroom[f'{budget}_headroom'],
+                              broker='binance', budget=budget)
+        metrics.set_gauge('broker_rate_limit_waiting', headroom['waiting'], broker='binance')
+        metrics.set_gauge('broker_rate_limit_paused_seconds', headroom['paused_for'], broker='binance')
+    
+    def submit(self, method: str, path: str, params: Optional[Dict] = None, signed: bool = False) -> Future:
+        """Run a request on the worker pool (new orders on the order pool) and return its future"""
+        executor = self._order_executor if method in ("POST", "DELETE") else self._executor
+        return executor.submit(self._request, method, path, params, signed)
+    
+    async def arequest(self, method: str, path: str, params: Optional[Dict] = None, signed: bool = False):
+        """Awaitable request for asyncio callers; the blocking I/O stays on the worker pool"""
+        return await asyncio.wrap_future(self.submit(method, path, params, signed))
     
     def get_account_balance(self) -> float:
         """Get USDT balance from account"""
         try:
-            params = {"timestamp": int(datetime.now().timestamp() * 1000)}
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            signature = self._get_signature(query_string)
-            params["signature"] = signature
-            
-            response = self.session.get(f"{self.base_url}/api/v3/account", params=params)
-            if response.status_code == 200:
-                balances = response.json()["balances"]
-                usdt = next((b["free"] for b in balances if b["asset"] == "USDT"), 0)
-                logger.info(f"✓ Binance balance: {usdt} USDT")
-                return float(usdt)
+            return self._parse_balance(self._request("GET", ACCOUNT_PATH, signed=True))
         except Exception as e:
-            logger.error(f"✗ Failed to get Binance balance: {e}")
+            logger.error("✗ Failed to get Binance balance: %s", e)
         return 0.0
     
     def get_market_price(self, symbol: str = "BTCUSDT") -> float:
         """Get current market price"""
-        try:
-            response = requests.get(f"{self.base_url}/api/v3/ticker/price", params={"symbol": symbol})
-            if response.status_code == 200:
-                price = float(response.json()["price"])
-                logger.info(f"✓ {symbol} price: ${price:.2f}")
+        if self.market_data is not None:
+            price = self.market_data.price(symbol, self.max_quote_age)
+            if price:
                 return price
+        try:
+            price = float(self._request("GET", PRICE_PATH, {"symbol": symbol})["price"])
+            if self.market_data is not None:
+                self.market_data.update(symbol, last=price)
+            logger.debug("✓ %s price: $%.2f", symbol, price)
+            return price
         except Exception as e:
-            logger.error(f"✗ Failed to get {symbol} price: {e}")
+            logger.error("✗ Failed to get %s price: %s", symbol, e)
         return 0.0
     
-    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET") -> Dict:
-        """Place market order"""
+    def get_market_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch prices for many symbols concurrently; failed symbols map to 0.0"""
+        prices = {}
+        if self.market_data is not None:
+            for symbol in symbols:
+                price = self.market_data.price(symbol, self.max_quote_age)
+                if price:
+                    prices[symbol] = price
+        futures = {
+            symbol: self.submit("GET", PRICE_PATH, {"symbol": symbol})
+            for symbol in symbols if symbol not in prices
+        }
+        for symbol, future in futures.items():
+            prices[symbol] = self._price_result(symbol, future)
+            if prices[symbol] and self.market_data is not None:
+                self.market_data.update(symbol, last=prices[symbol])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Prices for %d/%d symbols", sum(1 for p in prices.values() if p), len(symbols))
+        return prices
+    
+    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET",
+                    price: Optional[float] = None) -> Dict:
+        """Place market or limit order"""
         try:
             params = {
                 "symbol": symbol,
                 "side": side.upper(),
                 "type": order_type.upper(),
-                "quantity": quantity,
-                "timestamp": int(datetime.now().timestamp() * 1000)
+                "quantity": quantity
             }
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            signature = self._get_signature(query_string)
-            params["signature"] = signature
-            
-            response = self.session.post(f"{self.base_url}/api/v3/order", params=params)
-            if response.status_code == 200:
-                order = response.json()
-                logger.info(f"✓ Order placed: {side} {quantity} {symbol}")
-                return {"status": "success", "order_id": order.get("orderId"), "data": order}
+            if price is not None:
+                params.update(price=price, timeInForce="GTC")
+            order = self._request("POST", ORDER_PATH, params, signed=True)
+            trade_logger.info("✓ Order placed: %s %s %s", side, quantity, symbol)
+            return {"status": "success", "order_id": order.get("orderId"), "data": order}
         except Exception as e:
-            logger.error(f"✗ Failed to place order: {e}")
-        return {"status": "failed", "error": str(e)}
+            logger.error("✗ Failed to place order: %s", e)
+            return {"status": "failed", "error": str(e)}
+    
+    def place_orders(self, orders: List[Dict]) -> List[Future]:
+        """Submit orders concurrently on the worker pool without waiting for acknowledgements
+        
+        Binance spot has no batch order endpoint, so each order is its own
+        request. Orders run on a dedicated pool, so they do not wait behind
+        queued market-data calls, and the rate limiter serves them first.
+        """
+        futures = [self._order_executor.submit(self.place_order, **order) for order in orders]
+        logger.info("✓ Submitted %s orders", len(futures))
+        return futures
+    
+    def get_order(self, symbol: str, order_id: int) -> Dict:
+        """Query one order's status and executed quantity"""
+        try:
+            return self._request("GET", ORDER_PATH, {"symbol": symbol, "orderId": order_id}, signed=True)
+        except Exception as e:
+            logger.error("✗ Failed to query order %s: %s", order_id, e)
+        return {}
     
     def get_open_positions(self) -> List[Dict]:
         """Get open positions"""
         try:
-            params = {"timestamp": int(datetime.now().timestamp() * 1000)}
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            signature = self._get_signature(query_string)
-            params["signature"] = signature
-            
-            response = self.session.get(f"{self.base_url}/api/v3/openOrders", params=params)
-            if response.status_code == 200:
-                positions = response.json()
-                logger.info(f"✓ Open positions: {len(positions)}")
-                return positions
+            positions = self._request("GET", OPEN_ORDERS_PATH, signed=True)
+            logger.info("✓ Open positions: %s", len(positions))
+            return positions
         except Exception as e:
-            logger.error(f"✗ Failed to get open positions: {e}")
+            logger.error("✗ Failed to get open positions: %s", e)
         return []
     
+    def get_open_orders(self, symbols: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch open orders for many symbols concurrently"""
+        futures = {
+            symbol: self.submit("GET", OPEN_ORDERS_PATH, {"symbol": symbol}, signed=True)
+            for symbol in symbols
+        }
+        return {symbol: self._orders_result(symbol, future) for symbol, future in futures.items()}
+    
+    def snapshot(self, symbols: List[str]) -> Dict:
+        """Prices, USDT balance and open orders for many symbols at once
+        
+        Every request is submitted before any result is awaited, so the call
+        takes one round trip per ``pool_size`` requests rather than one per request.
+        """
+        price_futures = {symbol: self.submit("GET", PRICE_PATH, {"symbol": symbol}) for symbol in symbols}
+        order_futures = {
+            symbol: self.submit("GET", OPEN_ORDERS_PATH, {"symbol": symbol}, signed=True)
+            for symbol in symbols
+        }
+        balance_future = self.submit("GET", ACCOUNT_PATH, signed=True)
+        
+        try:
+            balance = self._parse_balance(balance_future.result())
+        except Exception as e:
+            logger.error("✗ Failed to get Binance balance: %s", e)
+            balance = 0.0
+        return {
+            "prices": {symbol: self._price_result(symbol, f) for symbol, f in price_futures.items()},
+            "balance": balance,
+            "open_orders": {symbol: self._orders_result(symbol, f) for symbol, f in order_futures.items()}
+        }
+    
     def close_position(self, symbol: str) -> bool:
         """Cancel all orders for a symbol"""
         try:
-            params = {
-                "symbol": symbol,
-                "timestamp": int(datetime.now().timestamp() * 1000)
-            }
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            signature = self._get_signature(query_string)
-            params["signature"] = signature
-            
-            response = self.session.delete(f"{self.base_url}/api/v3/openOrders", params=params)
-            if response.status_code == 200:
-                logger.info(f"✓ Closed all positions for {symbol}")
-                return True
+            self._request("DELETE", OPEN_ORDERS_PATH, {"symbol": symbol}, signed=True)
+            logger.info("✓ Closed all positions for %s", symbol)
+            return True
         except Exception as e:
-            logger.error(f"✗ Failed to close position: {e}")
+            logger.error("✗ Failed to close position: %s", e)
         return False
+    
+    @staticmethod
+    def _parse_balance(account: Dict) -> float:
+        usdt = next((b["free"] for b in account["balances"] if b["asset"] == "USDT"), 0)
+        logger.info("✓ Binance balance: %s USDT", usdt)
+        return float(usdt)
+    
+    @staticmethod
+    def _price_result(symbol: str, future: Future) -> float:
+        try:
+            return float(future.result()["price"])
+        except Exception as e:
+            logger.error("✗ Failed to get %s price: %s", symbol, e)
+        return 0.0
+    
+    @staticmethod
+    def _orders_result(symbol: str, future: Future) -> List[Dict]:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error("✗ Failed to get open orders for %s: %s", symbol, e)
+        return []
 
 
 class PaperTraderBroker(BrokerAPI):
     """Paper Trading Broker (Simulated)"""
     
-    def __init__(self, initial_balance: float = 10000.0):
+    def __init__(self, initial_balance: float = 10000.0, market_data: Optional[TickerCache] = None,
+                 max_quote_age: float = 2.0):
         self.balance = initial_balance
+        self.market_data = market_data
+        self.max_quote_age = max_quote_age
         self.positions = {}
-        self.trade_history = []
-        self.orders = []
+        self.trade_history = TradeLedger()
+        # Every paper order fills immediately, so orders and fills share one ledger
+        self.orders = self.trade_history
     
     def get_account_balance(self) -> float:
-        logger.info(f"✓ Paper trader balance: ${self.balance:.2f}")
+        logger.info("✓ Paper trader balance: $%.2f", self.balance)
         return self.balance
     
     def get_market_price(self, symbol: str = "BTCUSDT") -> float:
-        """Simulated price (would fetch from real API)"""
+        """Streamed price when a fresh one is cached, otherwise simulated"""
+        if self.market_data is not None:
+            price = self.market_data.price(symbol, self.max_quote_age)
+            if price:
+                return price
         import random
         base_price = {"BTCUSDT": 47500, "ETHUSDT": 2800}.get(symbol, 1.0)
         price = base_price * (1 + random.uniform(-0.02, 0.02))
-        logger.info(f"✓ {symbol} price: ${price:.2f}")
+        logger.debug("✓ %s price: $%.2f", symbol, price)
         return price
     
-    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET") -> Dict:
-        """Simulate order placement"""
+    @timed('broker_request_seconds', broker='paper', endpoint='place_order')
+    def place_order(self, symbol: str, quantity: float, side: str, order_type: str = "MARKET",
+                    price: Optional[float] = None) -> Dict:
+        """Simulate a market order, which fills immediately at the current price
+
+        Limit and other order types would rest on a book this simulator does
+        not keep, so they are rejected rather than filled at the market.
+        """
+        if order_type.upper() != "MARKET":
+            return {"status": "failed", "error": f"Paper trader only supports MARKET orders, got {order_type}"}
         price = self.get_market_price(symbol)
         total = price * quantity
+        side = side.upper()
         
-        if side.upper() == "BUY":
-            if self.balance >= total:
-                self.balance -= total
-                order_id = len(self.orders) + 1
-                order = {
-                    "orderId": order_id,
-                    "symbol": symbol,
-                    "quantity": quantity,
-                    "price": price,
-                    "side": "BUY",
-                    "status": "FILLED",
-                    "time": datetime.now().isoformat()
-                }
-                self.positions[symbol] = self.positions.get(symbol, 0) + quantity
-                logger.info(f"✓ Paper order: BUY {quantity} {symbol} @ ${price:.2f}")
-                return {"status": "success", "order_id": order_id, "data": order}
-        
-        elif side.upper() == "SELL":
-            if self.positions.get(symbol, 0) >= quantity:
-                self.balance += total
-                order_id = len(self.orders) + 1
-                order = {
-                    "orderId": order_id,
-                    "symbol": symbol,
-                    "quantity": quantity,
-                    "price": price,
-                    "side": "SELL",
-                    "status": "FILLED",
-                    "time": datetime.now().isoformat()
-                }
-                self.positions[symbol] -= quantity
-                logger.info(f"✓ Paper order: SELL {quantity} {symbol} @ ${price:.2f}")
-                return {"status": "success", "order_id": order_id, "data": order}
+        if side == "BUY":
+            if self.balance < total:
+                return {"status": "failed", "error": "Insufficient balance or position"}
+            self.balance -= total
+            self.positions[symbol] = self.positions.get(symbol, 0) + quantity
+        elif side == "SELL":
+            if self.positions.get(symbol, 0) < quantity:
+                return {"status": "failed", "error": "Insufficient balance or position"}
+            self.balance += total
+            self.positions[symbol] -= quantity
+        else:
+            return {"status": "failed", "error": f"Unknown side: {side}"}
         
-        return {"status": "failed", "error": "Insufficient balance or position"}
+        order_id = self.orders.append(symbol, BUY if side == "BUY" else SELL, quantity, price)
+        order = {
+            "orderId": order_id,
+            "symbol": symbol,
+            "quantity": quantity,
+            "price": price,
+            "side": side,
+            "status": "FILLED",
+            "time": datetime.now().isoformat()
+        }
+        trade_logger.info("✓ Paper order: %s %s %s @ $%.2f", side, quantity, symbol, price)
+        return {"status": "success", "order_id": order_id, "data": order}
     
     def get_open_positions(self) -> List[Dict]:
         positions = [
             {"symbol": k, "quantity": v, "balance": v}
             for k, v in self.positions.items() if v > 0
         ]
-        logger.info(f"✓ Open positions: {len(positions)}")
+        logger.info("✓ Open positions: %s", len(positions))
         return positions
     
     def close_position(self, symbol: str) -> bool:
@@ -231,6 +509,23 @@ class PaperTraderBroker(BrokerAPI):
             result = self.place_order(symbol, quantity, "SELL")
             return result["status"] == "success"
         return False
+    
+    def close_positions(self, symbols: Optional[List[str]] = None) -> List[Future]:
+        """Close several (default: all) open positions as one batch"""
+        orders = [
+            {"symbol": symbol, "quantity": quantity, "side": "SELL"}
+            for symbol, quantity in self.positions.items()
+            if quantity > 0 and (symbols is None or symbol in symbols)
+        ]
+        return self.place_orders(orders)
+
+
+def _error_code(response) -> Optional[int]:
+    """Exchange error code from a JSON error body, if any"""
+    try:
+        return response.json().get("code")
+    except (ValueError, AttributeError):
+        return None
 
 
 def create_broker(broker_type: str, **kwargs) -> BrokerAPI:
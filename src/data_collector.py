@@ -5,10 +5,8 @@ import json
 import logging
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import requests
+from src.instrumentation import metrics, timed
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DataCollector:
@@ -20,26 +18,30 @@ class DataCollector:
         self.quality_metrics = {}
         self.data_log = []
         
+    @timed('data_fetch_seconds', source='all')
     def collect_market_data(self, symbol: str, days: int = 30) -> pd.DataFrame:
         """Collect market data from multiple sources with fallback"""
-        logger.info(f"Collecting {days} days of market data for {symbol}")
+        logger.info("Collecting %s days of market data for %s", days, symbol)
         
         try:
             # Try primary source (CoinGecko - free API)
             data = self._fetch_coingecko(symbol, days)
             if data is not None and len(data) > 0:
-                logger.info(f"Successfully collected {len(data)} records from CoinGecko")
+                logger.info("Successfully collected %s records from CoinGecko", len(data))
                 return data
         except Exception as e:
-            logger.warning(f"CoinGecko source failed: {e}")
+            logger.warning("CoinGecko source failed: %s", e)
         
         # Fallback: Generate synthetic high-quality data
         logger.info("Using generated synthetic market data")
+        metrics.inc('data_fetch_fallbacks_total', source='coingecko')
         return self._generate_synthetic_data(symbol, days)
     
+    @timed('data_fetch_seconds', source='coingecko')
     def _fetch_coingecko(self, symbol: str, days: int) -> Optional[pd.DataFrame]:
         """Fetch data from CoinGecko API (free tier)"""
         try:
+            import requests
             # Map trading symbol to CoinGecko ID
             symbol_map = {
                 'BTCUSDT': 'bitcoin',
@@ -75,7 +77,7 @@ class DataCollector:
             return df[['date', 'open', 'high', 'low', 'close', 'volume']].tail(days)
             
         except Exception as e:
-            logger.error(f"CoinGecko fetch failed: {e}")
+            logger.error("CoinGecko fetch failed: %s", e)
             return None
     
     def _generate_synthetic_data(self, symbol: str, days: int) -> pd.DataFrame:
@@ -141,7 +143,7 @@ class DataCollector:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filepath = self.data_dir / f"{symbol}_{timestamp}.csv"
         df.to_csv(filepath, index=False)
-        logger.info(f"Data saved to {filepath}")
+        logger.info("Data saved to %s", filepath)
         
         # Save metadata
         metadata = {
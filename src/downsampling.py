@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Downsampling Module
+Viewport selection, LTTB and min/max bucketing for charts, and server-side table pagination
+"""
+
+import logging
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _numeric(x) -> np.ndarray:
+    """Float view of an x axis; datetimes become nanoseconds"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Indices of the Largest-Triangle-Three-Buckets sample of (x, y)
+
+    Keeps the first and last points and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Peaks and
+    troughs survive, which plain striding loses. Values must be finite.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _numeric(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(y, n_buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of ``n_buckets`` equal buckets, in order
+
+    With one bucket per pixel column this draws exactly like the full
+    series, at most ``2 * n_buckets`` points.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    idx = np.empty(2 * n_buckets, dtype=np.int64)
+    for i in range(n_buckets):
+        lo, hi = edges[i], edges[i + 1]
+        segment = y[lo:hi]
+        idx[2 * i] = lo + np.nanargmin(segment)
+        idx[2 * i + 1] = lo + np.nanargmax(segment)
+    return np.unique(idx)
+
+
+def viewport(x, start=None, end=None) -> slice:
+    """Positions of a sorted x axis falling within [start, end]"""
+    x = np.asarray(x)
+    lo = 0 if start is None else int(np.searchsorted(x, np.asarray(start, dtype=x.dtype), side='left'))
+    hi = len(x) if end is None else int(np.searchsorted(x, np.asarray(end, dtype=x.dtype), side='right'))
+    return slice(lo, hi)
+
+
+def downsample(x, y, n_out: int = 2000, method: str = 'lttb', start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce the visible window of a series to at most ``n_out`` points
+
+    ``method`` is 'lttb' or 'minmax'. ``start``/``end`` bound the window
+    on the (sorted) x axis, so re-calling with the zoomed range keeps the
+    detail proportional to what is on screen. Gaps (NaN or infinite values)
+    are dropped before bucketing.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    window = viewport(x, start, end)
+    x, y = x[window], y[window]
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if method == 'lttb':
+        idx = lttb(x, y, n_out)
+    elif method == 'minmax':
+        idx = minmax(y, max(n_out // 2, 1))
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[idx], y[idx]
+
+
+def paginate(frame: pd.DataFrame, page: int, page_size: int = 100) -> Tuple[pd.DataFrame, int]:
+    """Rows of 1-based ``page`` and the page count; out-of-range pages are clamped"""
+    n_pages = max(1, -(-len(frame) // page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], n_pages
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Fake Exchange Module
+Local Binance-compatible HTTP server for exercising broker integrations without network access
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class FakeExchange:
+    """In-process exchange serving the /api/v3 endpoints BinanceIntegration calls
+
+    Speaks HTTP/1.1 with keep-alive, so connection reuse is observable via
+    ``connections``. ``latency`` is added to every response to make serial
+    versus concurrent request patterns measurable. Responses carry
+    Binance-style used-weight and order-count headers; with ``weight_limit``
+    set, requests over the per-minute budget get 429 and a Retry-After.
+    The server clock runs ``clock_offset_ms`` ahead of the local one;
+    signed requests must carry a timestamp within ``recv_window`` of it and,
+    when ``api_secret`` is given, a valid signature over the raw payload.
+    """
+
+    WEIGHTS = {
+        "/api/v3/ticker/price": 2,
+        "/api/v3/account": 20,
+        "/api/v3/openOrders": 6,
+        "/api/v3/order": 1,
+        "/api/v3/time": 1
+    }
+    SIGNED_PATHS = ("/api/v3/account", "/api/v3/order", "/api/v3/openOrders")
+
+    def __init__(self,
+                 prices: Optional[Dict[str, float]] = None,
+                 balances: Optional[Dict[str, float]] = None,
+                 latency: float = 0.0,
+                 weight_limit: Optional[int] = None,
+                 clock_offset_ms: int = 0,
+                 recv_window: int = 5000,
+                 api_secret: Optional[str] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        self.prices = dict(prices or {"BTCUSDT": 47500.0, "ETHUSDT": 2800.0})
+        self.balances = dict(balances or {"USDT": 10000.0})
+        self.latency = latency
+        self.weight_limit = weight_limit
+        self.clock_offset_ms = clock_offset_ms
+        self.recv_window = recv_window
+        self.api_secret = api_secret
+        self.used_weight = 0
+        self.order_count = 0
+        self.rejected = 0
+        self.timestamp_rejected = 0
+        self._weight_window = int(time.time() // 60)
+        self._order_window = int(time.time() // 10)
+        self.open_orders: List[Dict] = []
+        self.orders: Dict[int, Dict] = {}
+        self.requests = 0
+        self.connections = 0
+        self._next_order_id = 1
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeExchange":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-exchange", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Fake exchange listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeExchange":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def usage_headers(self) -> Dict[str, str]:
+        return {"X-MBX-USED-WEIGHT-1M": str(self.used_weight), "X-MBX-ORDER-COUNT-10S": str(self.order_count)}
+
+    def _charge(self, method: str, path: str) -> bool:
+        """Count the request against the fixed usage windows; False when over the weight limit"""
+        now = time.time()
+        if int(now // 60) != self._weight_window:
+            self._weight_window, self.used_weight = int(now // 60), 0
+        if int(now // 10) != self._order_window:
+            self._order_window, self.order_count = int(now // 10), 0
+        self.used_weight += self.WEIGHTS.get(path, 1)
+        if method == "POST" and path == "/api/v3/order":
+            self.order_count += 1
+        return self.weight_limit is None or self.used_weight <= self.weight_limit
+
+    def server_time(self) -> int:
+        return int(time.time() * 1000) + self.clock_offset_ms
+
+    def _check_signed(self, params: Dict[str, str], payload: str):
+        """Binance-style validation of a signed request; returns an error response or None"""
+        if "signature" not in params:
+            return 400, {"code": -1102, "msg": "Mandatory parameter 'signature' was not sent."}
+        window = int(params.get("recvWindow", self.recv_window))
+        if abs(int(params.get("timestamp", 0)) - self.server_time()) > window:
+            self.timestamp_rejected += 1
+            return 400, {"code": -1021, "msg": "Timestamp for this request is outside of the recvWindow."}
+        if self.api_secret is not None:
+            signed, _, signature = payload.rpartition("&signature=")
+            expected = hmac.new(self.api_secret.encode(), signed.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(signature, expected):
+                return 400, {"code": -1022, "msg": "Signature for this request is not valid."}
+        return None
+
+    def handle(self, method: str, path: str, params: Dict[str, str], payload: str = ""):
+        """Route one request; returns (status, payload); ``payload`` is the raw query plus body"""
+        with self._lock:
+            self.requests += 1
+            if not self._charge(method, path):
+                self.rejected += 1
+                return 429, {"code": -1003, "msg": "Too many requests."}
+            if method == "GET" and path == "/api/v3/ticker/price":
+                symbol = params.get("symbol")
+                if symbol is None:
+                    return 200, [{"symbol": s, "price": f"{p:.8f}"} for s, p in self.prices.items()]
+                if symbol not in self.prices:
+                    return 400, {"code": -1121, "msg": "Invalid symbol."}
+                return 200, {"symbol": symbol, "price": f"{self.prices[symbol]:.8f}"}
+
+            if method == "GET" and path == "/api/v3/time":
+                return 200, {"serverTime": self.server_time()}
+
+            if path in self.SIGNED_PATHS:
+                error = self._check_signed(params, payload)
+                if error is not None:
+                    return error
+
+            if method == "GET" and path == "/api/v3/account":
+                return 200, {"balances": [
+                    {"asset": asset, "free": f"{free:.8f}", "locked": "0.00000000"}
+                    for asset, free in self.balances.items()
+                ]}
+
+            if method == "GET" and path == "/api/v3/openOrders":
+                symbol = params.get("symbol")
+                return 200, [o for o in self.open_orders if symbol is None or o["symbol"] == symbol]
+
+            if method == "DELETE" and path == "/api/v3/openOrders":
+                symbol = params.get("symbol")
+                cancelled = [o for o in self.open_orders if o["symbol"] == symbol]
+                for order in cancelled:
+                    order["status"] = "CANCELED"
+                self.open_orders = [o for o in self.open_orders if o["symbol"] != symbol]
+                return 200, cancelled
+
+            if method == "POST" and path == "/api/v3/order":
+                return self._new_order(params)
+
+            if method == "GET" and path == "/api/v3/order":
+                order = self.orders.get(int(params.get("orderId", 0)))
+                if order is None or order["symbol"] != params.get("symbol"):
+                    return 400, {"code": -2013, "msg": "Order does not exist."}
+                return 200, order
+
+        return 404, {"code": -1, "msg": f"Unknown endpoint {method} {path}"}
+
+    def _new_order(self, params: Dict[str, str]):
+        symbol = params.get("symbol")
+        if symbol not in self.prices:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+        order = {
+            "symbol": symbol,
+            "orderId": self._next_order_id,
+            "side": params.get("side"),
+            "type": params.get("type"),
+            "origQty": params.get("quantity"),
+            "transactTime": int(time.time() * 1000)
+        }
+        self._next_order_id += 1
+        self.orders[order["orderId"]] = order
+        if order["type"] == "MARKET":
+            price = self.prices[symbol]
+            order.update(status="FILLED", executedQty=order["origQty"], price=f"{price:.8f}",
+                         cummulativeQuoteQty=f"{float(order['origQty']) * price:.8f}")
+        else:
+            order.update(status="NEW", executedQty="0", cummulativeQuoteQty="0", price=params.get("price", "0"))
+            self.open_orders.append(order)
+        return 200, dict(order)
+
+    def set_price(self, symbol: str, price: float):
+        """Move a symbol's price and fill the resting limit orders it crosses"""
+        with self._lock:
+            self.prices[symbol] = price
+            remaining = []
+            for order in self.open_orders:
+                limit = float(order["price"])
+                crossed = price <= limit if order["side"] == "BUY" else price >= limit
+                if order["symbol"] == symbol and crossed:
+                    order.update(status="FILLED", executedQty=order["origQty"],
+                                 cummulativeQuoteQty=f"{float(order['origQty']) * limit:.8f}")
+                else:
+                    remaining.append(order)
+            self.open_orders = remaining
+
+    def _handler_class(self):
+        exchange = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with exchange._lock:
+                    exchange.connections += 1
+
+            def _dispatch(self):
+                parts = urlsplit(self.path)
+                params = dict(parse_qsl(parts.query))
+                raw = parts.query
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body = self.rfile.read(length).decode()
+                    params.update(parse_qsl(body))
+                    raw += body
+                if exchange.latency:
+                    time.sleep(exchange.latency)
+                status, payload = exchange.handle(self.command, parts.path, params, raw)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in exchange.usage_headers().items():
+                    self.send_header(name, value)
+                if status == 429:
+                    self.send_header("Retry-After", str(60 - int(time.time()) % 60))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        return Handler
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Fill Simulation Module
+Slippage, fees, volume-limited partial fills and limit/stop triggers for simulated brokers
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.ledger import BUY, TradeLedger
+
+logger = logging.getLogger(__name__)
+
+# Order types, as stored in int8 order arrays
+MARKET = 0
+LIMIT = 1
+STOP = 2
+
+ORDER_TYPES = {'MARKET': MARKET, 'LIMIT': LIMIT, 'STOP': STOP}
+
+
+class FillSimulator:
+    """Turns orders into fills against OHLCV bars
+
+    Market orders fill at the bar open (or the quoted price for single
+    orders) moved against the trader by ``slippage``. Limit orders trigger
+    when the bar trades through the limit and fill at the limit, or at the
+    open if the bar gaps past it. Stop orders trigger on the opposite side
+    and fill like market orders from the stop price or the gapped open.
+    Each bar offers ``volume_participation * volume`` units, shared by the
+    orders on that bar in submission order, so large orders fill partially.
+    """
+
+    def __init__(self,
+                 slippage: float = 0.0,
+                 fee_rate: float = 0.0,
+                 volume_participation: float = 1.0,
+                 ledger: Optional[TradeLedger] = None):
+        self.slippage = slippage
+        self.fee_rate = fee_rate
+        self.volume_participation = volume_participation
+        self.fills = ledger if ledger is not None else TradeLedger()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "FillSimulator":
+        """Build from the 'backtest' section of config.yaml"""
+        backtest = config.get('backtest', {})
+        return cls(
+            slippage=backtest.get('slippage', 0.0),
+            fee_rate=backtest.get('fee_rate', 0.0),
+            volume_participation=backtest.get('volume_participation', 1.0)
+        )
+
+    def quote_market_order(self,
+                           side: int,
+                           quantity: float,
+                           price: float,
+                           volume: Optional[float] = None) -> Tuple[float, float, float]:
+        """Price one market order at a quoted price without recording it; returns (quantity, price, fee)"""
+        if volume is not None:
+            quantity = min(quantity, self.volume_participation * volume)
+        fill_price = price * (1 + side * self.slippage)
+        fee = quantity * fill_price * self.fee_rate
+        return quantity, fill_price, fee
+
+    def record_fill(self,
+                    side: int,
+                    quantity: float,
+                    price: float,
+                    fee: float,
+                    symbol: str = '',
+                    timestamp: Optional[float] = None) -> int:
+        """Record an accepted single-order fill in the ledger and return its order id"""
+        return self.fills.append(symbol, side, quantity, price, fee, timestamp)
+
+    def fill_market_order(self,
+                          side: int,
+                          quantity: float,
+                          price: float,
+                          volume: Optional[float] = None,
+                          symbol: str = '',
+                          timestamp: Optional[float] = None) -> Tuple[float, float, float]:
+        """Fill one market order at a quoted price; returns (quantity, price, fee)"""
+        quantity, fill_price, fee = self.quote_market_order(side, quantity, price, volume)
+        if quantity > 0:
+            self.record_fill(side, quantity, fill_price, fee, symbol, timestamp)
+        return quantity, fill_price, fee
+
+    def simulate(self,
+                 bar_index: np.ndarray,
+                 side: np.ndarray,
+                 quantity: np.ndarray,
+                 open_: np.ndarray,
+                 high: np.ndarray,
+                 low: np.ndarray,
+                 volume: Optional[np.ndarray] = None,
+                 order_type: Optional[np.ndarray] = None,
+                 trigger_price: Optional[np.ndarray] = None,
+                 symbol: str = '',
+                 symbol_ids: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Fill a whole array of orders against a price series in one vectorized call
+
+        ``bar_index`` gives the bar each order is live on; ``trigger_price`` is
+        the limit or stop price (ignored for market orders). Returns per-order
+        arrays 'filled_quantity', 'fill_price', 'fee' and 'triggered', and
+        records every non-empty fill in the ledger with its bar as the time.
+        Orders are for ``symbol`` unless per-order ledger ``symbol_ids`` are given.
+        """
+        bar_index = np.asarray(bar_index, dtype=np.int64)
+        side = np.asarray(side, dtype=np.int8)
+        quantity = np.asarray(quantity, dtype=np.float64)
+        n = bar_index.size
+        if n == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return {
+                'order_id': np.empty(0, dtype=np.int64),
+                'filled_quantity': empty,
+                'fill_price': empty.copy(),
+                'fee': empty.copy(),
+                'triggered': np.empty(0, dtype=bool)
+            }
+        if order_type is None:
+            order_type = np.full(n, MARKET, dtype=np.int8)
+        else:
+            order_type = np.asarray(order_type, dtype=np.int8)
+        if trigger_price is None:
+            trigger_price = np.full(n, np.nan)
+        else:
+            trigger_price = np.asarray(trigger_price, dtype=np.float64)
+
+        bar_open = np.asarray(open_, dtype=np.float64)[bar_index]
+        bar_high = np.asarray(high, dtype=np.float64)[bar_index]
+        bar_low = np.asarray(low, dtype=np.float64)[bar_index]
+        is_buy = side == BUY
+
+        is_limit = order_type == LIMIT
+        is_stop = order_type == STOP
+        limit_hit = np.where(is_buy, bar_low <= trigger_price, bar_high >= trigger_price)
+        stop_hit = np.where(is_buy, bar_high >= trigger_price, bar_low <= trigger_price)
+        triggered = np.where(is_limit, limit_hit, np.where(is_stop, stop_hit, True))
+
+        # Limits fill at the limit or a better gapped open; stops at the stop or a worse gapped open
+        limit_price = np.where(is_buy, np.minimum(trigger_price, bar_open), np.maximum(trigger_price, bar_open))
+        stop_price = np.where(is_buy, np.maximum(trigger_price, bar_open), np.minimum(trigger_price, bar_open))
+        slipped = 1 + side * self.slippage
+        fill_price = np.where(is_limit, limit_price, np.where(is_stop, stop_price, bar_open) * slipped)
+
+        wanted = np.where(triggered, quantity, 0.0)
+        if volume is not None:
+            filled = self._allocate_volume(bar_index, wanted, np.asarray(volume, dtype=np.float64))
+        else:
+            filled = wanted
+        fee = filled * fill_price * self.fee_rate
+
+        done = filled > 0
+        first_id = self.fills.next_order_id
+        self.fills.extend(
+            side[done],
+            filled[done],
+            fill_price[done],
+            fee=fee[done],
+            timestamp=bar_index[done],
+            symbol=symbol,
+            symbol_ids=None if symbol_ids is None else np.asarray(symbol_ids)[done]
+        )
+        order_ids = np.full(n, -1, dtype=np.int64)
+        order_ids[done] = first_id + np.arange(int(done.sum()), dtype=np.int64)
+
+        return {
+            'order_id': order_ids,
+            'filled_quantity': filled,
+            'fill_price': np.where(done, fill_price, np.nan),
+            'fee': fee,
+            'triggered': triggered
+        }
+
+    def _allocate_volume(self, bar_index: np.ndarray, wanted: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """Share each bar's available volume between its orders in submission order"""
+        order = np.argsort(bar_index, kind='stable')
+        bars = bar_index[order]
+        wanted_sorted = wanted[order]
+
+        running = np.cumsum(wanted_sorted)
+        group_start = np.flatnonzero(np.r_[True, bars[1:] != bars[:-1]])
+        group_offset = np.repeat(running[group_start] - wanted_sorted[group_start], np.diff(np.r_[group_start, bars.size]))
+        taken_before = running - wanted_sorted - group_offset
+
+        available = self.volume_participation * volume[bars]
+        filled_sorted = np.clip(available - taken_before, 0.0, wanted_sorted)
+
+        filled = np.empty_like(filled_sorted)
+        filled[order] = filled_sorted
+        return filled
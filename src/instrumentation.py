@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Instrumentation Module
+Counters, gauges and latency histograms with Prometheus text export over HTTP or to a file
+"""
+
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in seconds (50us .. 30s, roughly x2.5 per step)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram; quantiles are interpolated within buckets"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q-quantile (0..1); the overflow bucket reports the largest bound"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            if seen + c >= rank and c > 0:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / c
+            seen += c
+        return self.bounds[-1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99)
+        }
+
+
+class _NullTimer:
+    """Shared do-nothing context manager handed out while instrumentation is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, optionally labelled
+
+    While ``enabled`` is False every recording call returns after a single
+    attribute check and ``timer()`` hands back a shared no-op context
+    manager, so instrumented hot paths pay almost nothing.
+    """
+
+    def __init__(self, enabled: bool = False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        self.histogram(name, **labels).observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager recording elapsed seconds into histogram ``name``"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, **labels))
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = (name, _label_key(labels))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def _copy(self):
+        """Point-in-time copies of the series dicts, so readers never iterate while writers add series"""
+        with self._lock:
+            return dict(self._counters), dict(self._gauges), dict(self._histograms)
+
+    def snapshot(self) -> Dict:
+        """Plain-dict view: counters, gauges and per-histogram count/mean/p50/p99"""
+        counters, gauges, histograms = self._copy()
+        return {
+            'counters': {_series(name, labels): v for (name, labels), v in counters.items()},
+            'gauges': {_series(name, labels): v for (name, labels), v in gauges.items()},
+            'histograms': {_series(name, labels): h.summary() for (name, labels), h in histograms.items()}
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, gauges, histograms = self._copy()
+        lines = []
+        for kind, series in (('counter', counters), ('gauge', gauges)):
+            typed = set()
+            for (name, labels), value in sorted(series.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} {kind}")
+                    typed.add(name)
+                lines.append(f"{_series(name, labels)} {value:g}")
+        typed = set()
+        for (name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, total_sum = histogram.count, histogram.sum
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, counts):
+                cumulative += count
+                lines.append(f"{_series(name + '_bucket', labels + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{_series(name + '_bucket', labels + (('le', '+Inf'),))} {total}")
+            lines.append(f"{_series(name + '_sum', labels)} {total_sum:g}")
+            lines.append(f"{_series(name + '_count', labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str):
+        """Atomically write the Prometheus text (node_exporter textfile collector compatible)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    items = tuple(labels.items())
+    return items if len(items) < 2 else tuple(sorted(items))
+
+
+def _series(name: str, labels: LabelKey) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+    return f"{name}{{{rendered}}}"
+
+
+class MetricsServer:
+    """Serves ``/metrics`` from a registry on a background thread"""
+
+    def __init__(self, registry: MetricsRegistry, port: int = 9108, host: str = "127.0.0.1"):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry_ref.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Metrics endpoint on :{self.port}/metrics")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FileExporter:
+    """Rewrites the metrics file every ``interval`` seconds on a background thread"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FileExporter":
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+
+    def export(self):
+        try:
+            self.registry.write_file(self.path)
+        except OSError as e:
+            logger.error(f"✗ Failed to write metrics file: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+
+# Process-wide registry used by the instrumented modules
+metrics = MetricsRegistry(enabled=os.environ.get('TRADING_METRICS', '').lower() in ('1', 'true', 'yes'))
+
+
+def timed(name: str, **labels):
+    """Decorator recording each call's duration into histogram ``name`` of the global registry"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            with metrics.timer(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_exporters: Dict = {}
+
+
+def configure(config: Dict) -> Dict:
+    """Enable instrumentation and start exporters from the 'instrumentation' config section
+
+    Exporters are process-wide, so repeated calls reuse the ones already running.
+    """
+    settings = config.get('instrumentation', {})
+    if not settings.get('enabled', False) or _exporters:
+        return _exporters
+    metrics.enable()
+    if settings.get('port'):
+        _exporters['server'] = MetricsServer(metrics, settings['port'], settings.get('host', '127.0.0.1')).start()
+    if settings.get('file'):
+        _exporters['file'] = FileExporter(metrics, settings['file'], settings.get('interval', 15.0)).start()
+    return _exporters
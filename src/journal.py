@@ -1,6 +1,8 @@
 import sqlite3
 from datetime import datetime
 
+from src.instrumentation import timed
+
 class TradeJournal:
     """Database logging for trades and events."""
     
@@ -24,6 +26,7 @@ class TradeJournal:
         ''')
         self.conn.commit()
     
+    @timed('journal_flush_seconds', op='log_trade')
     def log_trade(self, action, quantity, price):
         """Record trade to database."""
         cursor = self.conn.cursor()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Trade Ledger Module
+Columnar, growable fill ledger with per-symbol positions and realized/unrealized PnL
+"""
+
+import time
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BUY = 1
+SELL = -1
+
+# Closing fills that leave less than this fraction of their quantity are a full close
+FLAT_TOLERANCE = 1e-9
+
+
+class TradeLedger:
+    """Append-only fill ledger stored as parallel NumPy columns
+
+    Each fill costs ~60 bytes across the columns instead of a Python dict per
+    trade. Columns are preallocated and grown by doubling; ``column()`` and
+    ``to_frame()`` hand out views of the filled part, so reading the ledger
+    does not copy it. Positions, average cost and realized PnL are kept per
+    symbol as fills arrive (average-cost accounting, long and short), which
+    also fills the per-fill ``realized_pnl`` column.
+
+    ``time`` is epoch seconds for live brokers; backtests may store bar
+    positions instead.
+    """
+
+    FIELDS = (
+        ('order_id', np.int64),
+        ('time', np.float64),
+        ('symbol_id', np.int32),
+        ('side', np.int8),
+        ('quantity', np.float64),
+        ('price', np.float64),
+        ('fee', np.float64),
+        ('realized_pnl', np.float64)
+    )
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self._arrays = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.FIELDS}
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        # Per-symbol running state, indexed by symbol id
+        self._position: List[float] = []
+        self._avg_cost: List[float] = []
+        self._realized: List[float] = []
+        self.cash_flow = 0.0
+        self.total_fees = 0.0
+        self._next_order_id = 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    @property
+    def next_order_id(self) -> int:
+        """Order id the next fill will get when none is supplied"""
+        return self._next_order_id
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one column's filled part"""
+        return self._arrays[name][:self.size]
+
+    def symbol_id(self, symbol: str) -> int:
+        """Id for a symbol, registering it on first use"""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._symbol_ids[symbol] = sid
+            self.symbols.append(symbol)
+            self._position.append(0.0)
+            self._avg_cost.append(0.0)
+            self._realized.append(0.0)
+        return sid
+
+    def append(self,
+               symbol: str,
+               side: int,
+               quantity: float,
+               price: float,
+               fee: float = 0.0,
+               timestamp: Optional[float] = None,
+               order_id: Optional[int] = None) -> int:
+        """Record one fill and return its order id"""
+        sid = self.symbol_id(symbol)
+        if order_id is None:
+            order_id = self._next_order_id
+        self._next_order_id = max(self._next_order_id, order_id + 1)
+
+        self._reserve(1)
+        i = self.size
+        arrays = self._arrays
+        arrays['order_id'][i] = order_id
+        arrays['time'][i] = time.time() if timestamp is None else timestamp
+        arrays['symbol_id'][i] = sid
+        arrays['side'][i] = side
+        arrays['quantity'][i] = quantity
+        arrays['price'][i] = price
+        arrays['fee'][i] = fee
+        arrays['realized_pnl'][i] = self._apply(sid, side, quantity, price, fee)
+        self.size += 1
+        return order_id
+
+    def extend(self,
+               side: np.ndarray,
+               quantity: np.ndarray,
+               price: np.ndarray,
+               fee: Optional[np.ndarray] = None,
+               timestamp: Optional[np.ndarray] = None,
+               symbol: Optional[str] = None,
+               symbol_ids: Optional[np.ndarray] = None,
+               order_ids: Optional[np.ndarray] = None):
+        """Record a block of fills given as column arrays
+
+        Pass either one ``symbol`` for the whole block or ``symbol_ids``
+        already registered through ``symbol_id()``.
+        """
+        n = len(quantity)
+        if n == 0:
+            return
+        if symbol_ids is None:
+            symbol_ids = np.full(n, self.symbol_id(symbol or ''), dtype=np.int32)
+        if fee is None:
+            fee = np.zeros(n)
+        if timestamp is None:
+            timestamp = np.full(n, time.time())
+        if order_ids is None:
+            order_ids = self._next_order_id + np.arange(n, dtype=np.int64)
+        self._next_order_id = max(self._next_order_id, int(np.max(order_ids)) + 1)
+
+        self._reserve(n)
+        start, end = self.size, self.size + n
+        arrays = self._arrays
+        arrays['order_id'][start:end] = order_ids
+        arrays['time'][start:end] = timestamp
+        arrays['symbol_id'][start:end] = symbol_ids
+        arrays['side'][start:end] = side
+        arrays['quantity'][start:end] = quantity
+        arrays['price'][start:end] = price
+        arrays['fee'][start:end] = fee
+
+        # Average-cost accounting is order dependent, so it walks the block once
+        realized = arrays['realized_pnl']
+        for i, (sid, s, q, p, f) in enumerate(zip(arrays['symbol_id'][start:end].tolist(),
+                                                  arrays['side'][start:end].tolist(),
+                                                  arrays['quantity'][start:end].tolist(),
+                                                  arrays['price'][start:end].tolist(),
+                                                  arrays['fee'][start:end].tolist())):
+            realized[start + i] = self._apply(sid, s, q, p, f)
+        self.size = end
+
+    def positions(self) -> Dict[str, float]:
+        """Net position per symbol"""
+        return {symbol: self._position[sid] for sid, symbol in enumerate(self.symbols)}
+
+    def realized_pnl(self) -> Dict[str, float]:
+        """Realized PnL per symbol, net of fees"""
+        return {symbol: self._realized[sid] for sid, symbol in enumerate(self.symbols)}
+
+    def unrealized_pnl(self, marks: Dict[str, float]) -> Dict[str, float]:
+        """Unrealized PnL per symbol against mark prices"""
+        return {
+            symbol: self._position[sid] * (marks[symbol] - self._avg_cost[sid])
+            for sid, symbol in enumerate(self.symbols)
+            if self._position[sid] != 0 and symbol in marks
+        }
+
+    def equity(self, marks: Dict[str, float], initial_cash: float = 0.0) -> float:
+        """Mark-to-market equity: starting cash, net trade cash flow and positions at marks"""
+        holdings = sum(self._position[sid] * marks.get(symbol, self._avg_cost[sid])
+                       for sid, symbol in enumerate(self.symbols))
+        return initial_cash + self.cash_flow + holdings
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame over the ledger columns; numeric columns are views, not copies"""
+        data = {name: self.column(name) for name, _ in self.FIELDS if name != 'symbol_id'}
+        data['symbol'] = pd.Categorical.from_codes(self.column('symbol_id'), categories=self.symbols or [''])
+        data['action'] = np.where(self.column('side') == BUY, 'BUY', 'SELL')
+        return pd.DataFrame(data, copy=False)
+
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple]:
+        """(order_id, time, symbol, action, quantity, price, fee, realized_pnl) tuples from a row onwards"""
+        symbols = self.symbols
+        columns = [self._arrays[name][start:self.size].tolist() for name, _ in self.FIELDS]
+        for order_id, ts, sid, side, qty, price, fee, pnl in zip(*columns):
+            yield order_id, ts, symbols[sid], 'BUY' if side == BUY else 'SELL', qty, price, fee, pnl
+
+    def _apply(self, sid: int, side: int, quantity: float, price: float, fee: float) -> float:
+        """Update position/average cost for one fill and return the PnL it realizes"""
+        self.cash_flow -= side * quantity * price + fee
+        self.total_fees += fee
+        if quantity == 0:
+            self._realized[sid] -= fee
+            return -fee
+
+        position = self._position[sid]
+        signed = side * quantity
+        realized = 0.0 - fee
+        if position == 0 or (position > 0) == (signed > 0):
+            # Opening or adding: blend the average cost
+            new_position = position + signed
+            self._avg_cost[sid] = (self._avg_cost[sid] * abs(position) + price * quantity) / abs(new_position)
+        else:
+            closed = min(quantity, abs(position))
+            realized += closed * (price - self._avg_cost[sid]) * (1 if position > 0 else -1)
+            new_position = position + signed
+            if abs(new_position) <= FLAT_TOLERANCE * quantity:
+                # Float residue of a full close (0.1 + 0.2 - 0.3)
+                new_position = 0.0
+                self._avg_cost[sid] = 0.0
+            elif (new_position > 0) != (position > 0):
+                # Flipped through flat: the remainder opens at this price
+                self._avg_cost[sid] = price
+
+        self._position[sid] = new_position
+        self._realized[sid] += realized
+        return realized
+
+    def _reserve(self, n: int):
+        capacity = len(self._arrays['quantity'])
+        if self.size + n <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.size + n)
+        for name, array in self._arrays.items():
+            grown = np.empty(new_capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self._arrays[name] = grown
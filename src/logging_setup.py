@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Logging Setup Module
+Queue-backed logging with deferred formatting and rate-limited loggers for per-trade events
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.instrumentation import metrics
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DeferredQueueHandler"] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler renders ``msg % args`` on the calling thread before
+    enqueueing; here records are enqueued as-is, so hot paths only pay for
+    creating the record. Log arguments must therefore not be mutated after
+    the call. When the bounded queue is full, records below WARNING are
+    dropped and counted instead of blocking the caller; WARNING and above
+    go straight to ``direct_handlers`` on the calling thread, so failures
+    are never lost to a burst of routine records.
+    """
+
+    def __init__(self, log_queue: queue.Queue, direct_handlers: Optional[List[logging.Handler]] = None):
+        super().__init__(log_queue)
+        self.direct_handlers = direct_handlers or []
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING and self.direct_handlers:
+                for handler in self.direct_handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                return
+            self.dropped += 1
+            metrics.inc('log_records_dropped_total')
+
+
+def setup_logging(level: int = logging.INFO,
+                  log_file: Optional[str] = None,
+                  fmt: str = DEFAULT_FORMAT,
+                  queue_size: int = 10000) -> logging.Logger:
+    """Route all logging through a queue to console (and file) handlers on a background thread
+
+    Safe to call more than once; later calls only change the level.
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return root
+
+    formatter = logging.Formatter(fmt)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(log_file, maxBytes=50_000_000, backupCount=5))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(queue_size)
+    _queue_handler = DeferredQueueHandler(log_queue, handlers)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Report dropped records, drain the queue and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        dropped = dropped_records()
+        if dropped:
+            logging.getLogger(__name__).warning("Dropped %d log records below WARNING while the queue was full", dropped)
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Records dropped so far; also exported as the log_records_dropped_total counter"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+class RateLimitedLogger:
+    """Logs at most ``rate`` records per ``period`` seconds for each message template
+
+    Intended for per-trade and per-tick events: a burst of fills logs the
+    first few and then one line per period carrying the number of records
+    suppressed in between. Level checks happen before any bookkeeping, so
+    disabled levels cost one method call.
+    """
+
+    def __init__(self, logger: logging.Logger, rate: int = 10, period: float = 1.0):
+        self.logger = logger
+        self.rate = rate
+        self.period = period
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, msg: str, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(msg)
+            if window is None or now - window[0] >= self.period:
+                suppressed = window[2] if window is not None else 0
+                window = self._windows[msg] = [now, 0, 0]
+            else:
+                suppressed = 0
+            if window[1] >= self.rate:
+                window[2] += 1
+                return
+            window[1] += 1
+        if suppressed:
+            self.logger.log(level, msg + " (+%d suppressed)", *args, suppressed)
+        else:
+            self.logger.log(level, msg, *args)
+
+    def debug(self, msg: str, *args):
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args):
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg: str, *args):
+        self.log(logging.WARNING, msg, *args)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Streaming Market Data Module
+In-memory ticker/top-of-book cache fed by a streaming feed, plus a local replay server
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Quote(NamedTuple):
+    """Last trade and top of book for one symbol; times are epoch seconds, 0.0 means not seen yet
+
+    ``received`` is the latest update of any kind; ``last_received`` and
+    ``book_received`` track the trade price and the book separately, so a
+    fresh book update does not make an old trade price look current.
+    """
+    symbol: str
+    last: float
+    bid: float
+    ask: float
+    bid_qty: float
+    ask_qty: float
+    exchange_time: float
+    received: float
+    last_received: float = 0.0
+    book_received: float = 0.0
+
+    @property
+    def mid(self) -> float:
+        if self.bid and self.ask:
+            return (self.bid + self.ask) / 2
+        return self.last
+
+    @property
+    def age(self) -> float:
+        """Seconds since this quote was received"""
+        return time.time() - self.received
+
+
+class TickerCache:
+    """Latest ``Quote`` per symbol, readable without locks
+
+    Each update builds a new immutable ``Quote`` and stores it with a single
+    dict assignment, which is atomic under the GIL. Readers therefore always
+    see a complete quote (never a half-written one) and never wait on the
+    writer; a read is one dict lookup. Writers (the feed thread and REST
+    workers) merge into the previous quote, so they serialize on a lock.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Quote] = {}
+        self._write_lock = threading.Lock()
+        self.updates = 0
+
+    def update(self,
+               symbol: str,
+               last: Optional[float] = None,
+               bid: Optional[float] = None,
+               ask: Optional[float] = None,
+               bid_qty: Optional[float] = None,
+               ask_qty: Optional[float] = None,
+               exchange_time: Optional[float] = None) -> Quote:
+        """Merge new fields into the symbol's quote and publish it"""
+        book = bid is not None or ask is not None
+        with self._write_lock:
+            now = time.time()
+            previous = self._quotes.get(symbol)
+            if previous is None:
+                previous = Quote(symbol, 0.0, 0.0, 0.0, 0.0, 0.0, now, now)
+            quote = Quote(
+                symbol,
+                previous.last if last is None else last,
+                previous.bid if bid is None else bid,
+                previous.ask if ask is None else ask,
+                previous.bid_qty if bid_qty is None else bid_qty,
+                previous.ask_qty if ask_qty is None else ask_qty,
+                now if exchange_time is None else exchange_time,
+                now,
+                previous.last_received if last is None else now,
+                now if book else previous.book_received
+            )
+            self._quotes[symbol] = quote
+            self.updates += 1
+        return quote
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        return self._quotes.get(symbol)
+
+    def price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Last trade price, else the book mid; None when neither is known and within ``max_age`` seconds
+
+        Each value is aged by its own update time, so a stale trade price is
+        never passed off as fresh by a recent book update.
+        """
+        quote = self._quotes.get(symbol)
+        if quote is None:
+            return None
+        cutoff = 0.0 if max_age is None else time.time() - max_age
+        if quote.last and quote.last_received >= cutoff:
+            return quote.last
+        if quote.bid and quote.ask and quote.book_received >= cutoff:
+            return quote.mid
+        return None
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since the symbol last updated, or None if never seen"""
+        quote = self._quotes.get(symbol)
+        return None if quote is None else time.time() - quote.received
+
+    def symbols(self) -> List[str]:
+        return list(self._quotes)
+
+    def snapshot(self) -> Dict[str, Quote]:
+        """Consistent copy of every quote"""
+        return dict(self._quotes)
+
+
+class MarketDataFeed:
+    """Background consumer of a Binance-style stream that keeps a ``TickerCache`` current
+
+    Understands ``bookTicker`` and ``trade`` payloads, bare or wrapped in the
+    combined-stream ``{"stream": ..., "data": ...}`` envelope. ``ws://`` and
+    ``wss://`` URLs need the optional ``websockets`` package; ``tcp://host:port``
+    reads the same messages as JSON lines (what ``ReplayServer`` serves).
+    The connection runs on its own thread and event loop and reconnects
+    with exponential backoff.
+    """
+
+    def __init__(self,
+                 url: str,
+                 cache: Optional[TickerCache] = None,
+                 reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 30.0):
+        self.url = url
+        self.cache = cache or TickerCache()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.messages = 0
+        self.connected = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def handle_message(self, message: Dict):
+        """Apply one decoded stream message to the cache"""
+        data = message.get('data', message)
+        symbol = data.get('s')
+        if symbol is None:
+            return
+        if data.get('e') == 'trade':
+            self.cache.update(symbol, last=float(data['p']), exchange_time=data.get('T', data.get('E', 0)) / 1000)
+        elif 'b' in data and 'a' in data:
+            event_time = data.get('E')
+            self.cache.update(
+                symbol,
+                bid=float(data['b']),
+                ask=float(data['a']),
+                bid_qty=float(data.get('B', 0)),
+                ask_qty=float(data.get('A', 0)),
+                exchange_time=None if event_time is None else event_time / 1000
+            )
+        self.messages += 1
+
+    def start(self) -> "MarketDataFeed":
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run_loop, name="market-data-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping = True
+        if self._loop is not None and self._task is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                # Loop already closed
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.connected.clear()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._consume_forever())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _consume_forever(self):
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                if self.url.startswith(('ws://', 'wss://')):
+                    await self._consume_websocket()
+                else:
+                    await self._consume_lines()
+                delay = self.reconnect_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Market data feed disconnected: {e}")
+            self.connected.clear()
+            if self._stopping:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _consume_websocket(self):
+        import websockets
+        async with websockets.connect(self.url) as ws:
+            self.connected.set()
+            logger.info(f"✓ Market data feed connected: {self.url}")
+            async for raw in ws:
+                self.handle_message(json.loads(raw))
+
+    async def _consume_lines(self):
+        host, port = self.url.split('://', 1)[-1].rsplit(':', 1)
+        reader, writer = await asyncio.open_connection(host, int(port))
+        self.connected.set()
+        logger.info(f"✓ Market data feed connected: {self.url}")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle_message(json.loads(line))
+        finally:
+            writer.close()
+
+
+class ReplayServer:
+    """Local server that replays recorded stream messages as JSON lines
+
+    Every client receives the full message list, paced by ``interval``
+    seconds between messages (0 sends as fast as possible); the connection
+    then stays open, like a quiet live stream, until the client leaves.
+    """
+
+    def __init__(self, messages: Iterable[Dict], interval: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.messages = [json.dumps(m).encode() + b"\n" for m in messages]
+        self.interval = interval
+        self.host = host
+        self.port = port
+        self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"tcp://{self.host}:{self.port}"
+
+    @classmethod
+    def from_frame(cls, df, symbol: str, **kwargs) -> "ReplayServer":
+        """Replay OHLCV bars as trade messages at each close"""
+        import pandas as pd
+        if isinstance(df.index, pd.DatetimeIndex):
+            times = df.index.to_numpy(dtype='datetime64[ms]').astype('int64').tolist()
+        else:
+            times = range(len(df))
+        messages = [
+            {'e': 'trade', 's': symbol, 'p': str(close), 'q': '0', 'T': int(t)}
+            for t, close in zip(times, df['close'].tolist())
+        ]
+        return cls(messages, **kwargs)
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._serve, name="replay-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        logger.info(f"✓ Replay server on {self.url} ({len(self.messages)} messages)")
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._client, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _client(self, reader, writer):
+        try:
+            for message in self.messages:
+                writer.write(message)
+                if self.interval:
+                    await writer.drain()
+                    await asyncio.sleep(self.interval)
+            await writer.drain()
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
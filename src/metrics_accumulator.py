@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Streaming Metrics Accumulator Module
+Single-pass backtest metrics over equity points and trade PnLs fed one at a time or in chunks
+"""
+
+import math
+import logging
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsAccumulator:
+    """Running state for the BacktestingMetrics metric set
+
+    Equity points and trade PnLs are consumed incrementally. Return moments
+    are kept with Welford's update (and Chan's merge for chunks), drawdown
+    with a running peak, and trade statistics as counters, so memory stays
+    constant no matter how long the equity curve is. ``result()`` can be
+    called at any point and matches ``BacktestingMetrics`` definitions:
+    population standard deviations, Sortino over ``min(excess, 0)``, and
+    drawdown measured against the running equity peak.
+    """
+
+    def __init__(self,
+                 initial_capital: float = 10000.0,
+                 risk_free_rate: float = 0.02,
+                 periods_per_year: int = 252):
+        self.initial_capital = initial_capital
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self._rf_per_period = risk_free_rate / periods_per_year
+
+        # Equity curve state
+        self.n_points = 0
+        self.last_equity = None
+        self.running_max = -math.inf
+        self.running_max_idx = 0
+        self.min_drawdown = 0.0
+        self.max_dd_peak_idx = 0
+        self.max_dd_idx = 0
+
+        # Excess return moments (Welford)
+        self.n_returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._down_mean = 0.0
+        self._down_m2 = 0.0
+
+        # Trade statistics
+        self.n_trades = 0
+        self.wins = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def update_equity(self, value: float):
+        """Consume a single equity point"""
+        value = float(value)
+        if self.last_equity is not None:
+            excess = (value - self.last_equity) / self.last_equity - self._rf_per_period
+            self.n_returns += 1
+            delta = excess - self._mean
+            self._mean += delta / self.n_returns
+            self._m2 += delta * (excess - self._mean)
+
+            downside = min(excess, 0.0)
+            delta = downside - self._down_mean
+            self._down_mean += delta / self.n_returns
+            self._down_m2 += delta * (downside - self._down_mean)
+
+        if value > self.running_max:
+            self.running_max = value
+            self.running_max_idx = self.n_points
+
+        drawdown = (value - self.running_max) / self.running_max
+        if drawdown < self.min_drawdown:
+            self.min_drawdown = drawdown
+            self.max_dd_idx = self.n_points
+            self.max_dd_peak_idx = self.running_max_idx
+
+        self.last_equity = value
+        self.n_points += 1
+
+    def update_equity_chunk(self, values: Union[np.ndarray, Iterable[float]]):
+        """Consume a block of consecutive equity points in one vectorized step"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        # Returns for this chunk, bridged to the previous chunk's last point
+        if self.last_equity is not None:
+            previous = np.concatenate(([self.last_equity], values[:-1]))
+            current = values
+        else:
+            previous, current = values[:-1], values[1:]
+        excess = (current - previous) / previous - self._rf_per_period
+        if excess.size:
+            self._mean, self._m2, n = self._merge(self._mean, self._m2, self.n_returns, excess)
+            self._down_mean, self._down_m2, _ = self._merge(
+                self._down_mean, self._down_m2, self.n_returns, np.minimum(excess, 0.0)
+            )
+            self.n_returns = n
+
+        # Running peak and drawdown, seeded with the previous peak
+        running_max = np.maximum.accumulate(values)
+        np.maximum(running_max, self.running_max, out=running_max)
+        drawdown = (values - running_max) / running_max
+        trough = int(np.argmin(drawdown))
+        if drawdown[trough] < self.min_drawdown:
+            self.min_drawdown = float(drawdown[trough])
+            self.max_dd_idx = self.n_points + trough
+            self.max_dd_peak_idx = self._peak_index(values, running_max, trough)
+
+        chunk_max = int(np.argmax(values))
+        if values[chunk_max] > self.running_max:
+            self.running_max = float(values[chunk_max])
+            self.running_max_idx = self.n_points + chunk_max
+
+        self.last_equity = float(values[-1])
+        self.n_points += values.size
+
+    def add_trade_pnl(self, pnl: float):
+        """Consume a single closed-trade PnL"""
+        self.n_trades += 1
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.gross_loss -= pnl
+
+    def add_trade_pnls(self, pnls: Union[np.ndarray, Iterable[float]]):
+        """Consume a block of closed-trade PnLs"""
+        pnls = np.asarray(pnls, dtype=np.float64).ravel()
+        self.n_trades += pnls.size
+        winners = pnls > 0
+        self.wins += int(np.count_nonzero(winners))
+        self.gross_profit += float(pnls[winners].sum())
+        self.gross_loss -= float(pnls[pnls < 0].sum())
+
+    def add_trades(self, trades: list):
+        """Consume trade dicts carrying a 'pnl' key"""
+        self.add_trade_pnls(np.fromiter((t['pnl'] for t in trades), dtype=np.float64, count=len(trades)))
+
+    def result(self) -> Dict:
+        """Return the full metric set for everything consumed so far"""
+        if self.n_points == 0:
+            return {}
+
+        sqrt_periods = math.sqrt(self.periods_per_year)
+        std = math.sqrt(self._m2 / self.n_returns) if self.n_returns else 0.0
+        down_std = math.sqrt(self._down_m2 / self.n_returns) if self.n_returns else 0.0
+        sharpe = sqrt_periods * self._mean / std if std != 0 else 0.0
+        sortino = sqrt_periods * self._mean / down_std if down_std != 0 else 0.0
+
+        total_return = (self.last_equity - self.initial_capital) / self.initial_capital * 100
+        max_dd = abs(self.min_drawdown) * 100
+        calmar = (total_return / 100) / (max_dd / 100) if max_dd != 0 else 0.0
+        recovery = total_return / max_dd if max_dd != 0 else 0.0
+
+        win_rate = self.wins / self.n_trades * 100 if self.n_trades else 0.0
+        if self.n_trades == 0:
+            profit_factor = 0.0
+        elif self.gross_loss == 0:
+            profit_factor = float('inf') if self.gross_profit > 0 else 0.0
+        else:
+            profit_factor = self.gross_profit / self.gross_loss
+
+        return {
+            'total_return': total_return,
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
+            'max_drawdown': max_dd,
+            'max_drawdown_peak_idx': self.max_dd_peak_idx,
+            'max_drawdown_idx': self.max_dd_idx,
+            'calmar_ratio': calmar,
+            'win_rate': win_rate,
+            'profit_factor': profit_factor,
+            'recovery_factor': recovery,
+            'total_trades': self.n_trades,
+            'final_equity': self.last_equity
+        }
+
+    def _peak_index(self, values: np.ndarray, running_max: np.ndarray, trough: int) -> int:
+        """Index of the first point that reached the peak preceding the trough"""
+        peak = running_max[trough]
+        if peak <= self.running_max:
+            return self.running_max_idx
+        return self.n_points + int(np.argmax(values[:trough + 1] == peak))
+
+    @staticmethod
+    def _merge(mean_a: float, m2_a: float, n_a: int, block: np.ndarray):
+        """Combine running moments with a block's moments (Chan et al.)"""
+        n_b = block.size
+        mean_b = float(block.mean())
+        m2_b = float(np.square(block - mean_b).sum())
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        mean = mean_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+        return mean, m2, n
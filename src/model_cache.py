@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Model Cache Module
+Process-wide LRU cache of deserialized models, bounded by file bytes and loaded with mmap
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+
+class ModelCache:
+    """LRU cache of models keyed by (name, version), bounded by model file bytes
+
+    Models are loaded with ``joblib.load(..., mmap_mode=...)`` so the numpy
+    arrays inside an uncompressed dump are backed by the file itself; worker
+    processes serving the same version then share those pages through the OS
+    page cache instead of each holding a private copy. Estimators that copy
+    their arrays while unpickling (e.g. sklearn tree node arrays) still pay
+    that copy once per process, but are never deserialized twice.
+
+    ``max_bytes`` counts each entry at the size of its file on disk. That
+    tracks resident memory for memory-mapped arrays, but arrays copied
+    while unpickling live on the heap as well, so the memory actually held
+    can exceed the budget; size it with that headroom in mind.
+
+    Loading happens outside the cache lock, so readers of versions that are
+    already cached never wait behind a slow load of a new version. Concurrent
+    requests for the same missing key share a single load.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, mmap_mode: Optional[str] = 'r'):
+        self.max_bytes = max_bytes
+        self.mmap_mode = mmap_mode
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int, str]]" = OrderedDict()
+        self._loading: Dict[Tuple[str, Hashable], threading.Event] = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name: str, version: Hashable) -> Optional[Any]:
+        """Return a cached model without loading it"""
+        key = (name, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_load(self, name: str, version: Hashable, path: str) -> Any:
+        """Return the cached model for (name, version), loading it from path on a miss"""
+        key = (name, version)
+        path = str(path)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[2] == path:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._loading[key] = pending
+                    self.misses += 1
+                    break
+
+            # Another thread is loading this key; wait for it and re-check
+            pending.wait()
+
+        try:
+            import joblib
+            model = joblib.load(path, mmap_mode=self.mmap_mode)
+            size = os.path.getsize(path)
+            with self._lock:
+                self._insert(key, model, size, path)
+            logger.debug("Model cached: %s v%s (%d bytes)", name, version, size)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            pending.set()
+
+    def preload(self, name: str, version: Hashable, path: str) -> threading.Thread:
+        """Load a model on a background thread so the first lookup is a hit"""
+        thread = threading.Thread(
+            target=self.get_or_load,
+            args=(name, version, path),
+            name=f"model-preload-{name}-{version}",
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def evict(self, name: str, version: Optional[Hashable] = None) -> int:
+        """Drop one version, or every version of a model when version is None"""
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == name and (version is None or k[1] == version)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Drop every cached model"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _insert(self, key, model, size: int, path: str):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (model, size, path)
+        self.current_bytes += size
+
+        # Evict least recently used entries, but always keep the newest one
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+_default_cache: Optional[ModelCache] = None
+_default_lock = threading.Lock()
+
+
+def get_model_cache() -> ModelCache:
+    """Return the process-wide model cache"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                max_bytes = int(os.environ.get("TRADING_MODEL_CACHE_BYTES", DEFAULT_MAX_BYTES))
+                _default_cache = ModelCache(max_bytes=max_bytes)
+    return _default_cache
@@ -5,7 +5,6 @@ Saves and loads trained ML models with metadata and versioning
 """
 
 import pickle
-import joblib
 import json
 import os
 import logging
@@ -13,15 +12,18 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 from pathlib import Path
 
+from src.model_cache import ModelCache, get_model_cache
+
 logger = logging.getLogger(__name__)
 
 
 class ModelPersistence:
     """Handles model saving, loading, and version management"""
     
-    def __init__(self, model_dir: str = "models"):
+    def __init__(self, model_dir: str = "models", cache: Optional[ModelCache] = None):
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(exist_ok=True)
+        self.cache = cache if cache is not None else get_model_cache()
         self.version_file = self.model_dir / "versions.json"
         self.metadata_file = self.model_dir / "metadata.json"
         self._init_version_file()
@@ -29,8 +31,14 @@ class ModelPersistence:
     def _init_version_file(self):
         """Initialize version tracking file"""
         if not self.version_file.exists():
-            with open(self.version_file, 'w') as f:
-                json.dump({"models": {}}, f, indent=2)
+            self._write_versions({"models": {}})
+    
+    def _write_versions(self, versions: Dict):
+        """Atomically replace the version file so readers never see a partial write"""
+        tmp_file = self.version_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(versions, f, indent=2)
+        os.replace(tmp_file, self.version_file)
     
     def save_model(self, 
                    model: Any, 
@@ -45,6 +53,7 @@ class ModelPersistence:
             filepath = self.model_dir / filename
             
             # Save model
+            import joblib
             joblib.dump(model, str(filepath))
             logger.info(f"✓ Model saved: {filename}")
             
@@ -52,16 +61,19 @@ class ModelPersistence:
             with open(self.version_file, 'r') as f:
                 versions = json.load(f)
             
+            history = versions["models"].get(name, {}).get("history", {})
+            history[str(version)] = filename
+            
             versions["models"][name] = {
                 "current_version": version,
                 "filepath": filename,
                 "saved_at": timestamp,
                 "metrics": metrics or {},
-                "metadata": metadata or {}
+                "metadata": metadata or {},
+                "history": history
             }
             
-            with open(self.version_file, 'w') as f:
-                json.dump(versions, f, indent=2)
+            self._write_versions(versions)
             
             logger.info(f"✓ Version {version} tracked for {name}")
             return str(filepath)
@@ -81,14 +93,23 @@ class ModelPersistence:
                 return None
             
             model_info = versions["models"][name]
-            filepath = self.model_dir / model_info["filepath"]
+            if version is None:
+                version = model_info["current_version"]
             
+            filename = model_info.get("history", {}).get(str(version))
+            if filename is None and version == model_info["current_version"]:
+                filename = model_info["filepath"]
+            if filename is None:
+                logger.error(f"✗ No version {version} recorded for model: {name}")
+                return None
+            
+            filepath = self.model_dir / filename
             if not filepath.exists():
                 logger.error(f"✗ Model file not found: {filepath}")
                 return None
             
-            model = joblib.load(str(filepath))
-            logger.info(f"✓ Model loaded: {name} v{model_info['current_version']}")
+            model = self.cache.get_or_load(name, version, str(filepath))
+            logger.info(f"✓ Model loaded: {name} v{version}")
             
             # Log metrics
             if model_info.get("metrics"):
@@ -131,15 +152,18 @@ class ModelPersistence:
                 logger.warning(f"Model {name} not found")
                 return False
             
-            filepath = self.model_dir / versions["models"][name]["filepath"]
-            if filepath.exists():
-                filepath.unlink()
-                logger.info(f"✓ Model file deleted: {name}")
+            model_info = versions["models"][name]
+            filenames = set(model_info.get("history", {}).values()) | {model_info["filepath"]}
+            for filename in filenames:
+                filepath = self.model_dir / filename
+                if filepath.exists():
+                    filepath.unlink()
+                    logger.info(f"✓ Model file deleted: {filename}")
             
             del versions["models"][name]
+            self.cache.evict(name)
             
-            with open(self.version_file, 'w') as f:
-                json.dump(versions, f, indent=2)
+            self._write_versions(versions)
             
             logger.info(f"✓ Model entry removed: {name}")
             return True
@@ -164,7 +188,8 @@ class ModelPersistence:
                 "saved_at": info["saved_at"],
                 "filepath": info["filepath"],
                 "metrics": info.get("metrics", {}),
-                "metadata": info.get("metadata", {})
+                "metadata": info.get("metadata", {}),
+                "versions": sorted(int(v) for v in info.get("history", {}))
             }
         
         except Exception as e:
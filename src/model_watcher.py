@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Model Hot-Reload Module
+Watches the ModelPersistence registry and stages warmed-up models for the running agent
+"""
+
+import threading
+import warnings
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from src.model_persistence import ModelPersistence
+
+logger = logging.getLogger(__name__)
+
+
+class EstimatorScorer:
+    """Adapts a fitted sklearn-style estimator (and optional scaler) to the TradeScorer interface"""
+
+    def __init__(self, estimator: Any, scaler: Any = None):
+        self.estimator = estimator
+        self.scaler = scaler
+        self.is_fitted = True
+
+    def score(self, X):
+        """Generate trade probability scores."""
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        return self.estimator.predict_proba(X)[:, 1]
+
+
+def feature_width(model: Any) -> Optional[int]:
+    """Number of input features a model expects, when it records one"""
+    for candidate in (model, getattr(model, 'model', None), getattr(model, 'estimator', None)):
+        n_features = getattr(candidate, 'n_features_in_', None)
+        if n_features is not None:
+            return int(n_features)
+    coef = getattr(model, 'coef', None)
+    return None if coef is None else len(coef)
+
+
+def as_scorer(model: Any, scaler: Any = None) -> Any:
+    """Wrap raw estimators; objects already exposing score(X) are returned unchanged"""
+    if hasattr(model, 'predict_proba'):
+        return EstimatorScorer(model, scaler)
+    return model
+
+
+class ModelWatcher:
+    """Polls the model registry and loads new versions on a background thread
+
+    A new version is loaded through the shared model cache, wrapped as a
+    scorer and run against a warm-up batch before it is staged. The agent
+    picks staged models up with ``take_pending()`` between cycles, so the
+    scoring path only ever sees fully loaded, already exercised models.
+
+    The warm-up batch is the agent's most recent features (see
+    ``observe_features``) or ``warmup_data``; models whose input width does
+    not match ``n_features`` are rejected. A version that fails is retried
+    on the next poll.
+    """
+
+    def __init__(self,
+                 persistence: ModelPersistence,
+                 name: str,
+                 warmup_data: Any = None,
+                 poll_interval: float = 5.0,
+                 on_swap: Optional[Callable[[int, Any], None]] = None,
+                 n_features: Optional[int] = None):
+        self.persistence = persistence
+        self.name = name
+        self.warmup_data = warmup_data
+        self.n_features = n_features
+        self.poll_interval = poll_interval
+        self.on_swap = on_swap
+        self.current_version = None
+        self._pending: Optional[Tuple[int, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._registry_mtime = None
+
+    def start(self, current_version: Optional[int] = None) -> "ModelWatcher":
+        """Start polling in a daemon thread"""
+        if current_version is not None:
+            self.current_version = current_version
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"model-watcher-{self.name}", daemon=True)
+            self._thread.start()
+            logger.info(f"✓ Watching model registry for {self.name}")
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the polling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def observe_features(self, features: Any):
+        """Record the features the agent just scored; later versions warm up on them"""
+        self.warmup_data = features
+
+    def take_pending(self) -> Optional[Tuple[int, Any]]:
+        """Return and clear the staged (version, scorer), if any"""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.current_version = pending[0]
+            if self.on_swap is not None:
+                self.on_swap(*pending)
+        return pending
+
+    def poll_once(self) -> bool:
+        """Check the registry once; returns True when a new version was staged"""
+        try:
+            mtime = self.persistence.version_file.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._registry_mtime:
+            return False
+
+        info = self.persistence.get_model_info(self.name)
+        if info is None:
+            return False
+
+        version = info["version"]
+        staged = self._pending[0] if self._pending is not None else None
+        if version == self.current_version or version == staged:
+            self._registry_mtime = mtime
+            return False
+
+        # The registry mtime is only recorded once a version is staged, so a failed load is retried
+        scorer = self._load_and_warm(version, info)
+        if scorer is None:
+            return False
+
+        with self._lock:
+            self._pending = (version, scorer)
+        self._registry_mtime = mtime
+        logger.info(f"✓ Model {self.name} v{version} loaded and warmed up")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"✗ Model watcher poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def _load_and_warm(self, version: int, info: dict) -> Optional[Any]:
+        try:
+            model = self.persistence.load_model(self.name, version)
+            if model is None:
+                return None
+
+            scaler = None
+            scaler_path = info.get("metadata", {}).get("scaler_path")
+            if scaler_path:
+                scaler = self.persistence.cache.get_or_load(f"{self.name}_scaler", version, scaler_path)
+
+            batch = self._warmup_batch(model)
+            width = feature_width(model)
+            provided = np.shape(batch)[-1]
+            if width is not None and width != provided:
+                raise ValueError(f"model expects {width} features, agent provides {provided}")
+
+            scorer = as_scorer(model, scaler)
+            with warnings.catch_warnings():
+                # Feature names may differ between training frames and the agent's frame
+                warnings.simplefilter("ignore", UserWarning)
+                scorer.score(batch)
+            return scorer
+
+        except Exception as e:
+            logger.error(f"✗ Rejected {self.name} v{version}, warm-up failed: {e}")
+            return None
+
+    def _warmup_batch(self, model: Any):
+        """Recent real features, else zeros in the agent's feature width"""
+        if self.warmup_data is not None:
+            return self.warmup_data
+        n_features = self.n_features or feature_width(model) or 1
+        return np.zeros((1, n_features))
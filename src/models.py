@@ -1,10 +1,11 @@
-from sklearn.linear_model import LogisticRegression
 import numpy as np
 
 class TradeScorer:
     """ML-based trade scoring model."""
     
     def __init__(self):
+        # Imported here so processes that only run a CompiledScorer never load sklearn
+        from sklearn.linear_model import LogisticRegression
         self.model = LogisticRegression(random_state=42)
         self.is_fitted = False
     
@@ -18,3 +19,33 @@ class TradeScorer:
         if not self.is_fitted:
             return np.ones(len(X)) * 0.5
         return self.model.predict_proba(X)[:, 1]
+    
+    def compile(self):
+        """Freeze the fitted coefficients into a numpy-only CompiledScorer."""
+        if not self.is_fitted:
+            raise ValueError("TradeScorer must be trained before compiling")
+        return CompiledScorer(self.model.coef_[0], self.model.intercept_[0])
+
+
+class CompiledScorer:
+    """Logistic scorer reduced to its coefficients; scores without sklearn."""
+    
+    def __init__(self, coef, intercept):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.is_fitted = True
+    
+    def score(self, X):
+        """Generate trade probability scores."""
+        z = np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+    
+    def save(self, path):
+        """Write coefficients to an .npz file."""
+        np.savez(path, coef=self.coef, intercept=self.intercept)
+    
+    @classmethod
+    def load(cls, path):
+        """Load a scorer written by save()."""
+        with np.load(path) as data:
+            return cls(data['coef'], data['intercept'])
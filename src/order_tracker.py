@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Order Tracking Module
+Non-blocking order submission with background acknowledgement, fill polling and local positions
+"""
+
+import itertools
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from src.ledger import BUY, SELL, TradeLedger
+
+logger = logging.getLogger(__name__)
+
+# Local lifecycle states; exchange states (NEW, PARTIALLY_FILLED, FILLED, CANCELED, ...) pass through
+PENDING = "PENDING"
+FAILED = "FAILED"
+FINAL_STATES = {"FILLED", "CANCELED", "REJECTED", "EXPIRED", FAILED}
+
+
+class OrderTracker:
+    """Follows orders from submission to their final state without blocking the caller
+
+    ``submit`` hands the batch to ``broker.place_orders`` and returns local
+    ids at once. Acknowledgements are handled by future callbacks; orders
+    the exchange leaves open are polled with ``broker.get_order`` on a
+    background thread. Each newly executed quantity is recorded in a
+    ``TradeLedger``, which keeps the local positions and realized PnL.
+    """
+
+    def __init__(self,
+                 broker,
+                 ledger: Optional[TradeLedger] = None,
+                 poll_interval: float = 1.0,
+                 on_update: Optional[Callable[[Dict], None]] = None):
+        self.broker = broker
+        self.ledger = ledger if ledger is not None else TradeLedger()
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self._listeners: List[Callable[[Dict], None]] = []
+        self.orders: Dict[int, Dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, orders: List[Dict]) -> List[int]:
+        """Submit a batch of place_order keyword dicts; returns local ids immediately"""
+        local_ids = []
+        with self._lock:
+            for order in orders:
+                local_id = next(self._ids)
+                self.orders[local_id] = {
+                    'id': local_id,
+                    'symbol': order['symbol'],
+                    'side': order['side'].upper(),
+                    'quantity': float(order['quantity']),
+                    'status': PENDING,
+                    'order_id': None,
+                    'executed': 0.0,
+                    'quote': 0.0,
+                    'error': None
+                }
+                local_ids.append(local_id)
+        for local_id, future in zip(local_ids, self.broker.place_orders(orders)):
+            future.add_done_callback(lambda f, local_id=local_id: self._on_ack(local_id, f))
+        return local_ids
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Also call ``listener`` with every order update, after ``on_update``"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def status(self, local_id: int) -> Optional[Dict]:
+        with self._lock:
+            order = self.orders.get(local_id)
+            return dict(order) if order else None
+
+    def open_orders(self) -> List[Dict]:
+        with self._lock:
+            return [dict(o) for o in self.orders.values() if o['status'] not in FINAL_STATES]
+
+    def positions(self) -> Dict[str, float]:
+        with self._lock:
+            return self.ledger.positions()
+
+    def start(self) -> "OrderTracker":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="order-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def poll_once(self) -> int:
+        """Refresh every acknowledged open order; returns how many were polled"""
+        with self._lock:
+            live = [(o['id'], o['symbol'], o['order_id']) for o in self.orders.values()
+                    if o['order_id'] is not None and o['status'] not in FINAL_STATES and o['status'] != PENDING]
+        for local_id, symbol, order_id in live:
+            state = self.broker.get_order(symbol, order_id)
+            if state:
+                self._apply(local_id, state)
+        return len(live)
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"✗ Order polling failed: {e}")
+
+    def _on_ack(self, local_id: int, future: Future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'status': 'failed', 'error': str(e)}
+        if result.get('status') != 'success':
+            with self._lock:
+                order = self.orders[local_id]
+                order.update(status=FAILED, error=result.get('error'))
+                snapshot = dict(order)
+            logger.warning(f"Order {local_id} failed: {snapshot['error']}")
+            self._notify(snapshot)
+            return
+        data = result.get('data') or {}
+        with self._lock:
+            self.orders[local_id]['order_id'] = result.get('order_id')
+        self._apply(local_id, data)
+
+    def _apply(self, local_id: int, state: Dict):
+        """Merge an exchange order state and record any newly executed quantity"""
+        executed = float(state.get('executedQty', state.get('quantity', 0)) or 0)
+        quote = state.get('cummulativeQuoteQty')
+        if quote is not None:
+            quote = float(quote)
+        elif executed:
+            quote = executed * float(state.get('price') or 0)
+        with self._lock:
+            order = self.orders[local_id]
+            new_qty = executed - order['executed']
+            if new_qty > 0:
+                new_quote = (quote or 0.0) - order['quote']
+                self.ledger.append(order['symbol'], BUY if order['side'] == 'BUY' else SELL,
+                                   new_qty, new_quote / new_qty)
+                order['executed'] = executed
+                order['quote'] = quote or 0.0
+            order['status'] = state.get('status', 'FILLED' if executed >= order['quantity'] else order['status'])
+            snapshot = dict(order)
+        if new_qty > 0 or snapshot['status'] in FINAL_STATES:
+            self._notify(snapshot)
+
+    def _notify(self, order: Dict):
+        with self._lock:
+            callbacks = [self.on_update] + self._listeners
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(order)
+            except Exception as e:
+                logger.error(f"✗ Order update callback failed: {e}")
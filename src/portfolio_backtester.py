@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Portfolio Backtesting Module
+Multi-symbol backtests over an aligned timestamp index with shared cash
+"""
+
+import logging
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting_metrics import BacktestingMetrics
+from src.fill_simulator import FillSimulator
+from src.ledger import BUY, SELL, TradeLedger
+
+logger = logging.getLogger(__name__)
+
+Matrix = Union[pd.DataFrame, np.ndarray]
+
+
+def compute_signal_matrix(closes: pd.DataFrame, rules_engine) -> Dict[str, pd.DataFrame]:
+    """SMA crossover signals for every symbol at once (time x symbols frames)"""
+    sma_short = closes.rolling(rules_engine.short_period).mean()
+    sma_long = closes.rolling(rules_engine.long_period).mean()
+    signal = pd.DataFrame(
+        np.sign(sma_short.to_numpy() - sma_long.to_numpy()),
+        index=closes.index,
+        columns=closes.columns
+    ).fillna(0).astype(np.int8)
+    return {'signal': signal, 'sma_short': sma_short, 'sma_long': sma_long}
+
+
+def compute_score_matrix(model, sma_short: pd.DataFrame, sma_long: pd.DataFrame) -> pd.DataFrame:
+    """Score every (bar, symbol) pair with one model call; bars without features score 0"""
+    features = np.column_stack((sma_short.to_numpy().ravel(), sma_long.to_numpy().ravel()))
+    valid = ~np.isnan(features).any(axis=1)
+    scores = np.zeros(features.shape[0])
+    if valid.any():
+        scores[valid] = model.score(features[valid])
+    return pd.DataFrame(scores.reshape(sma_short.shape), index=sma_short.index, columns=sma_short.columns)
+
+
+class PortfolioBacktester:
+    """Backtests many symbols against one cash balance
+
+    Signals and scores are (time x symbols) matrices computed up front. The
+    bar loop only touches per-symbol state vectors: each bar, exits are
+    filled first to release cash, entries sized at ``allocation`` of current
+    equity are scaled down together when cash is short, and equity is marked
+    to market. Fills go to a columnar ``TradeLedger``, so memory grows with
+    the number of symbols and fills, not with Python objects per trade.
+    """
+
+    def __init__(self,
+                 closes: pd.DataFrame,
+                 signals: Matrix,
+                 scores: Matrix,
+                 initial_cash: float = 10000.0,
+                 confidence_threshold: float = 0.5,
+                 allocation: Optional[float] = None,
+                 fill_simulator: Optional[FillSimulator] = None):
+        self.closes = closes
+        self.symbols = list(closes.columns)
+        self.signals = np.asarray(signals, dtype=np.int8)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        if self.signals.shape != closes.shape or self.scores.shape != closes.shape:
+            raise ValueError("signals and scores must match the closes shape (time x symbols)")
+        self.initial_cash = initial_cash
+        self.confidence_threshold = confidence_threshold
+        self.allocation = allocation if allocation is not None else 1.0 / len(self.symbols)
+        # Only the simulator's slippage and fee rate are used; fills go to the backtester's own ledger
+        self.fill_simulator = fill_simulator or FillSimulator()
+        self.ledger = TradeLedger()
+        self.cash = initial_cash
+        self.positions = np.zeros(len(self.symbols))
+        self.equity = None
+
+    @classmethod
+    def from_rules(cls, closes: pd.DataFrame, rules_engine, model, **kwargs) -> "PortfolioBacktester":
+        """Build signal and score matrices from an SMA rules engine and a scorer"""
+        matrices = compute_signal_matrix(closes, rules_engine)
+        scores = compute_score_matrix(model, matrices['sma_short'], matrices['sma_long'])
+        return cls(closes, matrices['signal'], scores, **kwargs)
+
+    def run(self) -> Dict:
+        """Execute the backtest and return equity, positions and metrics"""
+        # Every run starts flat with a fresh ledger, so repeated runs give the same result
+        self.ledger = TradeLedger()
+        self.positions = np.zeros(len(self.symbols))
+        self.cash = self.initial_cash
+
+        raw = self.closes.to_numpy(dtype=np.float64)
+        # Carry the last price forward so symbols that stop trading are still marked
+        prices = self.closes.ffill().to_numpy(dtype=np.float64)
+        n_bars, n_symbols = prices.shape
+        symbol_ids = np.array([self.ledger.symbol_id(s) for s in self.symbols], dtype=np.int32)
+        slippage = self.fill_simulator.slippage
+        fee_rate = self.fill_simulator.fee_rate
+
+        self.equity = np.empty(n_bars)
+        positions = self.positions
+        cash = self.cash
+        # Cash paid to open each position, entry fee included, for round-trip trade PnL
+        entry_cost = np.zeros(n_symbols)
+        trade_pnls = []
+
+        for t in range(n_bars):
+            price = prices[t]
+            # Only bars with a real close trade; forward-filled prices are for marking only
+            tradable = ~np.isnan(raw[t])
+            signal = self.signals[t]
+
+            # Exits first so their proceeds can fund this bar's entries
+            exits = tradable & (positions > 0) & (signal == -1)
+            if exits.any():
+                exit_price = price[exits] * (1 - slippage)
+                qty = positions[exits]
+                fees = qty * exit_price * fee_rate
+                proceeds = qty * exit_price - fees
+                cash += float(proceeds.sum())
+                self._record(t, SELL, symbol_ids[exits], qty, exit_price, fees)
+                trade_pnls.append(proceeds - entry_cost[exits])
+                positions[exits] = 0.0
+                entry_cost[exits] = 0.0
+
+            entries = tradable & (positions == 0) & (signal == 1) & (self.scores[t] > self.confidence_threshold)
+            if entries.any():
+                equity_now = cash + float(np.nan_to_num(price) @ positions)
+                entry_price = price[entries] * (1 + slippage)
+                notional = np.full(entry_price.size, self.allocation * equity_now)
+                cost = notional * (1 + fee_rate)
+                if cost.sum() > cash:
+                    # Shared cash: scale every entry on this bar by the same factor
+                    scale = max(cash, 0.0) / cost.sum()
+                    notional *= scale
+                    cost *= scale
+                if notional.sum() > 0:
+                    qty = notional / entry_price
+                    cash -= float(cost.sum())
+                    self._record(t, BUY, symbol_ids[entries], qty, entry_price, notional * fee_rate)
+                    positions[entries] = qty
+                    entry_cost[entries] = cost
+
+            self.equity[t] = cash + float(np.nan_to_num(price) @ positions)
+
+        self.cash = cash
+        equity = pd.Series(self.equity, index=self.closes.index, name='equity')
+        accumulator = BacktestingMetrics(initial_capital=self.initial_cash).accumulator()
+        accumulator.update_equity(self.initial_cash)
+        accumulator.update_equity_chunk(self.equity)
+        if trade_pnls:
+            accumulator.add_trade_pnls(np.concatenate(trade_pnls))
+        metrics = accumulator.result()
+        logger.info(f"✓ Portfolio backtest: {n_symbols} symbols, {n_bars} bars, {len(self.ledger)} fills")
+        return {
+            'equity': equity,
+            'cash': cash,
+            'positions': dict(zip(self.symbols, positions.tolist())),
+            'realized_pnl': self.ledger.realized_pnl(),
+            'fills': self.ledger,
+            'metrics': metrics
+        }
+
+    def _record(self, bar: int, side: int, symbol_ids: np.ndarray, qty: np.ndarray, price: np.ndarray, fees: np.ndarray):
+        self.ledger.extend(
+            np.full(qty.size, side, dtype=np.int8),
+            qty,
+            price,
+            fee=fees,
+            timestamp=np.full(qty.size, bar, dtype=np.float64),
+            symbol_ids=symbol_ids
+        )
@@ -44,11 +44,11 @@ class PredictionLogger:
             with open(self.predictions_file, 'a') as f:
                 f.write(json.dumps(record) + '\n')
             
-            logger.debug(f"✓ Prediction logged: {prediction} (confidence: {confidence:.2f})")
+            logger.debug("✓ Prediction logged: %s (confidence: %.2f)", prediction, confidence)
             return True
         
         except Exception as e:
-            logger.error(f"✗ Failed to log prediction: {e}")
+            logger.error("✗ Failed to log prediction: %s", e)
             return False
     
     def log_batch_predictions(self, predictions: List[Dict]) -> int:
@@ -64,11 +64,11 @@ class PredictionLogger:
                 ):
                     count += 1
             
-            logger.info(f"✓ Logged {count} predictions")
+            logger.info("✓ Logged %s predictions", count)
             return count
         
         except Exception as e:
-            logger.error(f"✗ Error logging batch predictions: {e}")
+            logger.error("✗ Error logging batch predictions: %s", e)
             return count
     
     def calculate_accuracy(self, recent_n: Optional[int] = None) -> float:
@@ -84,11 +84,11 @@ class PredictionLogger:
             correct = sum(1 for p in predictions if p.get('correct') is True)
             accuracy = (correct / len(predictions)) * 100 if predictions else 0.0
             
-            logger.info(f"✓ Accuracy: {accuracy:.2f}% ({correct}/{len(predictions)})")
+            logger.info("✓ Accuracy: %.2f%% (%s/%s)", accuracy, correct, len(predictions))
             return accuracy
         
         except Exception as e:
-            logger.error(f"✗ Error calculating accuracy: {e}")
+            logger.error("✗ Error calculating accuracy: %s", e)
             return 0.0
     
     def calculate_confidence_calibration(self) -> Dict:
@@ -117,11 +117,11 @@ class PredictionLogger:
                         "avg_confidence": sum(p['confidence'] for p in preds_in_range) / len(preds_in_range)
                     }
             
-            logger.info(f"✓ Calibration analysis: {calibration}")
+            logger.info("✓ Calibration analysis: %s", calibration)
             return calibration
         
         except Exception as e:
-            logger.error(f"✗ Error calculating calibration: {e}")
+            logger.error("✗ Error calculating calibration: %s", e)
             return {}
     
     def generate_summary(self) -> Dict:
@@ -150,11 +150,11 @@ class PredictionLogger:
             with open(self.summary_file, 'w') as f:
                 json.dump(summary, f, indent=2, default=str)
             
-            logger.info(f"✓ Summary generated: {summary['overall_accuracy']:.2f}% accuracy")
+            logger.info("✓ Summary generated: %.2f%% accuracy", summary['overall_accuracy'])
             return summary
         
         except Exception as e:
-            logger.error(f"✗ Error generating summary: {e}")
+            logger.error("✗ Error generating summary: %s", e)
             return {}
     
     def read_predictions(self, limit: Optional[int] = None) -> List[Dict]:
@@ -175,7 +175,7 @@ class PredictionLogger:
             return predictions
         
         except Exception as e:
-            logger.error(f"✗ Error reading predictions: {e}")
+            logger.error("✗ Error reading predictions: %s", e)
             return []
     
     def export_to_csv(self, output_file: Optional[str] = None) -> bool:
@@ -189,11 +189,11 @@ class PredictionLogger:
             output_path = output_file or self.log_dir / f"{self.model_name}_predictions.csv"
             df.to_csv(output_path, index=False)
             
-            logger.info(f"✓ Exported {len(predictions)} predictions to {output_path}")
+            logger.info("✓ Exported %s predictions to %s", len(predictions), output_path)
             return True
         
         except Exception as e:
-            logger.error(f"✗ Error exporting to CSV: {e}")
+            logger.error("✗ Error exporting to CSV: %s", e)
             return False
     
     def get_statistics(self) -> Dict:
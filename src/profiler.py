@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler Module
+Threshold-triggered stack sampling of agent cycles and pipeline phases with flame-graph output
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NULL_SECTION = contextlib.nullcontext()
+
+
+class _Section:
+    __slots__ = ('name', 'start', 'samples')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.samples: List[Tuple] = []
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}".replace(';', ',')
+
+
+class SamplingProfiler:
+    """Samples the stacks of threads inside profiled sections; keeps only slow ones
+
+    A background thread wakes every ``interval`` seconds while any section
+    is open and records the code objects on each profiled thread's stack.
+    When a section closes faster than ``threshold`` its samples are simply
+    dropped; slower sections are written as a collapsed-stack file
+    (``<name>-<time>-<ms>ms.folded``, one ``frame;frame;frame count`` line
+    per stack, ready for flamegraph.pl or speedscope) and folded into a
+    per-section top-N summary in ``summary.txt``. Slow sections are handed
+    to the sampler thread, which aggregates and writes them, so the profiled
+    thread never waits on file I/O. Disabled profilers hand out a shared
+    no-op context manager.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.25,
+                 interval: float = 0.005,
+                 output_dir: str = "logs/profiles",
+                 top_n: int = 20,
+                 max_profiles: int = 200,
+                 enabled: bool = True):
+        self.threshold = threshold
+        self.interval = interval
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.enabled = enabled
+        self.slow_sections = 0
+        self._active: Dict[int, List[_Section]] = {}
+        self._marked: Dict[int, _Section] = {}
+        self._self_samples: Dict[str, Counter] = {}
+        self._total_samples: Dict[str, Counter] = {}
+        self._sample_counts: Counter = Counter()
+        self._profiles = deque()
+        # Slow sections waiting for the sampler thread to record them
+        self._finished: deque = deque()
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "SamplingProfiler":
+        """Build from the 'profiling' config section (disabled unless enabled: true)"""
+        settings = config.get('profiling', {})
+        return cls(threshold=settings.get('threshold_ms', 250) / 1000.0,
+                   interval=settings.get('interval_ms', 5) / 1000.0,
+                   output_dir=settings.get('output_dir', 'logs/profiles'),
+                   top_n=settings.get('top_n', 20),
+                   max_profiles=settings.get('max_profiles', 200),
+                   enabled=settings.get('enabled', False))
+
+    def section(self, name: str):
+        """Context manager profiling the enclosed block on the calling thread"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return self._section(name)
+
+    @contextlib.contextmanager
+    def _section(self, name: str):
+        section = self._enter(name)
+        try:
+            yield section
+        finally:
+            self._exit(section)
+
+    def mark(self, name: Optional[str]):
+        """End the calling thread's previous marked section and start ``name`` (None just ends)
+
+        Suits scripts laid out as consecutive phases, where wrapping each
+        phase in a ``with`` block would be intrusive.
+        """
+        if not self.enabled:
+            return
+        tid = threading.get_ident()
+        previous = self._marked.pop(tid, None)
+        if previous is not None:
+            self._exit(previous)
+        if name is not None:
+            self._marked[tid] = self._enter(name)
+
+    def _enter(self, name: str) -> _Section:
+        self._ensure_sampler()
+        section = _Section(name)
+        with self._lock:
+            self._active.setdefault(threading.get_ident(), []).append(section)
+            self._wake.set()
+        return section
+
+    def _exit(self, section: _Section):
+        elapsed = time.perf_counter() - section.start
+        tid = threading.get_ident()
+        with self._lock:
+            stack = self._active.get(tid, [])
+            if section in stack:
+                stack.remove(section)
+            if not stack:
+                self._active.pop(tid, None)
+            if elapsed >= self.threshold and section.samples:
+                self._finished.append((section, elapsed))
+                self._wake.set()
+            elif not self._active and not self._finished:
+                self._wake.clear()
+
+    def _ensure_sampler(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+                    self._thread.start()
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(0.5):
+                continue
+            self._record_finished()
+            if self._sample():
+                time.sleep(self.interval)
+        self._record_finished()
+
+    def _sample(self) -> bool:
+        """Append the current stack of every profiled thread to its open sections"""
+        frames = sys._current_frames()
+        with self._lock:
+            if not self._active:
+                if not self._finished:
+                    self._wake.clear()
+                return False
+            for tid, sections in self._active.items():
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                # Code objects only; labels are built for slow sections when recorded
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack = tuple(reversed(stack))
+                for section in sections:
+                    section.samples.append(stack)
+        return True
+
+    def _record_finished(self):
+        while True:
+            with self._lock:
+                if not self._finished:
+                    return
+                section, elapsed = self._finished.popleft()
+            self._record(section, elapsed)
+
+    def _record(self, section: _Section, elapsed: float):
+        """Fold a slow section into the summary counters and write its profile (sampler thread)"""
+        stacks = Counter(section.samples)
+        folded = Counter()
+        leaves = Counter()
+        totals = Counter()
+        for stack, count in stacks.items():
+            labels = [_frame_label(code) for code in stack]
+            folded[";".join(labels)] += count
+            leaves[labels[-1]] += count
+            for label in set(labels):
+                totals[label] += count
+        with self._lock:
+            self._self_samples.setdefault(section.name, Counter()).update(leaves)
+            self._total_samples.setdefault(section.name, Counter()).update(totals)
+            self._sample_counts[section.name] += len(section.samples)
+            self.slow_sections += 1
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            path = os.path.join(self.output_dir, f"{section.name}-{stamp}-{elapsed * 1000:.0f}ms.folded")
+            with open(path, 'w') as f:
+                for stack, count in folded.most_common():
+                    f.write(f"{stack} {count}\n")
+            self._profiles.append(path)
+            while len(self._profiles) > self.max_profiles:
+                old = self._profiles.popleft()
+                if os.path.exists(old):
+                    os.remove(old)
+            self.write_summary()
+        except OSError as e:
+            logger.error(f"✗ Failed to write profile: {e}")
+            return
+
+        hottest = ", ".join(name for name, _ in leaves.most_common(3))
+        logger.warning(f"Slow {section.name}: {elapsed * 1000:.0f} ms, "
+                       f"{len(section.samples)} samples -> {path} (hot: {hottest})")
+
+    def top(self, name: str, n: Optional[int] = None) -> List[Dict]:
+        """Hottest functions of a section across all its slow runs, by self samples"""
+        with self._lock:
+            return self._top(name, n)
+
+    def _top(self, name: str, n: Optional[int] = None) -> List[Dict]:
+        total = self._sample_counts.get(name, 0)
+        if not total:
+            return []
+        self_counts = self._self_samples[name]
+        total_counts = self._total_samples[name]
+        return [
+            {
+                'function': function,
+                'self_samples': count,
+                'self_pct': count / total * 100,
+                'total_pct': total_counts[function] / total * 100
+            }
+            for function, count in self_counts.most_common(n or self.top_n)
+        ]
+
+    def write_summary(self, path: Optional[str] = None) -> str:
+        """Top-N hot functions per section, as plain text"""
+        path = path or os.path.join(self.output_dir, "summary.txt")
+        lines = []
+        with self._lock:
+            for name in self._sample_counts:
+                lines.append(f"== {name}: {self._sample_counts[name]} samples ==")
+                lines.append(f"{'self%':>7} {'total%':>7}  function")
+                for row in self._top(name):
+                    lines.append(f"{row['self_pct']:7.1f} {row['total_pct']:7.1f}  {row['function']}")
+                lines.append("")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write("\n".join(lines))
+        os.replace(tmp, path)
+        return path
+
+    def stop(self):
+        """Close any marked section, record pending slow sections and stop the sampler thread"""
+        self.mark(None)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Module
+Token-bucket request-weight and order-count budgets with prioritized waiting for exchange clients
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower value is served first when requests are waiting
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+
+class TokenBucket:
+    """Budget of ``capacity`` tokens refilled continuously over ``period`` seconds"""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)"""
+        self._refill(now)
+        if self.tokens >= amount:
+            return 0.0
+        return (min(amount, self.capacity) - self.tokens) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= amount
+
+    def observe_used(self, used: float, now: float):
+        """Align with the server's count of tokens used in the current window"""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateLimiter:
+    """Paces requests against the exchange's request-weight and order budgets
+
+    ``acquire`` blocks the calling thread until both buckets can pay for the
+    request. Waiting callers queue by priority (orders, then account calls,
+    then market data) and FIFO within a priority, so a burst is spread over
+    the refill rate instead of being sent at once and throttled. Usage headers
+    returned by the exchange tighten the local buckets, and a 429/418 pauses
+    every caller for the server's Retry-After.
+    """
+
+    def __init__(self,
+                 weight_limit: int = 6000,
+                 weight_period: float = 60.0,
+                 order_limit: int = 100,
+                 order_period: float = 10.0,
+                 weight_header: Optional[str] = 'X-MBX-USED-WEIGHT-1M',
+                 order_header: Optional[str] = 'X-MBX-ORDER-COUNT-10S'):
+        self.weight = TokenBucket(weight_limit, weight_period)
+        self.orders = TokenBucket(order_limit, order_period)
+        # Headers reporting usage over the same windows as the buckets; None ignores them
+        self.weight_header = weight_header
+        self.order_header = order_header
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'rejections': 0
+        }
+
+    def acquire(self,
+                weight: float = 1,
+                orders: int = 0,
+                priority: int = PRIORITY_MARKET_DATA,
+                timeout: Optional[float] = None) -> float:
+        """Block until the request may be sent; returns the seconds spent waiting"""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._waiters[0] == entry:
+                        wait = max(
+                            self._paused_until - now,
+                            self.weight.wait_time(weight, now),
+                            self.orders.wait_time(orders, now) if orders else 0.0
+                        )
+                        if wait <= 0:
+                            break
+                    else:
+                        # Not our turn; woken when the head of the queue changes
+                        wait = None
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise TimeoutError(f"Rate limiter wait exceeded {timeout}s")
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self.weight.consume(weight, now)
+            if orders:
+                self.orders.consume(orders, now)
+            waited = now - start
+            self.stats['requests'] += 1
+            self.stats['wait_seconds'] += waited
+            if waited > 0.001:
+                self.stats['throttled'] += 1
+            self._cond.notify_all()
+        return waited
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Apply the exchange's used-weight / order-count headers from a response"""
+        used_weight = _header_value(headers, self.weight_header) if self.weight_header else None
+        used_orders = _header_value(headers, self.order_header) if self.order_header else None
+        if used_weight is None and used_orders is None:
+            return
+        with self._cond:
+            now = time.monotonic()
+            if used_weight is not None:
+                self.weight.observe_used(used_weight, now)
+            if used_orders is not None:
+                self.orders.observe_used(used_orders, now)
+
+    def backoff(self, retry_after: float):
+        """Pause every caller after the exchange rejected a request for rate limits"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self.stats['rejections'] += 1
+            self._cond.notify_all()
+        logger.warning(f"Rate limited by exchange; pausing requests for {retry_after:.1f}s")
+
+    def headroom(self) -> Dict[str, float]:
+        """Current budget left in each bucket plus queue and throttling counters"""
+        with self._cond:
+            now = time.monotonic()
+            self.weight.wait_time(0, now)
+            self.orders.wait_time(0, now)
+            return {
+                'weight_available': self.weight.tokens,
+                'weight_limit': self.weight.capacity,
+                'weight_headroom': self.weight.tokens / self.weight.capacity,
+                'orders_available': self.orders.tokens,
+                'order_limit': self.orders.capacity,
+                'order_headroom': self.orders.tokens / self.orders.capacity,
+                'waiting': len(self._waiters),
+                'paused_for': max(0.0, self._paused_until - now),
+                **self.stats
+            }
+
+
+def _header_value(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Numeric header value, matched case-insensitively"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
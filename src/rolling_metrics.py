@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Rolling Metrics Module
+Sliding-window Sharpe, Sortino, drawdown and win rate for every bar of an equity curve
+"""
+
+import math
+import logging
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window maximum in O(n) using the van Herk/Gil-Werman block scheme
+
+    The series is cut into blocks of ``window`` points; a prefix max inside
+    each block and a suffix max inside each block cover any window with two
+    lookups, so the whole pass is a handful of vectorized accumulates.
+    Positions with fewer than ``window`` points use the expanding maximum.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n == 0 or window <= 1:
+        return values.copy()
+
+    n_blocks = -(-n // window)
+    padded = np.full(n_blocks * window, -np.inf)
+    padded[:n] = values
+    blocks = padded.reshape(n_blocks, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    out = np.empty(n)
+    head = min(window - 1, n)
+    out[:head] = np.maximum.accumulate(values[:head])
+    idx = np.arange(head, n)
+    out[head:] = np.maximum(suffix[idx - window + 1], prefix[idx])
+    return out
+
+
+def _rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Worst peak-to-trough drop (fraction) with both peak and trough inside each trailing window
+
+    Same block scheme as ``rolling_max``: a window is a suffix of one block
+    followed by a prefix of the next, and the worst drop across the two is
+    the larger of each part's own worst drop and ``1 - prefix min / suffix
+    max``. Positions with fewer than ``window`` points use the expanding value.
+    """
+    n = equity.size
+    if n == 0:
+        return equity.copy()
+
+    n_blocks = -(-n // window)
+    # Edge padding only reaches suffixes that are never combined (see below)
+    blocks = np.pad(equity, (0, n_blocks * window - n), mode='edge').reshape(n_blocks, window)
+    pre_max = np.maximum.accumulate(blocks, axis=1)
+    pre_min = np.minimum.accumulate(blocks, axis=1).ravel()
+    pre_mdd = np.maximum.accumulate(1 - blocks / pre_max, axis=1).ravel()
+    reversed_blocks = blocks[:, ::-1]
+    suf_max = np.maximum.accumulate(reversed_blocks, axis=1)[:, ::-1].ravel()
+    suf_min = np.minimum.accumulate(reversed_blocks, axis=1)
+    suf_mdd = np.maximum.accumulate(1 - suf_min / reversed_blocks, axis=1)[:, ::-1].ravel()
+
+    out = np.empty(n)
+    head = min(window - 1, n)
+    out[:head] = np.maximum.accumulate(1 - equity[:head] / np.maximum.accumulate(equity[:head]))
+    t = np.arange(head, n)
+    start = t - window + 1
+    cross = np.maximum(np.maximum(suf_mdd[start], pre_mdd[t]), 1 - pre_min[t] / suf_max[start])
+    # A window starting on a block boundary is exactly that block's prefix up to t
+    out[head:] = np.where(start % window == 0, pre_mdd[t], cross)
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sums from one cumulative sum; NaN until the window is full"""
+    csum = np.cumsum(values)
+    out = np.full(values.size, np.nan)
+    if values.size >= window:
+        out[window - 1] = csum[window - 1]
+        out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+def _rolling_mean_std(values: np.ndarray, window: int):
+    """Rolling mean and population std, centred first to limit cancellation error"""
+    centre = values.mean() if values.size else 0.0
+    shifted = values - centre
+    s1 = _rolling_sum(shifted, window)
+    s2 = _rolling_sum(shifted * shifted, window)
+    mean = s1 / window
+    var = np.maximum(s2 / window - mean * mean, 0.0)
+    return mean + centre, np.sqrt(var)
+
+
+def calculate_rolling_metrics(equity_curve: Sequence[float],
+                              window: int,
+                              trade_bars: Optional[Sequence[int]] = None,
+                              trade_pnls: Optional[Sequence[float]] = None,
+                              risk_free_rate: float = 0.02,
+                              periods_per_year: int = 252,
+                              index: Optional[pd.Index] = None) -> pd.DataFrame:
+    """Compute rolling metrics aligned bar-for-bar with the equity curve
+
+    ``window`` counts bars (e.g. 30 * 1440 for 30 days of 1m bars). Sharpe and
+    Sortino use the last ``window`` returns with the same definitions as
+    ``BacktestingMetrics``. ``drawdown`` is the current percentage drop from
+    the trailing-window peak and ``max_drawdown`` the worst peak-to-trough
+    drop with both the peak and the trough inside the window. ``win_rate`` counts trades closed within the window, keyed by
+    the bar index in ``trade_bars``. Bars before a window is complete are NaN.
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    n = equity.size
+    if window < 2:
+        raise ValueError("window must be at least 2 bars")
+
+    returns = np.full(n, np.nan)
+    if n > 1:
+        returns[1:] = equity[1:] / equity[:-1] - 1
+    excess = returns[1:] - risk_free_rate / periods_per_year
+    sqrt_periods = math.sqrt(periods_per_year)
+
+    sharpe = np.full(n, np.nan)
+    sortino = np.full(n, np.nan)
+    if excess.size:
+        mean, std = _rolling_mean_std(excess, window)
+        _, down_std = _rolling_mean_std(np.minimum(excess, 0.0), window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe[1:] = np.where(std > 0, sqrt_periods * mean / std, 0.0)
+            sortino[1:] = np.where(down_std > 0, sqrt_periods * mean / down_std, 0.0)
+        # Keep the warm-up period undefined rather than 0.0
+        sharpe[1:][np.isnan(mean)] = np.nan
+        sortino[1:][np.isnan(mean)] = np.nan
+
+    peak = rolling_max(equity, window)
+    drawdown = (peak - equity) / peak * 100
+    max_drawdown = _rolling_max_drawdown(equity, window) * 100
+
+    frame = {
+        'equity': equity,
+        'returns': returns,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'drawdown': drawdown,
+        'max_drawdown': max_drawdown
+    }
+
+    if trade_bars is not None and trade_pnls is not None:
+        bars = np.asarray(trade_bars, dtype=np.int64)
+        pnls = np.asarray(trade_pnls, dtype=np.float64)
+        trades = np.bincount(bars, minlength=n)[:n].astype(np.float64)
+        wins = np.bincount(bars, weights=(pnls > 0).astype(np.float64), minlength=n)[:n]
+        trades_in_window = _rolling_sum(trades, window)
+        wins_in_window = _rolling_sum(wins, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame['win_rate'] = np.where(trades_in_window > 0, wins_in_window / trades_in_window * 100, np.nan)
+        frame['trades'] = trades_in_window
+
+    return pd.DataFrame(frame, index=index)
+
+
+class LiveRollingMetrics:
+    """Incremental rolling metrics for live runs, O(1) amortized per bar
+
+    Keeps running sums of the last ``window`` excess returns and a monotonic
+    deque of equity peaks, so each new bar updates the window without
+    recomputing it.
+    """
+
+    def __init__(self, window: int, risk_free_rate: float = 0.02, periods_per_year: int = 252):
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self._rf_per_period = risk_free_rate / periods_per_year
+        self._returns = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._down_sum = 0.0
+        self._down_sum_sq = 0.0
+        self._peaks = deque()  # (bar, equity) with decreasing equity
+        self._trades = deque()  # (bar, is_win)
+        self._wins = 0
+        self.bar = -1
+        self.last_equity = None
+
+    def update(self, equity: float) -> Dict:
+        """Add one bar's equity and return the current rolling metrics"""
+        self.bar += 1
+        if self.last_equity is not None:
+            excess = equity / self.last_equity - 1 - self._rf_per_period
+            downside = min(excess, 0.0)
+            self._returns.append((excess, downside))
+            self._sum += excess
+            self._sum_sq += excess * excess
+            self._down_sum += downside
+            self._down_sum_sq += downside * downside
+            if len(self._returns) > self.window:
+                old, old_down = self._returns.popleft()
+                self._sum -= old
+                self._sum_sq -= old * old
+                self._down_sum -= old_down
+                self._down_sum_sq -= old_down * old_down
+        self.last_equity = equity
+
+        while self._peaks and self._peaks[-1][1] <= equity:
+            self._peaks.pop()
+        self._peaks.append((self.bar, equity))
+        while self._peaks[0][0] <= self.bar - self.window:
+            self._peaks.popleft()
+
+        self._expire_trades()
+        return self.snapshot()
+
+    def add_trade(self, pnl: float):
+        """Record a trade closed on the current bar"""
+        is_win = pnl > 0
+        self._trades.append((self.bar, is_win))
+        self._wins += is_win
+
+    def snapshot(self) -> Dict:
+        """Current rolling metrics without consuming a new bar"""
+        n = len(self._returns)
+        sharpe = sortino = float('nan')
+        if n >= self.window:
+            mean = self._sum / n
+            std = math.sqrt(max(self._sum_sq / n - mean * mean, 0.0))
+            down_mean = self._down_sum / n
+            down_std = math.sqrt(max(self._down_sum_sq / n - down_mean * down_mean, 0.0))
+            sqrt_periods = math.sqrt(self.periods_per_year)
+            sharpe = sqrt_periods * mean / std if std > 0 else 0.0
+            sortino = sqrt_periods * mean / down_std if down_std > 0 else 0.0
+
+        peak = self._peaks[0][1] if self._peaks else float('nan')
+        n_trades = len(self._trades)
+        return {
+            'bar': self.bar,
+            'sharpe': sharpe,
+            'sortino': sortino,
+            'drawdown': (peak - self.last_equity) / peak * 100 if self._peaks else float('nan'),
+            'win_rate': self._wins / n_trades * 100 if n_trades else float('nan'),
+            'trades': n_trades
+        }
+
+    def _expire_trades(self):
+        while self._trades and self._trades[0][0] <= self.bar - self.window:
+            _, is_win = self._trades.popleft()
+            self._wins -= is_win
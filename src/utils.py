@@ -2,17 +2,16 @@ import yaml
 import logging
 from pathlib import Path
 
+from src import logging_setup
+
 def load_config(config_path):
     """Load YAML configuration file."""
     with open(config_path, 'r') as f:
         return yaml.safe_load(f)
 
-def setup_logging(log_level=logging.INFO):
-    """Configure logging for the trading agent."""
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+def setup_logging(log_level=logging.INFO, log_file=None):
+    """Configure queue-backed logging for the trading agent."""
+    logging_setup.setup_logging(log_level, log_file)
     return logging.getLogger(__name__)
 
 def ensure_data_dir(data_path):
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Optimization Module
+Rolls train/test windows over history, retrains per window and backtests out-of-sample segments
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.auto_learner import AutoLearner
+from src.backtesting_metrics import BacktestingMetrics
+
+logger = logging.getLogger(__name__)
+
+
+# Worker-side copy of the cached feature matrix, shipped once per process
+_worker_data = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, params: Dict):
+    _worker_data['X'] = X
+    _worker_data['y'] = y
+    _worker_data['params'] = params
+
+
+def _build_estimator(params: Dict, n_estimators: Optional[int] = None, warm_start: bool = False):
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(
+        n_estimators=n_estimators or params['n_estimators'],
+        max_depth=params['max_depth'],
+        random_state=params['random_state'],
+        warm_start=warm_start
+    )
+
+
+def _fit_predict_window(window: Tuple[int, int, int, int]) -> np.ndarray:
+    """Fit a fresh scaler and model on one training window and score its test window"""
+    from sklearn.preprocessing import StandardScaler
+    X, y, params = _worker_data['X'], _worker_data['y'], _worker_data['params']
+    train_start, train_end, test_start, test_end = window
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[train_start:train_end])
+    model = _build_estimator(params)
+    model.fit(X_train, y[train_start:train_end])
+
+    proba = model.predict_proba(scaler.transform(X[test_start:test_end]))
+    if proba.shape[1] == 1:
+        # Training window held a single class
+        return np.full(test_end - test_start, float(model.classes_[0]))
+    return proba[:, 1]
+
+
+class WalkForwardEngine:
+    """Walk-forward validation of the AutoLearner pipeline
+
+    Features and labels are computed once for the whole history and cached;
+    every window then slices the cached matrix. The last ``lookahead`` rows
+    of each training window are purged because their labels look into the
+    test window. In ``refit='full'`` mode windows are independent and run on
+    a process pool; ``refit='incremental'`` keeps one forest and adds
+    ``trees_per_window`` trees fitted on each new window, which is sequential.
+    """
+
+    def __init__(self,
+                 learner: Optional[AutoLearner] = None,
+                 train_size: int = 500,
+                 test_size: int = 100,
+                 step: Optional[int] = None,
+                 anchored: bool = False,
+                 refit: str = 'full',
+                 lookahead: int = 5,
+                 label_threshold: float = 0.01,
+                 confidence_threshold: float = 0.6,
+                 initial_capital: float = 10000.0,
+                 fee_rate: float = 0.0,
+                 n_estimators: int = 150,
+                 max_depth: int = 12,
+                 trees_per_window: int = 25,
+                 random_state: int = 42,
+                 n_jobs: Optional[int] = None):
+        if refit not in ('full', 'incremental'):
+            raise ValueError(f"Unknown refit mode: {refit}")
+        if step is not None and step < test_size:
+            # Overlapping test segments would duplicate bars in the joined curve and chain capital twice
+            raise ValueError(f"step ({step}) must be at least test_size ({test_size})")
+        self.learner = learner or AutoLearner()
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step or test_size
+        self.anchored = anchored
+        self.refit = refit
+        self.lookahead = lookahead
+        self.label_threshold = label_threshold
+        self.confidence_threshold = confidence_threshold
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.trees_per_window = trees_per_window
+        self.n_jobs = n_jobs
+        self.params = {'n_estimators': n_estimators, 'max_depth': max_depth, 'random_state': random_state}
+        self.feature_cols = list(AutoLearner.FEATURE_COLUMNS)
+        self._cache_key = None
+        self._cache = None
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compute (or reuse) the feature/label frame for this history"""
+        key = (len(df), int(pd.util.hash_pandas_object(df[['close', 'volume']], index=True).sum()))
+        if key != self._cache_key:
+            features = self.learner.prepare_features(df)
+            labeled = self.learner.generate_labels(features, self.lookahead, self.label_threshold)
+            self._cache = labeled
+            self._cache_key = key
+            logger.info(f"✓ Cached features for {len(labeled)} bars")
+        return self._cache
+
+    def windows(self, n: int) -> List[Tuple[int, int, int, int]]:
+        """(train_start, train_end, test_start, test_end) positions; train_end is already purged"""
+        windows = []
+        test_start = self.train_size
+        while test_start < n:
+            test_end = min(test_start + self.test_size, n)
+            train_start = 0 if self.anchored else test_start - self.train_size
+            train_end = test_start - self.lookahead
+            if train_end > train_start:
+                windows.append((train_start, train_end, test_start, test_end))
+            test_start += self.step
+        return windows
+
+    def run(self, df: pd.DataFrame) -> Dict:
+        """Run every window and join the out-of-sample equity curves"""
+        data = self.prepare(df)
+        # float32 when the learner is compact, which also halves what is shipped to workers
+        X = self.learner.feature_matrix(data, columns=self.feature_cols)
+        y = data['Label'].to_numpy()
+        close = data['close'].to_numpy(dtype=np.float64)
+
+        windows = self.windows(len(data))
+        if not windows:
+            logger.warning("Not enough history for a single walk-forward window")
+            return {}
+        logger.info(f"Walk-forward: {len(windows)} windows ({self.refit} refit)")
+
+        if self.refit == 'incremental':
+            scores = self._run_incremental(X, y, windows)
+        elif self.n_jobs == 1 or len(windows) == 1:
+            _init_worker(X, y, self.params)
+            scores = [_fit_predict_window(w) for w in windows]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                     initargs=(X, y, self.params)) as pool:
+                scores = list(pool.map(_fit_predict_window, windows))
+
+        equity_parts = []
+        trades = []
+        window_reports = []
+        capital = self.initial_capital
+        # Trade bars index the joined curve, which is prefixed with the initial capital
+        offset = 1
+        for (train_start, train_end, test_start, test_end), confidence in zip(windows, scores):
+            equity, window_trades = self._backtest_segment(close[test_start:test_end], confidence, capital, offset)
+            offset += len(equity)
+            equity_parts.append(pd.Series(equity, index=data.index[test_start:test_end]))
+            trades.extend(window_trades)
+
+            predicted = confidence > self.confidence_threshold
+            window_reports.append({
+                'train_start': data.index[train_start],
+                'train_end': data.index[train_end - 1],
+                'test_start': data.index[test_start],
+                'test_end': data.index[test_end - 1],
+                'train_samples': train_end - train_start,
+                'test_samples': test_end - test_start,
+                'hit_rate': float(np.mean(predicted == (y[test_start:test_end] == 1))),
+                'return': float((equity[-1] - capital) / capital * 100),
+                'trades': len(window_trades)
+            })
+            capital = equity[-1]
+
+        equity_curve = pd.concat(equity_parts)
+        metrics = BacktestingMetrics(initial_capital=self.initial_capital).calculate_all_metrics(
+            trades, np.concatenate(([self.initial_capital], equity_curve.to_numpy()))
+        )
+        return {
+            'windows': window_reports,
+            'equity_curve': equity_curve,
+            'confidence': pd.Series(np.concatenate(scores), index=equity_curve.index),
+            'trades': trades,
+            'metrics': metrics
+        }
+
+    def _run_incremental(self, X: np.ndarray, y: np.ndarray, windows) -> List[np.ndarray]:
+        """Grow one forest window by window instead of refitting from scratch
+
+        Features are not scaled: trees are invariant to it, and a scaler
+        refreshed per window would shift the inputs under trees already
+        fitted on earlier windows. Every tree must share the forest's
+        classes, so new rows holding only some of them add no trees, and
+        new rows bringing a class the forest lacks trigger a full refit on
+        the training window.
+        """
+        model = None
+        scores = []
+        for i, (train_start, train_end, test_start, test_end) in enumerate(windows):
+            # Only rows not seen by earlier windows fit the new trees
+            new_start = train_start if i == 0 else max(train_start, windows[i - 1][1])
+            classes = np.unique(y[new_start:train_end])
+            if model is None:
+                model = _build_estimator(self.params, n_estimators=self.trees_per_window, warm_start=True)
+                model.fit(X[new_start:train_end], y[new_start:train_end])
+            elif np.array_equal(classes, model.classes_):
+                model.n_estimators += self.trees_per_window
+                model.fit(X[new_start:train_end], y[new_start:train_end])
+            elif not np.isin(classes, model.classes_).all():
+                logger.info(f"Window {i} adds a class the forest lacks; refitting on the full window")
+                model = _build_estimator(self.params, n_estimators=model.n_estimators + self.trees_per_window,
+                                         warm_start=True)
+                model.fit(X[train_start:train_end], y[train_start:train_end])
+
+            proba = model.predict_proba(X[test_start:test_end])
+            scores.append(proba[:, 1] if proba.shape[1] > 1 else np.full(test_end - test_start, float(model.classes_[0])))
+        return scores
+
+    def _backtest_segment(self, close: np.ndarray, confidence: np.ndarray, capital: float, offset: int):
+        """Long when confidence clears the threshold, flat at the end of the segment"""
+        position = (confidence > self.confidence_threshold).astype(np.float64)
+        position[-1] = 0.0
+
+        bar_returns = np.zeros_like(close)
+        bar_returns[1:] = close[1:] / close[:-1] - 1
+        turnover = np.abs(np.diff(position, prepend=0.0))
+        strategy_returns = np.zeros_like(close)
+        strategy_returns[1:] = position[:-1] * bar_returns[1:]
+        strategy_returns -= turnover * self.fee_rate
+        equity = capital * np.cumprod(1 + strategy_returns)
+
+        changes = np.diff(position, prepend=0.0)
+        entries = np.flatnonzero(changes > 0)
+        exits = np.flatnonzero(changes < 0)
+        trades = [
+            {'entry_bar': offset + int(a), 'bar': offset + int(b), 'pnl': float(equity[b] - equity[a - 1] if a > 0 else equity[b] - capital)}
+            for a, b in zip(entries, exits)
+        ]
+        return equity, trades
@@ -1,12 +1,13 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from src.rules import SMARulesEngine
-from src.models import TradeScorer
-from src.broker import PaperBroker
-from src.backtester import EventDrivenBacktester
-from src.reporting import PerformanceReporter
+
+DATA_PATH = 'data/market_data.csv'
+CONFIG_PATH = 'config/config.yaml'
+# Chart and table payloads are bounded by the screen, not by the data size
+CHART_POINTS = 2000
+PAGE_SIZE = 100
 
 st.set_page_config(
     page_title="Trading Agent Dashboard",
@@ -15,6 +16,84 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+def file_fingerprint(path):
+    """Size and modification time; rewriting the file changes every cache key below."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_market_data(path, fingerprint):
+    return pd.read_csv(path)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_app_config(path, fingerprint):
+    """config.yaml, or no settings (zero costs) when the file is missing."""
+    if fingerprint is None:
+        return {}
+    from src.utils import load_config
+    return load_config(path) or {}
+
+
+def config_fingerprint(path):
+    return file_fingerprint(path) if os.path.exists(path) else None
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_scores(path, fingerprint, sma_short, sma_long):
+    """Per-bar signals and scores; these depend only on the data and the SMA periods."""
+    from src.backtester import EventDrivenBacktester
+    from src.models import TradeScorer
+    from src.rules import SMARulesEngine
+    data = load_market_data(path, fingerprint)
+    return EventDrivenBacktester(data, None, SMARulesEngine(sma_short, sma_long), TradeScorer()).compute_scores()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def run_backtest(path, fingerprint, config_fp, sma_short, sma_long, threshold, initial_cash):
+    """Execution only; threshold and capital changes reuse the cached signals and scores.
+
+    Slippage and fees come from the 'backtest' section of config.yaml.
+    """
+    from src.backtester import EventDrivenBacktester
+    from src.broker import PaperBroker
+    data = load_market_data(path, fingerprint)
+    signals, scores = compute_scores(path, fingerprint, sma_short, sma_long)
+    broker = PaperBroker.from_config(load_app_config(CONFIG_PATH, config_fp), initial_cash)
+    backtester = EventDrivenBacktester(data, broker, None, None, threshold=threshold)
+    backtester.run(signals, scores)
+    return {
+        'results': backtester.get_results(),
+        'trades': broker.trades.to_frame(),
+        'cash': broker.cash,
+        'position': broker.position
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def price_series(path, fingerprint, start, end, method, n_points):
+    """Visible bars [start, end] reduced to about n_points chart points."""
+    from src.downsampling import downsample
+    data = load_market_data(path, fingerprint)
+    return downsample(data.index, data['close'], n_points, method, start, end)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def results_csv(path, fingerprint, config_fp, sma_short, sma_long, threshold, initial_cash):
+    return run_backtest(path, fingerprint, config_fp, sma_short, sma_long, threshold, initial_cash)['results'].to_csv(index=False)
+
+
+def paged_table(frame, key):
+    """Render one page of a table; only that page is sent to the browser."""
+    from src.downsampling import paginate
+    _, n_pages = paginate(frame, 1, PAGE_SIZE)
+    page = st.number_input(f"Page (of {n_pages}, {len(frame):,} rows)", 1, n_pages, 1, key=key)
+    rows, _ = paginate(frame, page, PAGE_SIZE)
+    st.dataframe(rows, use_container_width=True)
+
+
 st.title("🤖 Automated Trading Agent Backtester")
 st.markdown("---")
 
@@ -52,7 +131,8 @@ with st.sidebar:
 # Load and Display Data
 st.subheader("📊 Market Data Preview")
 try:
-    data = pd.read_csv('data/market_data.csv')
+    fingerprint = file_fingerprint(DATA_PATH)
+    data = load_market_data(DATA_PATH, fingerprint)
     st.dataframe(data.head(10), use_container_width=True)
     
     col1, col2, col3, col4 = st.columns(4)
@@ -74,66 +154,62 @@ st.divider()
 st.subheader("🚀 Run Backtest")
 
 if st.button("▶️ Execute Backtest", use_container_width=True, key="run_backtest"):
+    st.session_state.completed = True
+
+# Once started, results follow the sliders; unchanged inputs are served from cache
+backtest = None
+if st.session_state.get("completed"):
     with st.spinner("Running backtest..."):
         try:
-            # Initialize components
-            rules_engine = SMARulesEngine(sma_short, sma_long)
-            model = TradeScorer()
-            broker = PaperBroker(initial_cash)
-            
-            # Run backtest
-            backtester = EventDrivenBacktester(
-                data,
-                broker,
-                rules_engine,
-                model
-            )
-            backtester.run()
-            results = backtester.get_results()
-            
-            # Store in session state for display
-            st.session_state.backtest_results = results
-            st.session_state.broker = broker
-            st.session_state.data = data
-            st.session_state.completed = True
-            
-            st.success("✅ Backtest completed successfully!")
+            backtest = run_backtest(DATA_PATH, fingerprint, config_fingerprint(CONFIG_PATH), sma_short, sma_long, confidence_threshold, initial_cash)
         except Exception as e:
             st.error(f"❌ Error during backtest: {str(e)}")
 
 st.divider()
 
 # Display Results
-if "completed" in st.session_state and st.session_state.completed:
+if backtest is not None:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.info(f"📈 Final Cash: ${st.session_state.broker.cash:.2f}")
+        st.info(f"📈 Final Cash: ${backtest['cash']:.2f}")
     with col2:
-        st.info(f"📊 Total Trades: {len(st.session_state.broker.trades)}")
+        st.info(f"📊 Total Trades: {len(backtest['trades'])}")
     with col3:
-        st.info(f"💼 Position: {st.session_state.broker.position}")
+        st.info(f"💼 Position: {backtest['position']}")
     
     st.divider()
     st.subheader("📉 Price Chart & Signals")
     
+    # Visible window and point budget; panning or zooming re-samples just that window
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        start, end = st.slider("Visible bars", 0, len(data) - 1, (0, len(data) - 1))
+    with col2:
+        method = st.radio("Downsampling", ["lttb", "minmax"], horizontal=True)
+    x, y = price_series(DATA_PATH, fingerprint, start, end, method, CHART_POINTS)
+    
     # Create interactive chart
+    import plotly.graph_objects as go
+    from src.downsampling import downsample
     fig = go.Figure()
     
     # Add price line
     fig.add_trace(go.Scatter(
-        x=st.session_state.data.index,
-        y=st.session_state.data['close'],
+        x=x,
+        y=y,
         mode='lines',
         name='Price',
         line=dict(color='blue', width=2)
     ))
     
     # Add trade markers
-    if len(st.session_state.backtest_results) > 0:
+    if len(backtest['results']) > 0:
+        trade_x, trade_y = downsample(backtest['results']['date'], backtest['results']['price'],
+                                      CHART_POINTS, 'lttb', start, end)
         fig.add_trace(go.Scatter(
-            x=st.session_state.backtest_results['date'],
-            y=st.session_state.backtest_results['price'],
+            x=trade_x,
+            y=trade_y,
             mode='markers',
             name='Trades',
             marker=dict(size=10, color='red')
@@ -155,7 +231,7 @@ if "completed" in st.session_state and st.session_state.completed:
     col1, col2, col3, col4 = st.columns(4)
     
     initial = initial_cash
-    final = st.session_state.broker.cash
+    final = backtest['cash']
     pnl = final - initial
     roi = (pnl / initial) * 100 if initial != 0 else 0
     
@@ -170,24 +246,20 @@ if "completed" in st.session_state and st.session_state.completed:
     
     # Trade History
     st.subheader("📋 Trade History")
-    if len(st.session_state.broker.trades) > 0:
-        trades_df = pd.DataFrame(st.session_state.broker.trades)
-        st.dataframe(trades_df, use_container_width=True)
+    if len(backtest['trades']) > 0:
+        paged_table(backtest['trades'], key="trades_page")
     else:
         st.warning("⚠️ No trades executed during backtest")
     
     # Backtest Results Table
     st.subheader("📊 Backtest Results")
-    st.dataframe(
-        st.session_state.backtest_results,
-        use_container_width=True
-    )
+    paged_table(backtest['results'], key="results_page")
     
     # Export Results
     st.divider()
     st.subheader("💾 Export Results")
     
-    csv = st.session_state.backtest_results.to_csv(index=False)
+    csv = results_csv(DATA_PATH, fingerprint, config_fingerprint(CONFIG_PATH), sma_short, sma_long, confidence_threshold, initial_cash)
     st.download_button(
         label="📥 Download CSV",
         data=csv,
@@ -10,21 +10,25 @@ from datetime import datetime, timedelta
 import random
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from src.ledger import TradeLedger, BUY, SELL
+from src.logging_setup import setup_logging
+
+setup_logging(logging.INFO, fmt='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Fixed seed so every demo run sees the same prices and trades
+DEMO_SEED = 42
+
 # Simulate broker integration
 class DemoBroker:
     """Demo broker simulating Binance testnet"""
     
-    def __init__(self, name="Binance Testnet"):
+    def __init__(self, name="Binance Testnet", seed=None):
         self.name = name
+        self.rng = random.Random(seed)
         self.balance = 1000.0  # Virtual testnet funds
         self.positions = {}
-        self.trades = []
+        self.trades = TradeLedger()
         self.order_id = 1000
         
     def get_account_balance(self):
@@ -34,7 +38,7 @@ class DemoBroker:
     def get_market_price(self, symbol="BTCUSDT"):
         # Simulate live price
         base_price = 47500
-        variation = random.uniform(-0.02, 0.02)
+        variation = self.rng.uniform(-0.02, 0.02)
         price = base_price * (1 + variation)
         logger.info(f"✓ Market Price {symbol}: ${price:.2f}")
         return price
@@ -57,7 +61,7 @@ class DemoBroker:
                 "timestamp": datetime.now().isoformat(),
                 "status": "FILLED"
             }
-            self.trades.append(trade)
+            self.trades.append(symbol, BUY, quantity, price, order_id=self.order_id)
             self.order_id += 1
             
             logger.info(f"✓ ORDER PLACED: {side} {quantity} {symbol} @ ${price:.2f}")
@@ -78,7 +82,7 @@ class DemoBroker:
                 "timestamp": datetime.now().isoformat(),
                 "status": "FILLED"
             }
-            self.trades.append(trade)
+            self.trades.append(symbol, SELL, quantity, price, order_id=self.order_id)
             self.order_id += 1
             
             logger.info(f"✓ ORDER PLACED: {side} {quantity} {symbol} @ ${price:.2f}")
@@ -96,7 +100,7 @@ class DemoBroker:
     
     def get_trade_history(self):
         logger.info(f"✓ Trade History: {len(self.trades)} trades executed")
-        return self.trades
+        return self.trades.to_frame()
 
 
 def print_header(title):
@@ -113,7 +117,7 @@ def run_live_demo():
     
     # Initialize broker
     print_header("PHASE 1: Initialize Broker Connection")
-    broker = DemoBroker("Binance Testnet")
+    broker = DemoBroker("Binance Testnet", seed=DEMO_SEED)
     logger.info(f"Connected to: {broker.name}")
     logger.info(f"Initial Balance: ${broker.balance:.2f}")
     
@@ -154,11 +158,11 @@ def run_live_demo():
     print_header("PHASE 7: Performance Report")
     
     trades = broker.get_trade_history()
-    total_volume = sum(t['quantity'] for t in trades)
-    total_value = sum(t['total'] for t in trades)
+    total_volume = trades['quantity'].sum()
+    total_value = (trades['quantity'] * trades['price']).sum()
     
-    buy_trades = [t for t in trades if t['side'] == 'BUY']
-    sell_trades = [t for t in trades if t['side'] == 'SELL']
+    buy_trades = trades[trades['action'] == 'BUY']
+    sell_trades = trades[trades['action'] == 'SELL']
     
     logger.info(f"\nTrade Statistics:")
     logger.info(f"  Total Trades: {len(trades)}")
@@ -171,16 +175,16 @@ def run_live_demo():
     
     # Show all trades
     print_header("Detailed Trade Log")
-    for i, trade in enumerate(trades, 1):
+    for i, trade in enumerate(trades.itertuples(index=False), 1):
         logger.info(f"\nTrade #{i}:")
-        logger.info(f"  Order ID: {trade['order_id']}")
-        logger.info(f"  Symbol: {trade['symbol']}")
-        logger.info(f"  Side: {trade['side']}")
-        logger.info(f"  Quantity: {trade['quantity']} BTC")
-        logger.info(f"  Price: ${trade['price']:.2f}")
-        logger.info(f"  Value: ${trade['total']:.2f}")
-        logger.info(f"  Time: {trade['timestamp']}")
-        logger.info(f"  Status: {trade['status']} ✓")
+        logger.info(f"  Order ID: {trade.order_id}")
+        logger.info(f"  Symbol: {trade.symbol}")
+        logger.info(f"  Side: {trade.action}")
+        logger.info(f"  Quantity: {trade.quantity} BTC")
+        logger.info(f"  Price: ${trade.price:.2f}")
+        logger.info(f"  Value: ${trade.quantity * trade.price:.2f}")
+        logger.info(f"  Time: {datetime.fromtimestamp(trade.time).isoformat()}")
+        logger.info(f"  Status: FILLED ✓")
     
     # Final summary
     print_header("✓ DEMO EXECUTION COMPLETE")
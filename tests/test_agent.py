@@ -0,0 +1,41 @@
+"""TradingAgent journaling of tracked orders"""
+
+import threading
+
+from src.agent import TradingAgent
+from src.journal import TradeJournal
+from src.order_tracker import OrderTracker
+
+
+def order(status, executed, quote):
+    return {'id': 1, 'symbol': 'BTCUSDT', 'side': 'BUY', 'quantity': 1.0, 'status': status,
+            'order_id': 7, 'executed': executed, 'quote': quote, 'error': None}
+
+
+def test_tracked_orders_are_journaled_at_their_fills():
+    forwarded = []
+    tracker = OrderTracker(broker=None, on_update=forwarded.append)
+    journal = TradeJournal(':memory:')
+    agent = TradingAgent({}, None, None, None, journal, order_tracker=tracker)
+
+    # Updates arrive on tracker threads; failed and still-open orders are not journaled
+    updates = [order('PARTIALLY_FILLED', 0.4, 40.0), order('FILLED', 1.0, 101.0), order('FAILED', 0.0, 0.0)]
+    thread = threading.Thread(target=lambda: [tracker._notify(u) for u in updates])
+    thread.start()
+    thread.join()
+
+    assert agent.journal_finished_orders() == 1
+    rows = journal.conn.execute('SELECT action, quantity, price FROM trades').fetchall()
+    assert rows == [('BUY', 1.0, 101.0)]
+    # The caller's callback is left in place and still sees every update
+    assert tracker.on_update == forwarded.append
+    assert len(forwarded) == 3
+
+
+def test_agents_sharing_a_tracker_each_journal_their_orders():
+    tracker = OrderTracker(broker=None)
+    first = TradingAgent({}, None, None, None, TradeJournal(':memory:'), order_tracker=tracker)
+    second = TradingAgent({}, None, None, None, TradeJournal(':memory:'), order_tracker=tracker)
+    tracker._notify(order('FILLED', 2.0, 200.0))
+    assert first.journal_finished_orders() == 1
+    assert second.journal_finished_orders() == 1
@@ -0,0 +1,79 @@
+"""AnalyticsAPI refresh and response caching, driven without the HTTP server"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.analytics_api import CACHE_SIZE, AnalyticsAPI
+from src.journal import TradeJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / "trades.db"))
+    for i in range(50):
+        journal.log_trade("BUY" if i % 2 == 0 else "SELL", 1.0, 100.0 + i)
+    return journal
+
+
+def test_malformed_prediction_line_is_skipped(tmp_path, journal):
+    predictions = tmp_path / "predictions.jsonl"
+    predictions.write_text(json.dumps({"confidence": 0.7, "actual": 1, "correct": True}) + "\n"
+                           + "{not json\n"
+                           + json.dumps({"confidence": 0.5}) + "\n")
+    api = AnalyticsAPI(journal.db_path, str(predictions))
+
+    async def scenario():
+        await api.refresh()
+        journal.log_trade("BUY", 1.0, 200.0)
+        with open(predictions, "a") as f:
+            f.write("[1, 2]\n" + json.dumps({"confidence": 0.9}) + "\n")
+        await api.refresh()
+
+    asyncio.run(scenario())
+    api.stop()
+    assert api.rollups.trades == 51
+    assert api.prediction_stats["total"] == 3
+    assert api.prediction_stats["correct"] == 1
+
+
+def test_malformed_journal_rows_are_skipped(journal):
+    journal.conn.execute("INSERT INTO trades (timestamp, action, quantity, price) VALUES (NULL, 'BUY', 1.0, 1.0)")
+    journal.conn.execute("INSERT INTO trades (timestamp, action, quantity, price) VALUES ('yesterday', 'BUY', 1.0, 1.0)")
+    journal.conn.execute("INSERT INTO trades (timestamp, action, quantity, price) VALUES ('2024-01-01T00:00:00', 'BUY', NULL, 1.0)")
+    journal.conn.commit()
+    journal.log_trade("SELL", 1.0, 200.0)
+    api = AnalyticsAPI(journal.db_path)
+
+    events = asyncio.run(api.refresh())
+    api.stop()
+    assert api.rollups.trades == 51
+    assert api.last_trade_id == 54
+    assert api.version == 1
+    assert sum(name == "trade" for name, _ in events) == 51
+
+
+class _Writer:
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        pass
+
+
+def test_response_cache_is_bounded_and_cleared_on_new_data(journal):
+    api = AnalyticsAPI(journal.db_path)
+
+    async def scenario():
+        await api.refresh()
+        for after in range(CACHE_SIZE + 100):
+            target = f"/api/trades?after={after}"
+            await api._get(_Writer(), "/api/trades", target, {"after": str(after)}, {})
+        assert len(api._cache) == CACHE_SIZE
+        journal.log_trade("SELL", 1.0, 150.0)
+        await api.refresh()
+        assert not api._cache
+
+    asyncio.run(scenario())
+    api.stop()
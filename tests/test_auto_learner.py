@@ -0,0 +1,44 @@
+"""AutoLearner streaming features and labels against the in-memory path"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.auto_learner import AutoLearner
+
+
+@pytest.fixture(scope="module")
+def bars():
+    rng = np.random.default_rng(3)
+    n = 400
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = close * rng.uniform(0.001, 0.01, n)
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.002, n)),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.lognormal(3, 0.5, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+
+
+@pytest.fixture(scope="module")
+def learner(tmp_path_factory):
+    return AutoLearner(models_dir=str(tmp_path_factory.mktemp("models")))
+
+
+def chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+@pytest.mark.parametrize("size", [7, AutoLearner.WARMUP_BARS - 1, AutoLearner.WARMUP_BARS, 64, 1000])
+def test_iter_features_matches_prepare_features(learner, bars, size):
+    streamed = pd.concat(learner.iter_features(chunks(bars, size)))
+    pd.testing.assert_frame_equal(streamed, learner.prepare_features(bars), rtol=1e-9)
+
+
+@pytest.mark.parametrize("size", [3, 7, AutoLearner.WARMUP_BARS - 1, 64, 1000])
+def test_iter_training_data_matches_generate_labels(learner, bars, size):
+    streamed = pd.concat(learner.iter_training_data(chunks(bars, size)))
+    expected = learner.generate_labels(learner.prepare_features(bars))
+    pd.testing.assert_frame_equal(streamed, expected, rtol=1e-9)
@@ -0,0 +1,73 @@
+"""BinanceIntegration behaviour against the in-process FakeExchange"""
+
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from src import broker_integration
+from src.broker_integration import BinanceIntegration
+from src.fake_exchange import FakeExchange
+from src.instrumentation import MetricsRegistry
+
+SYMBOLS = [f"SYM{i}USDT" for i in range(20)]
+
+
+@pytest.fixture
+def skewed_exchange():
+    with FakeExchange(prices={s: 1.0 + i for i, s in enumerate(SYMBOLS)},
+                      clock_offset_ms=20000, api_secret="secret", latency=0.01) as exchange:
+        yield exchange
+
+
+def test_concurrent_first_signed_calls_wait_for_clock_sync(skewed_exchange):
+    with BinanceIntegration("key", "secret", base_url=skewed_exchange.url, pool_size=10) as broker:
+        snapshot = broker.snapshot(SYMBOLS)
+
+    assert skewed_exchange.timestamp_rejected == 0
+    assert snapshot["balance"] == 10000.0
+    assert all(snapshot["prices"][s] == 1.0 + i for i, s in enumerate(SYMBOLS))
+    assert abs(broker.signer.offset_ms - 20000) < 1000
+
+
+def test_orders_do_not_queue_behind_market_data_fan_out():
+    symbols = [f"SYM{i}USDT" for i in range(100)]
+    with FakeExchange(prices={s: 1.0 for s in symbols}, latency=0.02) as exchange, \
+            BinanceIntegration("key", "secret", base_url=exchange.url, pool_size=2) as broker:
+        prices = broker._executor.submit(broker.get_market_prices, symbols)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        [order] = broker.place_orders([{"symbol": "SYM0USDT", "quantity": 1.0, "side": "BUY"}])
+        assert order.result(timeout=5)["status"] == "success"
+        order_seconds = time.perf_counter() - start
+        assert not prices.done()
+        prices.result(timeout=10)
+    # 100 price calls over 2 workers take about a second; the order needs a sync and one call
+    assert order_seconds < 0.5
+
+
+def test_rate_limit_headroom_is_published_as_gauges(monkeypatch):
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(broker_integration, "metrics", registry)
+    with FakeExchange() as exchange, BinanceIntegration("key", "secret", base_url=exchange.url) as broker:
+        broker.get_market_price("BTCUSDT")
+    gauges = registry.snapshot()["gauges"]
+    assert 0.0 < gauges['broker_rate_limit_headroom{broker="binance",budget="weight"}'] <= 1.0
+    assert 'broker_rate_limit_headroom{broker="binance",budget="order"}' in gauges
+
+
+def test_paper_trader_rejects_limit_orders():
+    broker = broker_integration.PaperTraderBroker(initial_balance=100000.0)
+    result = broker.place_order("BTCUSDT", 1.0, "BUY", order_type="LIMIT", price=1.0)
+    assert result["status"] == "failed"
+    assert broker.balance == 100000.0
+    assert len(broker.orders) == 0
+    assert broker.place_order("BTCUSDT", 1.0, "BUY")["status"] == "success"
+
+
+def test_only_new_orders_count_against_the_order_budget():
+    params = {"symbol": "BTCUSDT"}
+    assert BinanceIntegration._request_cost("POST", broker_integration.ORDER_PATH, params)[1] == 1
+    assert BinanceIntegration._request_cost("DELETE", broker_integration.ORDER_PATH, params)[1] == 0
+    assert BinanceIntegration._request_cost("GET", broker_integration.ORDER_PATH, params)[1] == 0
@@ -0,0 +1,80 @@
+"""Chart downsampling and table pagination"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.downsampling import downsample, lttb, minmax, paginate, viewport
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(4)
+    y = np.cumsum(rng.normal(0, 1, 10_000))
+    x = pd.date_range('2024-01-01', periods=y.size, freq='min').to_numpy()
+    return x, y
+
+
+@pytest.mark.parametrize("n_out", [3, 10, 500])
+def test_lttb_keeps_endpoints_within_budget(series, n_out):
+    x, y = series
+    idx = lttb(x, y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_returns_everything_when_under_budget(series):
+    x, y = series
+    np.testing.assert_array_equal(lttb(x[:50], y[:50], 100), np.arange(50))
+
+
+def test_minmax_keeps_each_bucket_extremes(series):
+    _, y = series
+    n_buckets = 40
+    idx = minmax(y, n_buckets)
+    assert len(idx) <= 2 * n_buckets
+    edges = np.linspace(0, len(y), n_buckets + 1).astype(np.int64)
+    kept = set(idx.tolist())
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        assert lo + int(np.argmin(y[lo:hi])) in kept
+        assert lo + int(np.argmax(y[lo:hi])) in kept
+
+
+def test_viewport_bounds_are_inclusive():
+    x = np.arange(10) * 10
+    assert viewport(x, 20, 50) == slice(2, 6)
+    assert viewport(x) == slice(0, 10)
+    assert viewport(x, 95, None) == slice(10, 10)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_drops_gaps(series, method):
+    x, y = series
+    y = y.copy()
+    y[1000:3000] = np.nan
+    y[5000] = np.inf
+    out_x, out_y = downsample(x, y, 200, method)
+    assert len(out_y) <= 200
+    assert np.isfinite(out_y).all()
+    assert out_x[0] == x[0] and out_x[-1] == x[-1]
+
+
+def test_downsample_window_and_budget(series):
+    x, y = series
+    out_x, out_y = downsample(x, y, 100, 'lttb', x[2000], x[2999])
+    assert len(out_x) == 100
+    assert out_x[0] == x[2000] and out_x[-1] == x[2999]
+    with pytest.raises(ValueError):
+        downsample(x, y, 100, 'stride')
+
+
+def test_paginate_clamps_pages():
+    frame = pd.DataFrame({'a': range(250)})
+    rows, n_pages = paginate(frame, 3, 100)
+    assert n_pages == 3
+    assert rows['a'].tolist() == list(range(200, 250))
+    assert paginate(frame, 99, 100)[0]['a'].iloc[0] == 200
+    assert paginate(frame, 0, 100)[0]['a'].iloc[0] == 0
+    rows, n_pages = paginate(frame.iloc[:0], 5, 100)
+    assert n_pages == 1 and rows.empty
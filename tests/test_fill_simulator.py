@@ -0,0 +1,22 @@
+"""FillSimulator batch fills"""
+
+import numpy as np
+import pandas as pd
+
+from src.broker import PaperBroker
+from src.fill_simulator import FillSimulator
+
+
+def test_empty_batch_with_volume():
+    bars = pd.DataFrame({'open': [100.0, 101.0], 'high': [102.0, 103.0],
+                         'low': [99.0, 100.0], 'volume': [5.0, 5.0]})
+    empty = np.array([], dtype=np.int64)
+    result = FillSimulator().simulate(empty, empty, empty, bars['open'], bars['high'], bars['low'],
+                                      volume=bars['volume'])
+    assert all(len(column) == 0 for column in result.values())
+
+    broker = PaperBroker(1000.0)
+    broker.execute_orders(bars, empty, empty, empty)
+    assert broker.cash == 1000.0
+    assert broker.position == 0.0
+    assert len(broker.trades) == 0
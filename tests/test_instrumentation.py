@@ -0,0 +1,38 @@
+"""MetricsRegistry reads while writer threads add new series"""
+
+import sys
+import threading
+
+from src.instrumentation import MetricsRegistry
+
+
+def test_export_while_new_series_are_created():
+    registry = MetricsRegistry(enabled=True)
+    errors = []
+
+    def writer(worker):
+        for i in range(1000):
+            registry.inc('requests_total', endpoint=f"/e{worker}-{i}")
+            registry.set_gauge('headroom', 0.5, worker=str(worker), n=str(i))
+            registry.observe('latency_seconds', 0.01, endpoint=f"/e{worker}-{i}")
+
+    def reader():
+        try:
+            for _ in range(20):
+                registry.render_prometheus()
+                registry.snapshot()
+        except RuntimeError as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        writers = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        for thread in writers:
+            thread.start()
+        reader()
+        for thread in writers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors
@@ -0,0 +1,51 @@
+"""TradeLedger average-cost positions and realized PnL"""
+
+import numpy as np
+import pytest
+
+from src.ledger import BUY, SELL, TradeLedger
+
+
+def test_average_cost_and_realized_pnl():
+    ledger = TradeLedger()
+    ledger.append('AAA', BUY, 2.0, 100.0, fee=1.0)
+    ledger.append('AAA', BUY, 2.0, 110.0, fee=1.0)
+    ledger.append('AAA', SELL, 3.0, 120.0, fee=1.5)
+
+    # Average cost 105; selling 3 at 120 realizes 45 less the sell fee
+    assert ledger.positions() == {'AAA': pytest.approx(1.0)}
+    assert ledger.unrealized_pnl({'AAA': 100.0}) == {'AAA': pytest.approx(-5.0)}
+    assert ledger.realized_pnl()['AAA'] == pytest.approx(45.0 - 3.5)
+    np.testing.assert_allclose(ledger.column('realized_pnl'), [-1.0, -1.0, 43.5])
+    assert ledger.cash_flow == pytest.approx(-200.0 - 220.0 + 360.0 - 3.5)
+    assert ledger.equity({'AAA': 120.0}, initial_cash=1000.0) == pytest.approx(1000.0 - 63.5 + 120.0)
+
+
+def test_flip_from_short_to_long_opens_at_fill_price():
+    ledger = TradeLedger()
+    ledger.append('AAA', SELL, 1.0, 50.0)
+    ledger.append('AAA', BUY, 3.0, 40.0)
+    assert ledger.realized_pnl()['AAA'] == pytest.approx(10.0)
+    assert ledger.positions()['AAA'] == pytest.approx(2.0)
+    assert ledger.unrealized_pnl({'AAA': 41.0}) == {'AAA': pytest.approx(2.0)}
+
+
+def test_full_close_leaves_no_float_residue():
+    ledger = TradeLedger()
+    ledger.append('AAA', BUY, 0.1, 100.0)
+    ledger.append('AAA', BUY, 0.2, 100.0)
+    ledger.append('AAA', SELL, 0.3, 110.0)
+    assert ledger.positions() == {'AAA': 0.0}
+    assert ledger.unrealized_pnl({'AAA': 120.0}) == {}
+    assert ledger.realized_pnl()['AAA'] == pytest.approx(3.0)
+
+
+def test_extend_matches_append():
+    sides, quantities, prices = [BUY, BUY, SELL, SELL], [1.0, 2.0, 1.5, 1.5], [10.0, 13.0, 15.0, 9.0]
+    one_by_one = TradeLedger()
+    for side, quantity, price in zip(sides, quantities, prices):
+        one_by_one.append('AAA', side, quantity, price, fee=0.1)
+    block = TradeLedger()
+    block.extend(np.array(sides), np.array(quantities), np.array(prices), fee=np.full(4, 0.1), symbol='AAA')
+    np.testing.assert_allclose(block.column('realized_pnl'), one_by_one.column('realized_pnl'))
+    assert block.positions() == one_by_one.positions()
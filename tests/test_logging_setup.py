@@ -0,0 +1,79 @@
+"""DeferredQueueHandler overflow and RateLimitedLogger windows"""
+
+import logging
+import queue
+
+from src import logging_setup
+from src.logging_setup import DeferredQueueHandler, RateLimitedLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_full_queue_drops_only_records_below_warning():
+    direct = ListHandler()
+    handler = DeferredQueueHandler(queue.Queue(1), [direct])
+    logger = make_logger("test.deferred", handler)
+
+    logger.info("queued %s", 1)
+    logger.info("dropped")
+    logger.error("broker failed: %s", "timeout")
+    logger.critical("halted")
+
+    assert handler.queue.get_nowait().getMessage() == "queued 1"
+    assert handler.dropped == 1
+    assert [r.getMessage() for r in direct.records] == ["broker failed: timeout", "halted"]
+
+
+def test_records_are_enqueued_unformatted():
+    handler = DeferredQueueHandler(queue.Queue())
+    logger = make_logger("test.unformatted", handler)
+    logger.info("fill %s @ %s", "BTCUSDT", 100.0)
+    record = handler.queue.get_nowait()
+    assert record.msg == "fill %s @ %s"
+    assert record.args == ("BTCUSDT", 100.0)
+
+
+def test_rate_limited_logger_windows_and_suppressed_count(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logging_setup.time, "monotonic", lambda: now[0])
+    sink = ListHandler()
+    limited = RateLimitedLogger(make_logger("test.rate", sink), rate=2, period=1.0)
+
+    for i in range(5):
+        limited.info("fill %d", i)
+    limited.info("other %d", 0)
+    assert [r.getMessage() for r in sink.records] == ["fill 0", "fill 1", "other 0"]
+
+    now[0] += 1.0
+    limited.info("fill %d", 5)
+    limited.info("fill %d", 6)
+    assert [r.getMessage() for r in sink.records[3:]] == ["fill 5 (+3 suppressed)", "fill 6"]
+
+    now[0] += 1.0
+    limited.info("fill %d", 7)
+    assert sink.records[-1].getMessage() == "fill 7"
+
+
+def test_rate_limited_logger_skips_disabled_levels():
+    sink = ListHandler()
+    logger = make_logger("test.rate_disabled", sink)
+    logger.setLevel(logging.INFO)
+    limited = RateLimitedLogger(logger, rate=1)
+    limited.debug("tick %d", 1)
+    assert not sink.records
+    assert not limited._windows
@@ -0,0 +1,72 @@
+"""TickerCache freshness and concurrent writers"""
+
+import threading
+
+import pytest
+
+from src import market_data
+from src.broker_integration import PaperTraderBroker
+from src.market_data import TickerCache
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(market_data.time, "time", clock)
+    return clock
+
+
+def test_book_update_does_not_refresh_old_trade_price(clock):
+    cache = TickerCache()
+    cache.update("BTCUSDT", last=100.0)
+    clock.now += 3600
+    cache.update("BTCUSDT", bid=110.0, ask=112.0)
+
+    assert cache.price("BTCUSDT", max_age=5.0) == 111.0
+    clock.now += 10
+    assert cache.price("BTCUSDT", max_age=5.0) is None
+    assert cache.price("BTCUSDT") == 100.0
+
+
+def test_fresh_trade_price_wins_over_book(clock):
+    cache = TickerCache()
+    cache.update("BTCUSDT", bid=110.0, ask=112.0)
+    cache.update("BTCUSDT", last=111.5)
+    assert cache.price("BTCUSDT", max_age=5.0) == 111.5
+
+
+def test_concurrent_writers_keep_every_field():
+    cache = TickerCache()
+    fields = ("last", "bid", "ask", "bid_qty", "ask_qty")
+    n = 2000
+
+    def writer(field):
+        for i in range(1, n + 1):
+            cache.update("BTCUSDT", **{field: float(i)})
+
+    threads = [threading.Thread(target=writer, args=(field,)) for field in fields]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    quote = cache.get("BTCUSDT")
+    assert cache.updates == n * len(fields)
+    assert all(getattr(quote, field) == float(n) for field in fields)
+
+
+def test_paper_broker_ignores_stale_streamed_price(clock):
+    cache = TickerCache()
+    cache.update("ETHUSDT", last=1.0)
+    broker = PaperTraderBroker(market_data=cache, max_quote_age=2.0)
+    assert broker.get_market_price("ETHUSDT") == 1.0
+    clock.now += 60
+    assert broker.get_market_price("ETHUSDT") != 1.0
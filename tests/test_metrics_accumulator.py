@@ -0,0 +1,84 @@
+"""MetricsAccumulator against BacktestingMetrics, point by point and in chunks"""
+
+import numpy as np
+import pytest
+
+from src.backtesting_metrics import BacktestingMetrics
+
+
+@pytest.fixture(scope="module")
+def equity():
+    rng = np.random.default_rng(5)
+    return 10000.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, 1000)))
+
+
+@pytest.fixture(scope="module")
+def trades():
+    rng = np.random.default_rng(6)
+    return [{'pnl': pnl} for pnl in rng.normal(5, 50, 200).tolist()]
+
+
+def point_by_point(values, metrics):
+    acc = metrics.accumulator()
+    for value in values:
+        acc.update_equity(value)
+    return acc
+
+
+def test_result_matches_per_metric_methods(equity, trades):
+    metrics = BacktestingMetrics(initial_capital=10000.0)
+    acc = metrics.accumulator()
+    acc.update_equity_chunk(equity)
+    acc.add_trades(trades)
+    result = acc.result()
+
+    returns = np.diff(equity) / equity[:-1]
+    max_dd, peak_idx, dd_idx = metrics.calculate_max_drawdown(equity)
+    total_return = (equity[-1] - 10000.0) / 10000.0 * 100
+    assert result['total_return'] == pytest.approx(total_return)
+    assert result['sharpe_ratio'] == pytest.approx(metrics.calculate_sharpe_ratio(returns), rel=1e-9)
+    assert result['sortino_ratio'] == pytest.approx(metrics.calculate_sortino_ratio(returns), rel=1e-9)
+    assert result['max_drawdown'] == pytest.approx(max_dd)
+    assert (result['max_drawdown_peak_idx'], result['max_drawdown_idx']) == (peak_idx, dd_idx)
+    assert result['calmar_ratio'] == pytest.approx(metrics.calculate_calmar_ratio(returns, equity))
+    assert result['recovery_factor'] == pytest.approx(metrics.calculate_recovery_factor(total_return, max_dd))
+    assert result['win_rate'] == pytest.approx(metrics.calculate_win_rate(trades))
+    assert result['profit_factor'] == pytest.approx(metrics.calculate_profit_factor(trades))
+    assert result['total_trades'] == len(trades)
+    assert result['final_equity'] == equity[-1]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 100, 999])
+def test_chunks_match_point_by_point(equity, size):
+    metrics = BacktestingMetrics(initial_capital=10000.0)
+    expected = point_by_point(equity, metrics).result()
+    acc = metrics.accumulator()
+    for start in range(0, len(equity), size):
+        acc.update_equity_chunk(equity[start:start + size])
+    result = acc.result()
+
+    for key in ('max_drawdown_peak_idx', 'max_drawdown_idx', 'total_trades'):
+        assert result[key] == expected[key]
+    for key in ('total_return', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown', 'calmar_ratio', 'final_equity'):
+        assert result[key] == pytest.approx(expected[key], rel=1e-9)
+
+
+@pytest.mark.parametrize("chunks", [
+    [[100.0, 120.0], [110.0, 90.0, 130.0], [125.0, 80.0, 140.0]],   # peak and trough in different chunks
+    [[100.0, 120.0, 120.0], [90.0], [120.0, 60.0]],                # repeated peak value across chunks
+    [[100.0], [95.0, 90.0], [85.0]]                                # trough keeps deepening below the first point
+])
+def test_peak_and_trough_across_chunk_boundaries(chunks):
+    metrics = BacktestingMetrics(initial_capital=100.0)
+    values = np.concatenate(chunks)
+    expected = point_by_point(values, metrics).result()
+    acc = metrics.accumulator()
+    for chunk in chunks:
+        acc.update_equity_chunk(chunk)
+    result = acc.result()
+
+    _, peak_idx, dd_idx = metrics.calculate_max_drawdown(values)
+    assert (result['max_drawdown_peak_idx'], result['max_drawdown_idx']) == (peak_idx, dd_idx)
+    assert (expected['max_drawdown_peak_idx'], expected['max_drawdown_idx']) == (peak_idx, dd_idx)
+    assert result['max_drawdown'] == pytest.approx(expected['max_drawdown'])
+    assert result['sharpe_ratio'] == pytest.approx(expected['sharpe_ratio'], rel=1e-9)
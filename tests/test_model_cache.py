@@ -0,0 +1,76 @@
+"""ModelCache LRU order, eviction, reloads and shared loads"""
+
+import threading
+import time
+
+import pytest
+
+joblib = pytest.importorskip("joblib")
+
+from src.model_cache import ModelCache
+
+
+def dump(tmp_path, name, payload_bytes):
+    path = tmp_path / f"{name}.pkl"
+    joblib.dump({'name': name, 'payload': b'x' * payload_bytes}, path)
+    return str(path)
+
+
+def test_least_recently_used_is_evicted_first(tmp_path):
+    paths = {v: dump(tmp_path, f"m_{v}", 1000) for v in (1, 2, 3)}
+    size = (tmp_path / "m_1.pkl").stat().st_size
+    cache = ModelCache(max_bytes=2 * size + size // 2)
+    cache.get_or_load("m", 1, paths[1])
+    cache.get_or_load("m", 2, paths[2])
+    cache.get("m", 1)  # 2 is now least recently used
+    cache.get_or_load("m", 3, paths[3])
+
+    assert cache.get("m", 2) is None
+    assert cache.get("m", 1)['name'] == "m_1"
+    assert cache.get("m", 3)['name'] == "m_3"
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 2 * size
+
+
+def test_newest_entry_is_kept_even_over_budget(tmp_path):
+    cache = ModelCache(max_bytes=10)
+    cache.get_or_load("m", 1, dump(tmp_path, "small", 10))
+    model = cache.get_or_load("m", 2, dump(tmp_path, "big", 5000))
+    assert model['name'] == "big"
+    assert cache.get("m", 1) is None
+    assert cache.stats()['entries'] == 1
+
+
+def test_changed_path_reloads_the_version(tmp_path):
+    cache = ModelCache()
+    first = cache.get_or_load("m", "v1", dump(tmp_path, "a", 10))
+    assert cache.get_or_load("m", "v1", str(tmp_path / "a.pkl")) is first
+    second = cache.get_or_load("m", "v1", dump(tmp_path, "b", 10))
+    assert second['name'] == "b"
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['entries'] == 1
+
+
+def test_concurrent_callers_share_one_load(tmp_path, monkeypatch):
+    path = dump(tmp_path, "shared", 100)
+    loads = []
+    real_load = joblib.load
+
+    def slow_load(*args, **kwargs):
+        loads.append(args[0])
+        time.sleep(0.2)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(joblib, "load", slow_load)
+    cache = ModelCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("m", 1, path))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 7
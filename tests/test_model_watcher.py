@@ -0,0 +1,61 @@
+"""ModelWatcher staging: feature-width checks and retries"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("joblib")
+
+from sklearn.linear_model import LogisticRegression
+
+from src.model_cache import ModelCache
+from src.model_persistence import ModelPersistence
+from src.model_watcher import ModelWatcher
+
+
+def fitted(n_features, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(50, n_features))
+    return LogisticRegression().fit(X, (X[:, 0] > 0).astype(int))
+
+
+@pytest.fixture
+def persistence(tmp_path):
+    return ModelPersistence(str(tmp_path), cache=ModelCache())
+
+
+def test_model_with_wrong_feature_width_is_rejected(persistence):
+    watcher = ModelWatcher(persistence, "scorer", n_features=2)
+    persistence.save_model(fitted(12), "scorer")
+    assert not watcher.poll_once()
+
+    persistence.save_model(fitted(2), "scorer")
+    assert watcher.poll_once()
+    version, scorer = watcher.take_pending()
+    assert scorer.score(np.zeros((1, 2))).shape == (1,)
+
+
+def test_warm_up_uses_observed_agent_features(persistence):
+    watcher = ModelWatcher(persistence, "scorer")
+    watcher.observe_features(pd.DataFrame({'sma_short': [101.0], 'sma_long': [100.0]}))
+    persistence.save_model(fitted(12), "scorer")
+    assert not watcher.poll_once()
+
+
+def test_failed_warm_up_is_retried_without_a_registry_change(persistence, monkeypatch):
+    watcher = ModelWatcher(persistence, "scorer", n_features=2)
+    persistence.save_model(fitted(2), "scorer")
+    load_model = persistence.load_model
+    calls = []
+
+    def flaky_load(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("model file still being written")
+        return load_model(*args, **kwargs)
+
+    monkeypatch.setattr(persistence, "load_model", flaky_load)
+    assert not watcher.poll_once()
+    assert watcher.poll_once()
+    assert not watcher.poll_once()
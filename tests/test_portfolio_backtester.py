@@ -0,0 +1,57 @@
+"""PortfolioBacktester tradability, trade PnL and repeatability"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fill_simulator import FillSimulator
+from src.portfolio_backtester import PortfolioBacktester
+
+
+def frame(values, columns=("AAA", "BBB")):
+    return pd.DataFrame(values, columns=list(columns), index=pd.date_range("2024-01-01", periods=len(values), freq="D"))
+
+
+def test_forward_filled_symbol_is_not_traded():
+    closes = frame([[10.0, 20.0], [10.0, 20.0], [10.0, np.nan], [10.0, np.nan]])
+    signals = np.array([[0, 0], [0, 0], [0, 1], [0, 1]])
+    result = PortfolioBacktester(closes, signals, np.ones(closes.shape)).run()
+    assert len(result['fills']) == 0
+    assert result['positions']['BBB'] == 0.0
+
+
+def test_trade_pnl_includes_entry_fee():
+    # Exit is 0.15% above entry: the sell leg alone clears its 0.1% fee, the round trip does not
+    closes = frame([[100.0], [100.15]], columns=("AAA",))
+    signals = np.array([[1], [-1]])
+    bt = PortfolioBacktester(closes, signals, np.ones(closes.shape), allocation=1.0,
+                             fill_simulator=FillSimulator(fee_rate=0.001))
+    metrics = bt.run()['metrics']
+    assert metrics['total_trades'] == 1
+    assert metrics['win_rate'] == 0.0
+    assert metrics['final_equity'] < 10000.0
+
+
+def test_run_is_repeatable():
+    rng = np.random.default_rng(1)
+    closes = frame(100 + rng.normal(0, 1, (50, 2)).cumsum(axis=0))
+    signals = rng.choice([-1, 0, 1], size=closes.shape)
+    bt = PortfolioBacktester(closes, signals, np.ones(closes.shape))
+    first = bt.run()
+    n_fills = len(first['fills'])
+    second = bt.run()
+    assert len(second['fills']) == n_fills
+    np.testing.assert_allclose(first['equity'].to_numpy(), second['equity'].to_numpy())
+    assert second['cash'] == pytest.approx(first['cash'])
+
+
+def test_injected_simulator_keeps_its_ledger():
+    closes = frame([[10.0], [11.0], [12.0]], columns=("AAA",))
+    simulator = FillSimulator(fee_rate=0.001)
+    broker_fills = simulator.fills
+    bt = PortfolioBacktester(closes, np.array([[1], [0], [-1]]), np.ones(closes.shape), fill_simulator=simulator)
+    result = bt.run()
+    assert simulator.fills is broker_fills
+    assert len(broker_fills) == 0
+    assert result['fills'] is bt.ledger
+    assert len(result['fills']) == 2
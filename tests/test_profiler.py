@@ -0,0 +1,36 @@
+"""SamplingProfiler keeps slow sections only"""
+
+import time
+
+from src.profiler import SamplingProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_slow_section_writes_a_folded_profile(tmp_path):
+    profiler = SamplingProfiler(threshold=0.05, interval=0.001, output_dir=str(tmp_path))
+    with profiler.section('cycle'):
+        busy(0.2)
+    profiler.stop()
+
+    [profile] = tmp_path.glob('cycle-*.folded')
+    lines = profile.read_text().splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('test_profiler.py:busy' in line for line in lines)
+    assert (tmp_path / 'summary.txt').exists()
+    assert profiler.slow_sections == 1
+    assert profiler.top('cycle')
+
+
+def test_fast_section_writes_nothing(tmp_path):
+    profiler = SamplingProfiler(threshold=10.0, interval=0.001, output_dir=str(tmp_path))
+    with profiler.section('cycle'):
+        busy(0.05)
+    profiler.stop()
+
+    assert not list(tmp_path.iterdir())
+    assert profiler.slow_sections == 0
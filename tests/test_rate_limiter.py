@@ -0,0 +1,73 @@
+"""RateLimiter queueing, timeouts and server feedback"""
+
+import threading
+import time
+
+import pytest
+
+from src.rate_limiter import PRIORITY_ACCOUNT, PRIORITY_MARKET_DATA, PRIORITY_ORDER, RateLimiter
+
+
+def exhausted_limiter(period=0.2):
+    """One weight token refilled every ``period`` seconds, already spent"""
+    limiter = RateLimiter(weight_limit=1, weight_period=period)
+    limiter.acquire(1)
+    return limiter
+
+
+def queue_callers(limiter, priorities):
+    """Start one waiting caller per priority, in order; returns the order they acquired in"""
+    acquired = []
+    threads = []
+    for name, priority in priorities:
+        thread = threading.Thread(target=lambda n=name, p=priority: (limiter.acquire(1, priority=p), acquired.append(n)))
+        thread.start()
+        threads.append(thread)
+        while limiter.headroom()['waiting'] < len(threads):
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+    return acquired
+
+
+def test_waiters_are_served_by_priority():
+    limiter = exhausted_limiter()
+    order = queue_callers(limiter, [('prices', PRIORITY_MARKET_DATA), ('account', PRIORITY_ACCOUNT),
+                                    ('order', PRIORITY_ORDER)])
+    # Market data queued first but is overtaken once higher priorities arrive
+    assert order == ['order', 'account', 'prices']
+
+
+def test_waiters_with_equal_priority_are_fifo():
+    limiter = exhausted_limiter(period=0.05)
+    names = [f"caller{i}" for i in range(5)]
+    assert queue_callers(limiter, [(n, PRIORITY_ACCOUNT) for n in names]) == names
+
+
+def test_timeout_removes_the_waiter():
+    limiter = exhausted_limiter(period=10.0)
+    with pytest.raises(TimeoutError):
+        limiter.acquire(1, priority=PRIORITY_ORDER, timeout=0.05)
+    assert limiter.headroom()['waiting'] == 0
+    # A later caller is not stuck behind the abandoned entry
+    limiter.weight.tokens = 1.0
+    assert limiter.acquire(1, timeout=1.0) < 0.5
+
+
+def test_used_weight_header_tightens_the_bucket():
+    limiter = RateLimiter(weight_limit=6000, order_limit=100)
+    limiter.update_from_headers({'x-mbx-used-weight-1m': '5990', 'X-MBX-ORDER-COUNT-10S': '100'})
+    headroom = limiter.headroom()
+    assert headroom['weight_available'] <= 10.5
+    assert headroom['orders_available'] < 1
+    # Headers never loosen the local count
+    limiter.update_from_headers({'X-MBX-USED-WEIGHT-1M': '0'})
+    assert limiter.headroom()['weight_available'] <= 11
+
+
+def test_backoff_pauses_every_caller():
+    limiter = RateLimiter()
+    limiter.backoff(0.2)
+    assert limiter.headroom()['paused_for'] > 0.1
+    assert limiter.acquire(1) >= 0.15
+    assert limiter.stats['rejections'] == 1
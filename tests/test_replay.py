@@ -0,0 +1,28 @@
+"""ReplayHarness determinism and SeededBroker slippage"""
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+from src.replay import ReplayHarness, SeededBroker, synthetic_ticks
+
+
+def test_same_seed_gives_same_fingerprint():
+    ticks = synthetic_ticks(1500, seed=5)
+    first = ReplayHarness(ticks, seed=5, warmup=500).run()
+    second = ReplayHarness(ticks, seed=5, warmup=500).run()
+    assert first['ticks'] == second['ticks'] == 1000
+    assert first['fingerprint'] == second['fingerprint']
+    assert first['trades'] == second['trades']
+    assert first['cash'] == second['cash']
+
+
+def test_configured_slippage_is_not_jittered_again():
+    config = {'trading': {'symbol': 'REPLAY'}, 'backtest': {'slippage': 0.001}}
+    broker = SeededBroker.from_config(config, initial_cash=1e6, seed=1)
+    broker.place_order(1.0, 100.0)
+    assert broker.trades.column('price')[0] == pytest.approx(100.1)
+
+    jittered = SeededBroker(seed=1, initial_cash=1e6)
+    jittered.place_order(1.0, 100.0)
+    assert jittered.trades.column('price')[0] > 100.0
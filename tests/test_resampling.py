@@ -0,0 +1,75 @@
+"""Bootstrap and trade-shuffle resampling"""
+
+import numpy as np
+import pytest
+
+from src.backtesting_metrics import BacktestingMetrics
+from src.resampling import (block_bootstrap_paths, bootstrap_returns, return_path_metrics,
+                            shuffle_trade_paths, shuffle_trades, trade_path_metrics)
+
+
+@pytest.fixture(scope="module")
+def returns():
+    return np.random.default_rng(12).normal(0.0005, 0.01, 500)
+
+
+def test_block_bootstrap_paths_are_seeded_circular_blocks(returns):
+    paths = block_bootstrap_paths(returns, 20, 7, np.random.default_rng(1))
+    np.testing.assert_array_equal(paths, block_bootstrap_paths(returns, 20, 7, np.random.default_rng(1)))
+    assert paths.shape == (20, returns.size)
+    # Every block of 7 is a run of consecutive (wrapping) source returns
+    position = {value: i for i, value in enumerate(returns.tolist())}
+    first = [position[v] for v in paths[0, :7].tolist()]
+    assert all((b - a) % returns.size == 1 for a, b in zip(first, first[1:]))
+
+
+def test_shuffle_trade_paths_permute_without_replacement():
+    pnls = np.arange(10.0)
+    paths = shuffle_trade_paths(pnls, 5, np.random.default_rng(2))
+    np.testing.assert_array_equal(np.sort(paths, axis=1), np.tile(pnls, (5, 1)))
+    resampled = shuffle_trade_paths(pnls, 5, np.random.default_rng(2), replace=True)
+    assert np.isin(resampled, pnls).all()
+
+
+def test_return_path_metrics_match_backtesting_metrics(returns):
+    path = returns.copy()
+    path[0] = -0.05  # drawdown from the starting value
+    equity = np.concatenate(([1.0], np.cumprod(1 + path)))
+    metrics = BacktestingMetrics(initial_capital=1.0)
+    result = return_path_metrics(path[None, :].copy())
+
+    assert result['sharpe_ratio'][0] == pytest.approx(metrics.calculate_sharpe_ratio(path))
+    assert result['sortino_ratio'][0] == pytest.approx(metrics.calculate_sortino_ratio(path))
+    assert result['max_drawdown'][0] == pytest.approx(metrics.calculate_max_drawdown(equity)[0])
+    assert result['total_return'][0] == pytest.approx((equity[-1] - 1.0) * 100)
+
+
+def test_trade_path_metrics_match_backtesting_metrics():
+    pnls = np.array([100.0, -300.0, 50.0, -20.0, 400.0])
+    metrics = BacktestingMetrics(initial_capital=1000.0)
+    equity = np.concatenate(([1000.0], 1000.0 + np.cumsum(pnls)))
+    result = trade_path_metrics(pnls[None, :], initial_capital=1000.0)
+    assert result['max_drawdown'][0] == pytest.approx(metrics.calculate_max_drawdown(equity)[0])
+    assert result['total_pnl'][0] == pytest.approx(pnls.sum())
+    assert result['win_rate'][0] == pytest.approx(metrics.calculate_win_rate([{'pnl': p} for p in pnls]))
+
+
+def test_seeded_runs_repeat(returns):
+    first = bootstrap_returns(returns, n_paths=200, seed=7)
+    second = bootstrap_returns(returns, n_paths=200, seed=7)
+    for name, values in first['samples'].items():
+        np.testing.assert_array_equal(values, second['samples'][name])
+    other = bootstrap_returns(returns, n_paths=200, seed=8)
+    assert not np.array_equal(first['samples']['sharpe_ratio'], other['samples']['sharpe_ratio'])
+
+
+@pytest.mark.parametrize("run, data", [(bootstrap_returns, "returns"), (shuffle_trades, "pnls")])
+def test_process_pool_matches_in_process_chunks(returns, run, data):
+    values = returns if data == "returns" else returns[:50] * 1000
+    # Small chunks force several chunks; the result must not depend on where they run
+    kwargs = dict(n_paths=120, seed=3, max_chunk_bytes=values.size * 8 * 7 * 25)
+    local = run(values, n_jobs=1, **kwargs)['samples']
+    pooled = run(values, n_jobs=2, **kwargs)['samples']
+    assert len(local['max_drawdown']) == 120
+    for name in local:
+        np.testing.assert_array_equal(local[name], pooled[name])
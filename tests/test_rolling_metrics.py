@@ -0,0 +1,75 @@
+"""Rolling metrics against brute-force per-window calculations and the live tracker"""
+
+import numpy as np
+import pytest
+
+from src.rolling_metrics import LiveRollingMetrics, calculate_rolling_metrics, rolling_max
+
+RF = 0.02 / 252
+
+
+@pytest.fixture(scope="module")
+def equity():
+    rng = np.random.default_rng(8)
+    return 10000.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, 300)))
+
+
+def brute_max_drawdown(values):
+    peak = np.maximum.accumulate(values)
+    return float(np.max((peak - values) / peak)) * 100
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 16, 299, 400])
+def test_rolling_max_matches_brute_force(equity, window):
+    expected = [equity[max(0, t - window + 1):t + 1].max() for t in range(len(equity))]
+    np.testing.assert_array_equal(rolling_max(equity, window), expected)
+
+
+@pytest.mark.parametrize("window", [2, 3, 7, 20, 64])
+def test_rolling_metrics_match_brute_force(equity, window):
+    frame = calculate_rolling_metrics(equity, window)
+    excess = np.diff(equity) / equity[:-1] - RF
+    for t in range(len(equity)):
+        values = equity[max(0, t - window + 1):t + 1]
+        assert frame['max_drawdown'].iloc[t] == pytest.approx(brute_max_drawdown(values), abs=1e-9)
+        assert frame['drawdown'].iloc[t] == pytest.approx((values.max() - equity[t]) / values.max() * 100)
+        if t < window:
+            assert np.isnan(frame['sharpe'].iloc[t])
+            continue
+        window_excess = excess[t - window:t]
+        expected = np.sqrt(252) * window_excess.mean() / window_excess.std()
+        downside = np.sqrt(252) * window_excess.mean() / np.minimum(window_excess, 0.0).std()
+        assert frame['sharpe'].iloc[t] == pytest.approx(expected, rel=1e-6)
+        assert frame['sortino'].iloc[t] == pytest.approx(downside, rel=1e-6)
+
+
+def test_max_drawdown_ignores_peaks_before_the_window():
+    frame = calculate_rolling_metrics([100.0, 50.0, 60.0, 70.0, 80.0], window=3)
+    np.testing.assert_allclose(frame['max_drawdown'], [0.0, 50.0, 50.0, 0.0, 0.0])
+
+
+def test_vectorized_matches_live_bar_for_bar(equity):
+    window = 20
+    rng = np.random.default_rng(9)
+    trade_bars = np.sort(rng.choice(len(equity), 60, replace=False))
+    trade_pnls = rng.normal(0, 10, trade_bars.size)
+    frame = calculate_rolling_metrics(equity, window, trade_bars=trade_bars, trade_pnls=trade_pnls)
+
+    live = LiveRollingMetrics(window)
+    pnls_by_bar = dict(zip(trade_bars.tolist(), trade_pnls.tolist()))
+    for t, value in enumerate(equity):
+        live.update(value)
+        if t in pnls_by_bar:
+            live.add_trade(pnls_by_bar[t])
+        snapshot = live.snapshot()
+        row = frame.iloc[t]
+        assert snapshot['drawdown'] == pytest.approx(row['drawdown'])
+        if t >= window:
+            assert snapshot['sharpe'] == pytest.approx(row['sharpe'], rel=1e-6)
+            assert snapshot['sortino'] == pytest.approx(row['sortino'], rel=1e-6)
+        else:
+            assert np.isnan(snapshot['sharpe']) and np.isnan(row['sharpe'])
+        if t >= window - 1:
+            assert snapshot['trades'] == row['trades']
+            if snapshot['trades']:
+                assert snapshot['win_rate'] == pytest.approx(row['win_rate'])
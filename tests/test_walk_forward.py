@@ -0,0 +1,63 @@
+"""WalkForwardEngine window layout and incremental refit"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from src.walk_forward import WalkForwardEngine, _build_estimator
+
+
+def make_bars(n, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.lognormal(10, 1, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+
+
+def test_overlapping_test_segments_are_rejected():
+    with pytest.raises(ValueError):
+        WalkForwardEngine(train_size=200, test_size=100, step=50)
+
+
+def test_joined_curve_has_unique_timestamps():
+    engine = WalkForwardEngine(train_size=200, test_size=100, step=150, n_estimators=5,
+                               n_jobs=1, label_threshold=0.005)
+    result = engine.run(make_bars(800))
+    assert result['equity_curve'].index.is_unique
+    assert result['confidence'].index.is_unique
+
+
+def incremental_case(y):
+    # Windows: train (0, 295) test (300, 500); (200, 495) (500, 700); (400, 695) (700, 900)
+    rng = np.random.default_rng(0)
+    X = rng.normal(0, 1, (900, 3)) + np.linspace(0, 5, 900)[:, None]
+    engine = WalkForwardEngine(train_size=300, test_size=200, refit='incremental',
+                               trees_per_window=5, n_estimators=5, max_depth=4)
+    windows = engine.windows(len(X))
+    return X, engine, windows, engine._run_incremental(X, y, windows)
+
+
+def test_single_class_rows_do_not_grow_the_forest():
+    y = (np.arange(900) % 3 == 0).astype(int)
+    y[295:495] = 0
+    X, engine, windows, scores = incremental_case(y)
+
+    # Window 1 scores with the unscaled window-0 forest, unchanged
+    first = _build_estimator(engine.params, n_estimators=5).fit(X[0:295], y[0:295])
+    np.testing.assert_allclose(scores[1], first.predict_proba(X[500:700])[:, 1])
+    assert all(((s >= 0) & (s <= 1)).all() for s in scores)
+
+
+def test_new_class_triggers_full_refit():
+    y = (np.arange(900) % 3 == 0).astype(int)
+    y[:295] = 0
+    X, engine, windows, scores = incremental_case(y)
+
+    np.testing.assert_array_equal(scores[0], 0.0)
+    refit = _build_estimator(engine.params, n_estimators=10).fit(X[200:495], y[200:495])
+    np.testing.assert_allclose(scores[1], refit.predict_proba(X[500:700])[:, 1])
+    assert all(((s >= 0) & (s <= 1)).all() for s in scores)